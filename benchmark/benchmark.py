@@ -0,0 +1,409 @@
+#
+# benchmark.py
+#####################################################################
+#
+#  Purpose: measure the sequence cache loads without a production MGD
+#
+#	    For each scale:
+#
+#	    1) creates a throwaway PostgreSQL cluster (initdb/pg_ctl, on a
+#	       unix socket in the work directory) and database
+#	    2) creates the minimal MGD schema (schema.sql) and loads a
+#	       synthetic data set (gendata.py)
+#	    3) runs seqdummy.py, seqcoord.py, seqprobe.py and seqmarker.py
+#	       end to end, each as its own process against that database,
+#	       and bulk loads their bcp files (bcp load mode)
+#	    4) records, per load: wall and CPU seconds, peak RSS (of the
+#	       load's process, from wait4()), rows written, rows/sec, bulk
+#	       load seconds, and the load's own phases (seqcachestats)
+#
+#	    and stops and removes the cluster.
+#
+#  Usage:
+#	benchmark.py [-s scales] [-l loads] [-m loadmode] [-r seed]
+#		     [-o outputFile] [-w workDir] [-p port] [-k]
+#
+#	-s : comma-separated scales (default 1); e.g. 1,5,20
+#	-l : comma-separated loads (default seqdummy,seqcoord,seqprobe,seqmarker)
+#	-m : bcp or copy (SEQCACHE_LOADMODE; default bcp)
+#	-r : random seed of the data set (default 1)
+#	-o : results; appended to as csv, and written as <outputFile>.json
+#	     (default ./benchmark.csv)
+#	-w : work directory (default: a new temporary directory, removed
+#	     at the end unless -k)
+#	-p : port of the throwaway cluster (default 55432)
+#	-k : keep the work directory (database cluster, data, bcp files, logs)
+#
+#  Env Vars:
+#	PYTHON : the python with which to run the loads (default: this python)
+#	PGBIN  : directory of initdb/pg_ctl (default: on PATH)
+#
+#	the loads need the MGI python libraries (db, mgi_utils, loadlib,
+#	accessionlib) on PYTHONPATH, as in production; benchmark.csh sets
+#	that up from ../Configuration.  The database settings of the
+#	loads (MGD_DB*, PG_DB*) are replaced with those of the throwaway
+#	database.
+#
+#  Outputs: results file, log of each load in the work directory
+#
+#  Exit Codes: 0 if every load succeeded, else 1
+#
+#  History
+#
+# 10/18/2026
+#	- new
+#	- copy mode : seqdummy.py loads its own bcp files; do not load them again
+#
+
+import sys
+import os
+import time
+import json
+import getopt
+import shutil
+import subprocess
+import tempfile
+import psycopg2
+import gendata
+
+# this directory and the directory of the loads
+benchmarkDir = os.path.dirname(os.path.abspath(__file__))
+loadDir = os.path.dirname(benchmarkDir)
+
+python = os.environ.get('PYTHON', sys.executable)
+pgbin = os.environ.get('PGBIN', '')
+
+DBNAME = 'mgd'
+DBUSER = 'mgd_dbo'
+SCHEMA = 'mgd'
+
+# load -> (script, table, bcp files and the tables they load)
+LOADS = {
+    'seqdummy' : ('seqdummy.py', None,
+        [('SEQ_Sequence.bcp', 'SEQ_Sequence'), ('SEQ_Sequence_Raw.bcp', 'SEQ_Sequence_Raw'),
+         ('SEQ_Source_Assoc.bcp', 'SEQ_Source_Assoc'), ('ACC_Accession.bcp', 'ACC_Accession')]),
+    'seqcoord' : ('seqcoord.py', 'SEQ_Coord_Cache', [('SEQ_Coord_Cache.bcp', 'SEQ_Coord_Cache')]),
+    'seqprobe' : ('seqprobe.py', 'SEQ_Probe_Cache', [('SEQ_Probe_Cache.bcp', 'SEQ_Probe_Cache')]),
+    'seqmarker' : ('seqmarker.py', 'SEQ_Marker_Cache', [('SEQ_Marker_Cache.bcp', 'SEQ_Marker_Cache')]),
+    }
+
+# tables of the data set, in load order
+TABLES = ['MGI_User', 'VOC_Term', 'DAG_Closure', 'MRK_BiotypeMapping', 'MRK_Chromosome',
+    'MAP_Coordinate', 'MRK_Marker', 'MRK_MCV_Cache', 'SEQ_Sequence', 'SEQ_GeneModel',
+    'SEQ_Sequence_Assoc', 'MAP_Coord_Feature', 'ACC_Accession', 'ACC_AccessionReference',
+    'PRB_Source', 'PRB_Probe', 'PRB_Notes']
+
+COLDELIM = '\t'
+
+class Cluster:
+    # A throwaway PostgreSQL cluster in workDir/pgdata, listening on
+    # a unix socket in workDir
+
+    def __init__(self, workDir, port):
+        self.workDir = workDir
+        self.dataDir = os.path.join(workDir, 'pgdata')
+        self.port = port
+        self.logFile = os.path.join(workDir, 'postgres.log')
+
+    def command(self, name):
+        return os.path.join(pgbin, name)
+
+    def start(self):
+        subprocess.check_call([self.command('initdb'), '-D', self.dataDir, '-U', DBUSER,
+                '-A', 'trust', '-E', 'UTF8', '--no-locale'], stdout = subprocess.DEVNULL)
+        subprocess.check_call([self.command('pg_ctl'), '-D', self.dataDir, '-l', self.logFile,
+                '-w', '-o', "-p %s -k %s -c listen_addresses='' -c fsync=off" % (self.port, self.workDir),
+                'start'], stdout = subprocess.DEVNULL)
+
+        conn = self.connect('postgres')
+        conn.autocommit = True
+        cursor = conn.cursor()
+        cursor.execute('create database %s' % (DBNAME))
+        cursor.execute('alter role %s set search_path = %s, public' % (DBUSER, SCHEMA))
+        conn.close()
+
+    def stop(self):
+        subprocess.call([self.command('pg_ctl'), '-D', self.dataDir, '-m', 'fast', '-w', 'stop'],
+                stdout = subprocess.DEVNULL)
+
+    def connect(self, dbname = DBNAME):
+        return psycopg2.connect(host = self.workDir, port = self.port, dbname = dbname, user = DBUSER)
+
+    def environment(self):
+        # the database settings of the loads
+        passwordFile = os.path.join(self.workDir, 'pgpassword')
+        if not os.path.exists(passwordFile):
+            fp = open(passwordFile, 'w')
+            fp.write('benchmark\n')
+            fp.close()
+
+        return {
+            'MGD_DBSERVER' : self.workDir, 'PG_DBSERVER' : self.workDir,
+            'MGD_DBNAME' : DBNAME, 'PG_DBNAME' : DBNAME,
+            'MGD_DBUSER' : DBUSER, 'PG_DBUSER' : DBUSER,
+            'MGD_DBPASSWORDFILE' : passwordFile, 'PG_1LINE_PASSFILE' : passwordFile,
+            'PG_DB_SCHEMA' : SCHEMA,
+            'PGHOST' : self.workDir, 'PGPORT' : str(self.port),
+            }
+
+def loadDataSet(cluster, dataDir, scale, seed):
+    # Purpose: create the schema and load the data set for 'scale'
+    # Returns: seconds taken
+    # Assumes: the cluster is running
+    # Effects: writes files, loads the database
+    # Throws: psycopg2.Error
+
+    startTime = time.time()
+
+    print('Generating scale %s data set ...' % (scale))
+    os.environ['BENCHMARK_DBUSER'] = DBUSER
+    counts = gendata.generate(dataDir, scale, seed)
+
+    conn = cluster.connect()
+    cursor = conn.cursor()
+    fp = open(os.path.join(benchmarkDir, 'schema.sql'), 'r')
+    cursor.execute(fp.read())
+    fp.close()
+
+    for table in TABLES:
+        fileName = os.path.join(dataDir, '%s.txt' % (table))
+        if not os.path.exists(fileName):
+            continue
+        fp = open(fileName, 'r')
+        cursor.copy_expert('copy %s.%s from stdin' % (SCHEMA, table), fp)
+        fp.close()
+        print('%-25s %10s rows' % (table, counts[table]))
+
+    # the dummy sequences of seqdummy.py start after the generated ones
+    cursor.execute("select setval('%s.seq_source_assoc_seq', %s)" % (SCHEMA, counts['SEQ_Sequence']))
+    conn.commit()
+
+    conn.autocommit = True
+    cursor.execute('vacuum analyze')
+    conn.close()
+
+    return time.time() - startTime
+
+def countLines(fileName):
+    if not os.path.exists(fileName):
+        return 0
+    count = 0
+    fp = open(fileName, 'rb')
+    for block in iter(lambda: fp.read(1024 * 1024), b''):
+        count = count + block.count(b'\n')
+    fp.close()
+    return count
+
+def bulkLoad(cluster, outputDir, bcpFiles, truncate):
+    # Purpose: load the bcp files of a load, as its csh wrapper would
+    # Returns: seconds taken
+    # Assumes: the bcp files exist
+    # Effects: loads the database
+    # Throws: psycopg2.Error
+
+    startTime = time.time()
+    conn = cluster.connect()
+    cursor = conn.cursor()
+
+    for fileName, table in bcpFiles:
+        if truncate:
+            cursor.execute('truncate table %s.%s' % (SCHEMA, table))
+        fp = open(os.path.join(outputDir, fileName), 'r')
+        cursor.copy_expert("copy %s.%s from stdin with (format text, delimiter E'\\t', null '')" \
+                % (SCHEMA, table), fp)
+        fp.close()
+
+    if not truncate:
+        cursor.execute("select setval('%s.seq_source_assoc_seq', (select max(_Assoc_key) from %s.SEQ_Source_Assoc))" \
+                % (SCHEMA, SCHEMA))
+
+    conn.commit()
+    conn.close()
+    return time.time() - startTime
+
+def runLoad(cluster, load, workDir, loadMode):
+    # Purpose: run one load end to end
+    # Returns: dictionary of results
+    # Assumes: the data set is loaded
+    # Effects: runs a process, loads the database
+    # Throws: Nothing
+
+    script, table, bcpFiles = LOADS[load]
+    outputDir = os.path.join(workDir, 'output')
+    logsDir = os.path.join(workDir, 'logs')
+
+    env = dict(os.environ)
+    env.update(cluster.environment())
+    env.update({
+        'CACHEDATADIR' : outputDir,
+        'CACHELOGSDIR' : logsDir,
+        'COLDELIM' : COLDELIM,
+        'SEQMARKER_DEBUG' : 'false',
+        'SEQMARKER_MODE' : 'full',
+        'SEQCACHE_LOADMODE' : loadMode,
+        })
+    if table is not None:
+        env['TABLE'] = table
+
+    # copy mode : the load loads its tables itself; the caches are
+    # truncated in their COPY transaction (seqcachelib.CopyWriter) and
+    # seqdummy appends with COPY (seqdummy.loadTables())
+
+    log = open(os.path.join(logsDir, '%s.log' % (load)), 'w')
+
+    print('%s ...' % (load))
+    sys.stdout.flush()
+    startTime = time.time()
+    process = subprocess.Popen([python, os.path.join(loadDir, script)], cwd = outputDir,
+            env = env, stdout = log, stderr = subprocess.STDOUT)
+    pid, status, usage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    wallSeconds = time.time() - startTime
+    log.close()
+
+    result = {
+        'load' : load,
+        'returnCode' : process.returncode,
+        'wallSeconds' : round(wallSeconds, 3),
+        'cpuSeconds' : round(usage.ru_utime + usage.ru_stime, 3),
+        'peakRSSKB' : usage.ru_maxrss,
+        'rowsOut' : sum([countLines(os.path.join(outputDir, f)) for f, t in bcpFiles]),
+        'bulkLoadSeconds' : 0,
+        'phases' : [],
+        }
+    result['rowsPerSec'] = round(result['rowsOut'] / max(wallSeconds, 0.001), 1)
+
+    if process.returncode != 0:
+        print('%s failed (exit %s); see %s' % (load, process.returncode, log.name))
+        return result
+
+    # bcp mode : load the bcp files as the csh wrapper would;
+    # seqdummy appends, the caches are replaced (copy mode : loaded above)
+    if loadMode == 'bcp':
+        result['bulkLoadSeconds'] = round(bulkLoad(cluster, outputDir, bcpFiles, table is not None), 3)
+
+    statsFileName = os.path.join(logsDir, '%s.stats.json' % (load))
+    if os.path.exists(statsFileName):
+        fp = open(statsFileName, 'r')
+        result['phases'] = json.load(fp)['phases']
+        fp.close()
+
+    return result
+
+def report(results, outputFileName):
+    # Purpose: print the results, append them to the csv file and write
+    #          them (with the phases of each load) to the json file
+    # Returns: Nothing
+    # Assumes: Nothing
+    # Effects: writes files
+    # Throws: Nothing
+
+    columns = ['date', 'scale', 'loadMode', 'load', 'returnCode', 'wallSeconds', 'cpuSeconds',
+        'peakRSSKB', 'rowsOut', 'rowsPerSec', 'bulkLoadSeconds']
+
+    print('')
+    print('%-6s %-10s %10s %10s %12s %12s %12s %10s' % ('scale', 'load', 'wall sec', 'cpu sec',
+        'peak RSS KB', 'rows', 'rows/sec', 'bulk sec'))
+    for r in results:
+        print('%-6s %-10s %10.1f %10.1f %12s %12s %12.0f %10.1f' % (r['scale'], r['load'],
+            r['wallSeconds'], r['cpuSeconds'], r['peakRSSKB'], r['rowsOut'], r['rowsPerSec'],
+            r['bulkLoadSeconds']))
+        for p in r['phases']:
+            print('%-6s   %-30s %10.1f %10.1f %12s %12s' % ('', p['phase'], p['wallSeconds'],
+                p['cpuSeconds'], p['peakRSSKB'], p['rowsOut']))
+
+    newFile = not os.path.exists(outputFileName)
+    fp = open(outputFileName, 'a')
+    if newFile:
+        fp.write(','.join(columns) + '\n')
+    for r in results:
+        fp.write(','.join([str(r[c]) for c in columns]) + '\n')
+    fp.close()
+
+    fp = open(outputFileName + '.json', 'w')
+    json.dump(results, fp, indent = 2)
+    fp.write('\n')
+    fp.close()
+
+#
+# Main Routine
+#
+if __name__ == '__main__':
+
+    USAGE = 'Usage: benchmark.py [-s scales] [-l loads] [-m loadmode] [-r seed] ' + \
+        '[-o outputFile] [-w workDir] [-p port] [-k]'
+
+    try:
+        optlist, args = getopt.getopt(sys.argv[1:], 's:l:m:r:o:w:p:k')
+    except getopt.GetoptError:
+        sys.exit(USAGE)
+
+    scales = [1]
+    loads = ['seqdummy', 'seqcoord', 'seqprobe', 'seqmarker']
+    loadMode = 'bcp'
+    seed = 1
+    outputFileName = os.path.abspath('benchmark.csv')
+    workRoot = None
+    port = 55432
+    keep = False
+
+    for opt, arg in optlist:
+        if opt == '-s':
+            scales = [int(s) for s in arg.split(',')]
+        elif opt == '-l':
+            loads = arg.split(',')
+        elif opt == '-m':
+            loadMode = arg
+        elif opt == '-r':
+            seed = int(arg)
+        elif opt == '-o':
+            outputFileName = os.path.abspath(arg)
+        elif opt == '-w':
+            workRoot = os.path.abspath(arg)
+        elif opt == '-p':
+            port = int(arg)
+        elif opt == '-k':
+            keep = True
+
+    for load in loads:
+        if load not in LOADS:
+            sys.exit('unknown load: %s\n%s' % (load, USAGE))
+    if loadMode not in ('bcp', 'copy'):
+        sys.exit(USAGE)
+
+    # only a work directory created here is removed
+    if workRoot is None:
+        workRoot = tempfile.mkdtemp(prefix = 'seqcachebench.')
+    else:
+        keep = True
+
+    results = []
+    date = time.strftime('%Y-%m-%d %H:%M:%S')
+
+    for scale in scales:
+        workDir = os.path.join(workRoot, 'scale%s' % (scale))
+        for d in ('data', 'output', 'logs'):
+            os.makedirs(os.path.join(workDir, d), exist_ok = True)
+
+        cluster = Cluster(workDir, port)
+        cluster.start()
+        try:
+            seconds = loadDataSet(cluster, os.path.join(workDir, 'data'), scale, seed)
+            print('Scale %s data set loaded in %.1f sec' % (scale, seconds))
+
+            for load in loads:
+                result = runLoad(cluster, load, workDir, loadMode)
+                result.update({'date' : date, 'scale' : scale, 'loadMode' : loadMode})
+                results.append(result)
+        finally:
+            cluster.stop()
+
+    report(results, outputFileName)
+
+    if keep:
+        print('Work directory: %s' % (workRoot))
+    else:
+        shutil.rmtree(workRoot)
+
+    failed = [r for r in results if r['returnCode'] != 0]
+    sys.exit(len(failed) > 0)
@@ -0,0 +1,540 @@
+#
+# gendata.py
+#####################################################################
+#
+#  Purpose: generate a synthetic, MGD-shaped data set for the sequence
+#	    cache load benchmark (see benchmark.py and schema.sql)
+#
+#	    At scale 1 there are 20,000 mouse markers, 6,000 human/rat
+#	    markers and 10,000 probes; everything else grows with them.
+#	    Per mouse gene, as in MGD:
+#
+#		NCBI and Ensembl gene models (with raw biotypes and
+#		coordinates), Ensembl transcripts/proteins related by
+#		SEQ_Sequence_Assoc, GenBank DNA/RNA/EST, RefSeq NM/XM/NR
+#		and NP/XP, SwissProt and TrEMBL sequences
+#
+#	    plus pseudogenes, Ensembl regulatory features and VISTA
+#	    enhancers, and the cases the loads have special handling for:
+#
+#		marker accession ids in a different case than the
+#		sequence id, genomic sequences shared by 2 markers,
+#		deleted sequences, marker/probe accession ids with no
+#		sequence (seqdummy), excluded probes (seqprobe) and
+#		PAR (XY) markers (seqmarker_parupdate)
+#
+#	    The data is random but reproducible for a given seed.
+#
+#  Usage:
+#	gendata.py [-s scale] [-r seed] outputDir
+#
+#	writes one tab-delimited file per table, <table>.txt, in COPY
+#	text format; benchmark.py loads them
+#
+#  History
+#
+# 10/18/2026
+#	- new
+#
+
+import sys
+import os
+import getopt
+import random
+
+# number of markers/probes at scale 1
+MOUSE_MARKERS = 20000
+OTHER_MARKERS = 6000
+PROBES = 10000
+REFERENCES = 5000
+
+USER_KEY = 1001
+
+# maximum number of GenBank ids kept to choose probe ids from
+PROBE_ID_POOL = 200000
+
+# MGI types
+MARKER_TYPE = 2
+PROBE_TYPE = 3
+SEQUENCE_TYPE = 19
+CHROMOSOME_TYPE = 27
+
+# organisms
+MOUSE = 1
+HUMAN = 2
+RAT = 40
+
+# sequence types, quality, status
+RNA = 316346
+DNA = 316347
+POLYPEPTIDE = 316348
+HIGH = 316338
+MEDIUM = 316339
+LOW = 316340
+ACTIVE = 316342
+DELETED = 316343
+
+# sequence providers
+GENBANK = 316380
+GENBANK_EST = 316376
+REFSEQ = 316372
+SWISSPROT = 316384
+TREMBL = 316385
+ENSEMBL_GM = 615429
+NCBI_GM = 706915
+ENSEMBL_TRANSCRIPT = 615430
+ENSEMBL_PROTEIN = 615431
+ENSEMBL_REG = 102032586
+VISTA = 102032585
+
+# sequence to sequence qualifiers (seqmarker.py)
+TRANSCRIBED_FROM_KEY = 5445464
+TRANSLATED_FROM_KEY = 5445465
+
+# MCV feature types (_Vocab_key = 79)
+ALL_FEATURE_TYPES = 6238159
+GENE = 6238160
+PROTEIN_CODING = 6238161
+NCRNA_GENE = 6238162
+LNCRNA_GENE = 6238163
+MIRNA_GENE = 6238164
+OTHER_GENOME_FEATURE = 6238178
+ENHANCER = 6238179
+PROMOTER = 6238180
+PSEUDOGENIC_REGION = 6238184
+PSEUDOGENE = 6238185
+
+# marker types
+MT_GENE = 1
+MT_PSEUDOGENE = 7
+MT_OTHER = 12
+
+PROBE_SOURCE_MOUSE = 1
+PROBE_SOURCE_OTHER = 2
+
+EXCLUDED_NOTE = 'The source of the material used to create this cDNA probe was different than that used to create the GenBank sequence record.'
+
+LOADDATE = '2026-10-01'
+
+CHROMOSOMES = [str(c) for c in range(1, 20)] + ['X', 'Y', 'MT']
+
+def nullValue(value):
+    # COPY text format value
+    if value is None:
+        return '\\N'
+    return str(value)
+
+class Writer:
+    # one output file per table, in COPY text format
+
+    def __init__(self, outputDir):
+        self.outputDir = outputDir
+        self.files = {}
+        self.counts = {}
+
+    def write(self, table, row):
+        if table not in self.files:
+            self.files[table] = open(os.path.join(self.outputDir, '%s.txt' % (table)), 'w')
+            self.counts[table] = 0
+        self.files[table].write('\t'.join(map(nullValue, row)) + '\n')
+        self.counts[table] = self.counts[table] + 1
+
+    def close(self):
+        for fp in self.files.values():
+            fp.close()
+
+class Generator:
+    # generates the data set; keys are allocated in order
+
+    def __init__(self, writer, scale, seed):
+
+        self.out = writer
+        self.scale = scale
+        self.random = random.Random(seed)
+        self.nextKey = {}
+
+        # chromosome -> _Map_key
+        self.mapKeys = {}
+
+        # accession ids of GenBank sequences, for the probes;
+        # a random sample of at most PROBE_ID_POOL
+        self.genbankIDs = []
+        self.genbankCount = 0
+
+        # mouse marker keys, for sharing genomic sequences
+        self.lastGenbankDNA = None
+
+    def key(self, name):
+        self.nextKey[name] = self.nextKey.get(name, 0) + 1
+        return self.nextKey[name]
+
+    def chance(self, p):
+        return self.random.random() < p
+
+    def accession(self, accID, ldbKey, objectKey, mgiType, preferred = 1, refs = 0):
+        # an ACC_Accession row, and 'refs' ACC_AccessionReference rows
+
+        accKey = self.key('accession')
+        prefixPart = accID.rstrip('0123456789')
+        numericPart = accID[len(prefixPart):] or None
+        self.out.write('ACC_Accession', [accKey, accID, prefixPart, numericPart,
+                ldbKey, objectKey, mgiType, 0, preferred,
+                USER_KEY, USER_KEY, LOADDATE, LOADDATE])
+
+        for refsKey in self.random.sample(range(1, REFERENCES * self.scale + 1), refs):
+            self.out.write('ACC_AccessionReference', [accKey, refsKey,
+                    USER_KEY, USER_KEY, LOADDATE, LOADDATE])
+        return accKey
+
+    def sequence(self, accID, ldbKey, providerKey, typeKey, length, organismKey = MOUSE):
+        # a SEQ_Sequence and its preferred accession id
+
+        seqKey = self.key('sequence')
+        if self.chance(0.01):
+            statusKey = DELETED
+        else:
+            statusKey = ACTIVE
+
+        self.out.write('SEQ_Sequence', [seqKey, typeKey, HIGH, statusKey, providerKey,
+                organismKey, length, None, '1', None, 0, 1, LOADDATE, LOADDATE,
+                USER_KEY, USER_KEY, LOADDATE, LOADDATE])
+        self.accession(accID, ldbKey, seqKey, SEQUENCE_TYPE)
+        return seqKey
+
+    def coordinate(self, seqKey, chromosome):
+        start = self.random.randint(1, 190000000)
+        self.out.write('MAP_Coord_Feature', [self.key('feature'), self.mapKeys[chromosome],
+                SEQUENCE_TYPE, seqKey, start, start + self.random.randint(500, 200000),
+                self.random.choice(['+', '-'])])
+
+    def genbankID(self, accID):
+        # keep accID as a possible probe id (reservoir sample)
+        self.genbankCount = self.genbankCount + 1
+        if len(self.genbankIDs) < PROBE_ID_POOL:
+            self.genbankIDs.append(accID)
+        else:
+            i = self.random.randrange(self.genbankCount)
+            if i < PROBE_ID_POOL:
+                self.genbankIDs[i] = accID
+
+    def markerAccession(self, accID, ldbKey, markerKey):
+        # a marker's accession id for a sequence; sometimes in another case
+        if self.chance(0.05):
+            accID = accID.lower()
+        self.accession(accID, ldbKey, markerKey, MARKER_TYPE, refs = self.random.randint(1, 2))
+
+    def markerSequence(self, markerKey, accID, ldbKey, providerKey, typeKey, length,
+            organismKey = MOUSE):
+        # a sequence associated with a marker by accession id;
+        # 2% of the marker ids have no sequence (seqdummy)
+        seqKey = None
+        if not self.chance(0.02):
+            seqKey = self.sequence(accID, ldbKey, providerKey, typeKey, length, organismKey)
+        self.markerAccession(accID, ldbKey, markerKey)
+        return seqKey
+
+    def vocabularies(self):
+        # terms, feature type closure, raw biotype mappings, users
+
+        self.out.write('MGI_User', [USER_KEY, os.environ.get('BENCHMARK_DBUSER', 'mgd_dbo'), 'benchmark'])
+        self.out.write('MGI_User', [1670, 'seqdummy', 'seqdummy'])
+
+        terms = [
+            (RNA, 21, 'RNA', None), (DNA, 21, 'DNA', None),
+            (POLYPEPTIDE, 21, 'Polypeptide', None), (316349, 21, 'Not Loaded', None),
+            (HIGH, 22, 'High', None), (MEDIUM, 22, 'Medium', None),
+            (LOW, 22, 'Low', None), (316341, 22, 'Not Loaded', None),
+            (ACTIVE, 20, 'ACTIVE', None), (DELETED, 20, 'DELETED', None),
+            (316345, 20, 'Not Loaded', None),
+            (GENBANK, 25, 'GenBank/EMBL/DDBJ:Rodent', None),
+            (GENBANK_EST, 25, 'GenBank/EMBL/DDBJ:EST', None),
+            (REFSEQ, 25, 'RefSeq', None), (SWISSPROT, 25, 'SWISS-PROT', None),
+            (TREMBL, 25, 'TrEMBL', None), (ENSEMBL_GM, 25, 'Ensembl Gene Model', None),
+            (NCBI_GM, 25, 'NCBI Gene Model', None),
+            (ENSEMBL_TRANSCRIPT, 25, 'Ensembl Transcript', None),
+            (ENSEMBL_PROTEIN, 25, 'Ensembl Protein', None),
+            (ENSEMBL_REG, 25, 'Ensembl Regulatory Feature', None),
+            (VISTA, 25, 'VISTA Enhancer Element', None),
+            (615419, 53, 'genomic', None), (615420, 53, 'transcript', None),
+            (615418, 53, 'polypeptide', None), (615422, 53, 'Not Specified', None),
+            (5420767, 76, 'Yes', None), (5420769, 76, 'Not Applicable', None),
+            (1000001, 95, 'Assembly', None), (1000002, 96, 'base pairs', 'bp'),
+            (ALL_FEATURE_TYPES, 79, 'all feature types', None),
+            (GENE, 79, 'gene', None), (PROTEIN_CODING, 79, 'protein coding gene', None),
+            (NCRNA_GENE, 79, 'non-coding RNA gene', None),
+            (LNCRNA_GENE, 79, 'lncRNA gene', None), (MIRNA_GENE, 79, 'miRNA gene', None),
+            (OTHER_GENOME_FEATURE, 79, 'other genome feature', None),
+            (ENHANCER, 79, 'enhancer', None), (PROMOTER, 79, 'promoter', None),
+            (PSEUDOGENIC_REGION, 79, 'pseudogenic region', None),
+            (PSEUDOGENE, 79, 'pseudogene', None),
+            ]
+
+        # raw biotypes : (key, vocab, term, mcv term, marker type, useMCVchildren)
+        self.rawBiotypes = [
+            (7000001, 103, 'protein_coding', PROTEIN_CODING, MT_GENE, 0),
+            (7000002, 103, 'lncRNA', LNCRNA_GENE, MT_GENE, 0),
+            (7000003, 103, 'miRNA', MIRNA_GENE, MT_GENE, 0),
+            (7000004, 103, 'processed_pseudogene', PSEUDOGENE, MT_PSEUDOGENE, 0),
+            (7000011, 104, 'protein-coding', PROTEIN_CODING, MT_GENE, 0),
+            (7000012, 104, 'ncRNA', NCRNA_GENE, MT_GENE, 1),
+            (7000013, 104, 'pseudo', PSEUDOGENE, MT_PSEUDOGENE, 0),
+            (7000014, 104, 'other', ALL_FEATURE_TYPES, MT_OTHER, 0),
+            (7000021, 176, 'enhancer', ENHANCER, MT_OTHER, 0),
+            (7000022, 176, 'promoter', PROMOTER, MT_OTHER, 0),
+            (7000023, 176, 'open_chromatin_region', OTHER_GENOME_FEATURE, MT_OTHER, 1),
+            (7000031, 175, 'enhancer', ENHANCER, MT_OTHER, 0),
+            ]
+
+        for key, vocab, term, abbreviation in terms:
+            self.out.write('VOC_Term', [key, vocab, term, abbreviation, 1])
+
+        for key, vocab, term, mcvKey, markerType, useChildren in self.rawBiotypes:
+            self.out.write('VOC_Term', [key, vocab, term, None, 1])
+            self.out.write('MRK_BiotypeMapping', [self.key('biotypeMapping'), vocab, key,
+                    mcvKey, mcvKey, markerType, useChildren])
+
+        closure = {
+            ALL_FEATURE_TYPES : [GENE, PROTEIN_CODING, NCRNA_GENE, LNCRNA_GENE, MIRNA_GENE,
+                OTHER_GENOME_FEATURE, ENHANCER, PROMOTER, PSEUDOGENIC_REGION, PSEUDOGENE],
+            GENE : [PROTEIN_CODING, NCRNA_GENE, LNCRNA_GENE, MIRNA_GENE],
+            NCRNA_GENE : [LNCRNA_GENE, MIRNA_GENE],
+            OTHER_GENOME_FEATURE : [ENHANCER, PROMOTER],
+            PSEUDOGENIC_REGION : [PSEUDOGENE],
+            }
+        for ancestor in closure:
+            for descendent in closure[ancestor]:
+                self.out.write('DAG_Closure', [9, 13, ancestor, descendent])
+
+        # chromosomes and the assembly coordinate maps
+        for i, chromosome in enumerate(CHROMOSOMES):
+            chrKey = self.key('chromosome')
+            self.out.write('MRK_Chromosome', [chrKey, MOUSE, chromosome, i + 1])
+            mapKey = self.key('map')
+            self.mapKeys[chromosome] = mapKey
+            self.out.write('MAP_Coordinate', [mapKey, 1, chrKey, CHROMOSOME_TYPE,
+                    1000001, 1000002, 200000000, i + 1, 'chr' + chromosome,
+                    chromosome, 'GRCm39'])
+
+        self.out.write('PRB_Source', [PROBE_SOURCE_MOUSE, MOUSE, 'mouse'])
+        self.out.write('PRB_Source', [PROBE_SOURCE_OTHER, HUMAN, 'human'])
+
+    def biotype(self, vocab):
+        # a raw biotype of 'vocab'; sometimes not mapped (writeError)
+        if self.chance(0.002):
+            return 'unmapped_biotype'
+        return self.random.choice([b[2] for b in self.rawBiotypes if b[1] == vocab])
+
+    def marker(self, organismKey, markerType, featureType, chromosome, symbol):
+        markerKey = self.key('marker')
+        self.out.write('MRK_Marker', [markerKey, organismKey, 1, markerType, symbol,
+                symbol + ' name', chromosome, USER_KEY, USER_KEY, LOADDATE, LOADDATE])
+        if organismKey == MOUSE:
+            self.out.write('MRK_MCV_Cache', [markerKey, featureType, None, 'D', None,
+                    USER_KEY, USER_KEY, LOADDATE, LOADDATE])
+        return markerKey
+
+    def geneModel(self, markerKey, accID, ldbKey, providerKey, vocab, chromosome):
+        seqKey = self.sequence(accID, ldbKey, providerKey, DNA, self.random.randint(1000, 200000))
+        self.out.write('SEQ_GeneModel', [seqKey, None, self.biotype(vocab),
+                self.random.randint(1, 30), self.random.randint(1, 8),
+                USER_KEY, USER_KEY, LOADDATE, LOADDATE])
+        self.coordinate(seqKey, chromosome)
+        self.markerAccession(accID, ldbKey, markerKey)
+        return seqKey
+
+    def ensemblTranscripts(self, markerKey, genomicKey, coding):
+        # Ensembl transcripts of a gene model and their proteins
+
+        for i in range(self.random.randint(1, 4)):
+            n = self.key('ensemblTranscript')
+            tKey = self.markerSequence(markerKey, 'ENSMUST%011d' % (n), 133,
+                    ENSEMBL_TRANSCRIPT, RNA, self.random.randint(300, 8000))
+            if tKey is None:
+                continue
+            self.out.write('SEQ_Sequence_Assoc', [self.key('seqAssoc'), tKey,
+                    TRANSCRIBED_FROM_KEY, genomicKey, USER_KEY, USER_KEY, LOADDATE, LOADDATE])
+            if coding:
+                pKey = self.markerSequence(markerKey, 'ENSMUSP%011d' % (n), 134,
+                        ENSEMBL_PROTEIN, POLYPEPTIDE, self.random.randint(50, 3000))
+                if pKey is not None:
+                    self.out.write('SEQ_Sequence_Assoc', [self.key('seqAssoc'), pKey,
+                            TRANSLATED_FROM_KEY, tKey, USER_KEY, USER_KEY, LOADDATE, LOADDATE])
+
+    def mouseGene(self, i):
+        r = self.random.random()
+        if r < 0.8:
+            markerType, featureType = MT_GENE, self.random.choice(
+                    [PROTEIN_CODING, PROTEIN_CODING, PROTEIN_CODING, LNCRNA_GENE, MIRNA_GENE])
+        elif r < 0.9:
+            markerType, featureType = MT_PSEUDOGENE, PSEUDOGENE
+        else:
+            markerType, featureType = MT_OTHER, self.random.choice([ENHANCER, PROMOTER])
+
+        chromosome = self.random.choice(CHROMOSOMES)
+        symbol = 'Gene%s' % (i)
+
+        # PAR markers (seqmarker_parupdate.py)
+        par = markerType == MT_GENE and self.chance(0.001)
+        if par:
+            chromosome = 'XY'
+            symbol = symbol + self.random.choice(['X', 'Y'])
+
+        markerKey = self.marker(MOUSE, markerType, featureType, chromosome, symbol)
+
+        if markerType == MT_OTHER:
+            if self.chance(0.6):
+                self.geneModel(markerKey, 'ENSMUSR%011d' % (markerKey), 222,
+                        ENSEMBL_REG, 176, self.random.choice(CHROMOSOMES[:-3]))
+            else:
+                self.geneModel(markerKey, 'hs%s' % (markerKey), 223, VISTA, 175,
+                        self.random.choice(CHROMOSOMES[:-3]))
+            return
+
+        coding = featureType == PROTEIN_CODING
+
+        if self.chance(0.9) or par:
+            ncbiID = str(100000 + markerKey)
+            if par:
+                self.geneModel(markerKey, ncbiID, 59, NCBI_GM, 104, self.random.choice(['X', 'Y']))
+            else:
+                self.geneModel(markerKey, ncbiID, 59, NCBI_GM, 104, chromosome)
+            # the NCBI gene id of the marker
+            self.accession(ncbiID, 55, markerKey, MARKER_TYPE)
+
+        if self.chance(0.8) and not par:
+            genomicKey = self.geneModel(markerKey, 'ENSMUSG%011d' % (markerKey), 60,
+                    ENSEMBL_GM, 103, chromosome)
+            self.ensemblTranscripts(markerKey, genomicKey, coding)
+
+        # GenBank DNA; sometimes shared with the previous marker
+        if self.lastGenbankDNA is not None and self.chance(0.03):
+            self.markerAccession(self.lastGenbankDNA, 9, markerKey)
+        for j in range(self.random.randint(0, 2)):
+            accID = 'AC%06d' % (self.key('genbankDNA'))
+            seqKey = self.markerSequence(markerKey, accID, 9, GENBANK, DNA,
+                    self.random.randint(1000, 200000))
+            if seqKey is not None:
+                self.coordinate(seqKey, self.random.choice(CHROMOSOMES))
+                self.lastGenbankDNA = accID
+                self.genbankID(accID)
+
+        if markerType == MT_PSEUDOGENE:
+            return
+
+        # GenBank RNA and ESTs
+        for j in range(self.random.randint(1, 4)):
+            accID = 'BC%06d' % (self.key('genbankRNA'))
+            self.markerSequence(markerKey, accID, 9, GENBANK, RNA, self.random.randint(300, 8000))
+            self.genbankID(accID)
+        for j in range(self.random.randint(0, 6)):
+            accID = 'AA%06d' % (self.key('genbankEST'))
+            self.markerSequence(markerKey, accID, 9, GENBANK_EST, RNA, self.random.randint(200, 900))
+            self.genbankID(accID)
+
+        # RefSeq
+        if coding:
+            prefix, protein = self.random.choice([('NM_', 'NP_'), ('NM_', 'NP_'), ('XM_', 'XP_')])
+        else:
+            prefix, protein = self.random.choice([('NR_', None), ('XR_', None)])
+        for j in range(self.random.randint(1, 3)):
+            n = self.key('refseq')
+            self.markerSequence(markerKey, '%s%06d' % (prefix, n), 27, REFSEQ, RNA,
+                    self.random.randint(300, 8000))
+            if protein is not None:
+                self.markerSequence(markerKey, '%s%06d' % (protein, n), 27, REFSEQ,
+                        POLYPEPTIDE, self.random.randint(50, 3000))
+
+        # UniProt
+        if coding:
+            if self.chance(0.5):
+                self.markerSequence(markerKey, 'P%05d' % (self.key('swissprot')), 13,
+                        SWISSPROT, POLYPEPTIDE, self.random.randint(50, 3000))
+            for j in range(self.random.randint(0, 2)):
+                self.markerSequence(markerKey, 'Q%07d' % (self.key('trembl')), 41,
+                        TREMBL, POLYPEPTIDE, self.random.randint(50, 3000))
+
+    def otherGene(self, i):
+        organismKey = self.random.choice([HUMAN, RAT])
+        markerKey = self.marker(organismKey, MT_GENE, None, self.random.choice(CHROMOSOMES), 'GENE%s' % (i))
+
+        for j in range(self.random.randint(1, 3)):
+            n = self.key('refseq')
+            self.markerSequence(markerKey, 'NM_%06d' % (n), 27, REFSEQ, RNA,
+                    self.random.randint(300, 8000), organismKey)
+            self.markerSequence(markerKey, 'NP_%06d' % (n), 27, REFSEQ, POLYPEPTIDE,
+                    self.random.randint(50, 3000), organismKey)
+        for j in range(self.random.randint(0, 3)):
+            self.markerSequence(markerKey, 'BC%06d' % (self.key('genbankRNA')), 9, GENBANK,
+                    RNA, self.random.randint(300, 8000), organismKey)
+        if self.chance(0.7):
+            self.markerSequence(markerKey, 'P%05d' % (self.key('swissprot')), 13, SWISSPROT,
+                    POLYPEPTIDE, self.random.randint(50, 3000), organismKey)
+
+    def probe(self, i):
+        probeKey = self.key('probe')
+        if self.chance(0.9):
+            sourceKey = PROBE_SOURCE_MOUSE
+        else:
+            sourceKey = PROBE_SOURCE_OTHER
+        self.out.write('PRB_Probe', [probeKey, 'probe%s' % (i), sourceKey])
+
+        for j in range(self.random.randint(1, 3)):
+            # mostly ids of existing GenBank sequences
+            if self.genbankIDs and self.chance(0.95):
+                accID = self.random.choice(self.genbankIDs)
+            else:
+                accID = 'BX%06d' % (self.key('probeOnly'))
+            self.accession(accID, 9, probeKey, PROBE_TYPE, refs = self.random.randint(1, 2))
+
+        if self.chance(0.01):
+            self.out.write('PRB_Notes', [probeKey, 1, EXCLUDED_NOTE])
+
+    def generate(self):
+        self.vocabularies()
+        for i in range(MOUSE_MARKERS * self.scale):
+            self.mouseGene(i)
+        for i in range(OTHER_MARKERS * self.scale):
+            self.otherGene(i)
+        for i in range(PROBES * self.scale):
+            self.probe(i)
+
+def generate(outputDir, scale = 1, seed = 1):
+    # Purpose: write the data set for 'scale' to outputDir/<table>.txt
+    # Returns: {table:rowCount, ...}
+    # Assumes: outputDir exists
+    # Effects: writes files
+    # Throws: Nothing
+
+    writer = Writer(outputDir)
+    try:
+        Generator(writer, scale, seed).generate()
+    finally:
+        writer.close()
+    return writer.counts
+
+#
+# Main Routine
+#
+if __name__ == '__main__':
+
+    USAGE = 'Usage: gendata.py [-s scale] [-r seed] outputDir'
+
+    try:
+        optlist, args = getopt.getopt(sys.argv[1:], 's:r:')
+    except getopt.GetoptError:
+        sys.exit(USAGE)
+
+    if len(args) != 1:
+        sys.exit(USAGE)
+
+    scale = 1
+    seed = 1
+    for opt, arg in optlist:
+        if opt == '-s':
+            scale = int(arg)
+        elif opt == '-r':
+            seed = int(arg)
+
+    counts = generate(args[0], scale, seed)
+    for table in sorted(counts):
+        print('%-25s %10s' % (table, counts[table]))
@@ -0,0 +1,309 @@
+--
+-- schema.sql
+--
+-- Minimal MGD schema for the sequence cache load benchmark (benchmark.py):
+-- only the tables, columns, views and sequences read or written by
+-- seqdummy.py, seqcoord.py, seqprobe.py, seqmarker.py and
+-- seqmarker_parupdate.py, with the indexes that their queries rely on.
+--
+-- Column order of the tables loaded from bcp files matches the bcp files.
+--
+
+create schema mgd;
+set search_path to mgd;
+
+create table MGI_User (
+	_User_key		int not null primary key,
+	login			text not null,
+	name			text
+);
+
+create table VOC_Term (
+	_Term_key		int not null primary key,
+	_Vocab_key		int not null,
+	term			text,
+	abbreviation		text,
+	sequenceNum		int
+);
+create index VOC_Term_idx_Vocab_key on VOC_Term (_Vocab_key);
+
+-- representative sequence qualifiers
+create view VOC_Term_RepQualifier_View as
+select _Term_key, term from VOC_Term where _Vocab_key = 53;
+
+create table DAG_Closure (
+	_DAG_key		int not null,
+	_MGIType_key		int not null,
+	_AncestorObject_key	int not null,
+	_DescendentObject_key	int not null
+);
+create index DAG_Closure_idx_Ancestor on DAG_Closure (_DAG_key, _AncestorObject_key);
+
+create table ACC_Accession (
+	_Accession_key		int not null primary key,
+	accID			text not null,
+	prefixPart		text,
+	numericPart		int,
+	_LogicalDB_key		int not null,
+	_Object_key		int not null,
+	_MGIType_key		int not null,
+	private			smallint not null,
+	preferred		smallint not null,
+	_CreatedBy_key		int not null,
+	_ModifiedBy_key		int not null,
+	creation_date		timestamp not null default now(),
+	modification_date	timestamp not null default now()
+);
+create index ACC_Accession_idx_accID on ACC_Accession (accID);
+create index ACC_Accession_idx_lower_accID on ACC_Accession (lower(accID));
+create index ACC_Accession_idx_Object_MGIType on ACC_Accession (_Object_key, _MGIType_key);
+create index ACC_Accession_idx_LogicalDB_MGIType on ACC_Accession (_LogicalDB_key, _MGIType_key);
+create index ACC_Accession_idx_modification_date on ACC_Accession (modification_date);
+
+create table ACC_AccessionReference (
+	_Accession_key		int not null,
+	_Refs_key		int not null,
+	_CreatedBy_key		int not null,
+	_ModifiedBy_key		int not null,
+	creation_date		timestamp not null default now(),
+	modification_date	timestamp not null default now(),
+	primary key (_Accession_key, _Refs_key)
+);
+create index ACC_AccessionReference_idx_Refs_key on ACC_AccessionReference (_Refs_key);
+
+create table SEQ_Sequence (
+	_Sequence_key		int not null primary key,
+	_SequenceType_key	int not null,
+	_SequenceQuality_key	int not null,
+	_SequenceStatus_key	int not null,
+	_SequenceProvider_key	int not null,
+	_Organism_key		int not null,
+	length			int,
+	description		text,
+	version			text,
+	division		text,
+	virtual			smallint not null,
+	numberOfOrganisms	int,
+	seqrecord_date		timestamp,
+	sequence_date		timestamp,
+	_CreatedBy_key		int not null,
+	_ModifiedBy_key		int not null,
+	creation_date		timestamp not null default now(),
+	modification_date	timestamp not null default now()
+);
+create index SEQ_Sequence_idx_Provider on SEQ_Sequence (_SequenceProvider_key);
+create index SEQ_Sequence_idx_modification_date on SEQ_Sequence (modification_date);
+
+create table SEQ_Sequence_Raw (
+	_Sequence_key		int not null primary key,
+	rawType			text,
+	rawLibrary		text,
+	rawOrganism		text,
+	rawStrain		text,
+	rawTissue		text,
+	rawAge			text,
+	rawSex			text,
+	rawCellLine		text,
+	_CreatedBy_key		int not null,
+	_ModifiedBy_key		int not null,
+	creation_date		timestamp not null default now(),
+	modification_date	timestamp not null default now()
+);
+
+create sequence seq_source_assoc_seq;
+
+create table SEQ_Source_Assoc (
+	_Assoc_key		int not null primary key,
+	_Sequence_key		int not null,
+	_Source_key		int not null,
+	_CreatedBy_key		int not null,
+	_ModifiedBy_key		int not null,
+	creation_date		timestamp not null default now(),
+	modification_date	timestamp not null default now()
+);
+
+create table SEQ_Sequence_Assoc (
+	_Assoc_key		int not null primary key,
+	_Sequence_key_1		int not null,
+	_Qualifier_key		int not null,
+	_Sequence_key_2		int not null,
+	_CreatedBy_key		int not null,
+	_ModifiedBy_key		int not null,
+	creation_date		timestamp not null default now(),
+	modification_date	timestamp not null default now()
+);
+create index SEQ_Sequence_Assoc_idx_1 on SEQ_Sequence_Assoc (_Sequence_key_1);
+create index SEQ_Sequence_Assoc_idx_2 on SEQ_Sequence_Assoc (_Sequence_key_2);
+create index SEQ_Sequence_Assoc_idx_Qualifier on SEQ_Sequence_Assoc (_Qualifier_key);
+
+create table SEQ_GeneModel (
+	_Sequence_key		int not null primary key,
+	_GMMarkerType_key	int,
+	rawBiotype		text,
+	exonCount		int,
+	transcriptCount		int,
+	_CreatedBy_key		int not null,
+	_ModifiedBy_key		int not null,
+	creation_date		timestamp not null default now(),
+	modification_date	timestamp not null default now()
+);
+
+create table MRK_Chromosome (
+	_Chromosome_key		int not null primary key,
+	_Organism_key		int not null,
+	chromosome		text not null,
+	sequenceNum		int not null
+);
+
+create table MRK_Marker (
+	_Marker_key		int not null primary key,
+	_Organism_key		int not null,
+	_Marker_Status_key	int not null,
+	_Marker_Type_key	int not null,
+	symbol			text not null,
+	name			text,
+	chromosome		text,
+	_CreatedBy_key		int not null,
+	_ModifiedBy_key		int not null,
+	creation_date		timestamp not null default now(),
+	modification_date	timestamp not null default now()
+);
+create index MRK_Marker_idx_Organism on MRK_Marker (_Organism_key);
+
+create table MRK_MCV_Cache (
+	_Marker_key		int not null,
+	_MCVTerm_key		int not null,
+	term			text,
+	qualifier		char(1) not null,
+	directTerms		text,
+	_CreatedBy_key		int not null,
+	_ModifiedBy_key		int not null,
+	creation_date		timestamp not null default now(),
+	modification_date	timestamp not null default now()
+);
+create index MRK_MCV_Cache_idx_Marker_key on MRK_MCV_Cache (_Marker_key);
+
+create table MRK_BiotypeMapping (
+	_BiotypeMapping_key	int not null primary key,
+	_BiotypeVocab_key	int not null,
+	_BiotypeTerm_key	int not null,
+	_MCVTerm_key		int not null,
+	_Primary_MCVTerm_key	int not null,
+	_Marker_Type_key	int not null,
+	useMCVchildren		smallint not null
+);
+
+create table MAP_Coordinate (
+	_Map_key		int not null primary key,
+	_Collection_key		int not null,
+	_Object_key		int not null,
+	_MGIType_key		int not null,
+	_MapType_key		int not null,
+	_Units_key		int not null,
+	length			int,
+	sequenceNum		int,
+	name			text,
+	abbreviation		text,
+	version			text
+);
+
+create table MAP_Coord_Feature (
+	_Feature_key		int not null primary key,
+	_Map_key		int not null,
+	_MGIType_key		int not null,
+	_Object_key		int not null,
+	startCoordinate		numeric,
+	endCoordinate		numeric,
+	strand			char(1)
+);
+create index MAP_Coord_Feature_idx_Object on MAP_Coord_Feature (_Object_key, _MGIType_key);
+create index MAP_Coord_Feature_idx_Map_key on MAP_Coord_Feature (_Map_key);
+
+-- gene model coordinates (seqmarker_parupdate.py, SEQMARKER_PARFILTER)
+create view map_gm_coord_feature_view as
+select a.accID as seqID, a._Object_key as _Sequence_key,
+	c.chromosome as genomicChromosome,
+	f.startCoordinate, f.endCoordinate, f.strand
+from ACC_Accession a, MAP_Coord_Feature f, MAP_Coordinate mc, MRK_Chromosome c
+where a._MGIType_key = 19
+and a._LogicalDB_key in (59, 60)
+and a.preferred = 1
+and a._Object_key = f._Object_key
+and f._MGIType_key = 19
+and f._Map_key = mc._Map_key
+and mc._Object_key = c._Chromosome_key;
+
+create table PRB_Source (
+	_Source_key		int not null primary key,
+	_Organism_key		int not null,
+	name			text
+);
+
+create table PRB_Probe (
+	_Probe_key		int not null primary key,
+	name			text not null,
+	_Source_key		int not null
+);
+
+create table PRB_Notes (
+	_Probe_key		int not null,
+	sequenceNum		int not null,
+	note			text not null
+);
+
+--
+-- the caches
+--
+
+create table SEQ_Coord_Cache (
+	_Map_key		int not null,
+	_Sequence_key		int not null,
+	chromosome		text not null,
+	startCoordinate		numeric,
+	endCoordinate		numeric,
+	strand			text,
+	mapUnits		text,
+	provider		text,
+	version			text,
+	_CreatedBy_key		int not null,
+	_ModifiedBy_key		int not null,
+	creation_date		timestamp not null default now(),
+	modification_date	timestamp not null default now()
+);
+create index SEQ_Coord_Cache_idx_Sequence_key on SEQ_Coord_Cache (_Sequence_key);
+
+create table SEQ_Probe_Cache (
+	_Sequence_key		int not null,
+	_Probe_key		int not null,
+	_Refs_key		int not null,
+	annotation_date		timestamp,
+	_CreatedBy_key		int not null,
+	_ModifiedBy_key		int not null,
+	creation_date		timestamp not null default now(),
+	modification_date	timestamp not null default now()
+);
+create index SEQ_Probe_Cache_idx_Sequence_key on SEQ_Probe_Cache (_Sequence_key);
+create index SEQ_Probe_Cache_idx_Probe_key on SEQ_Probe_Cache (_Probe_key);
+
+create table SEQ_Marker_Cache (
+	_Cache_key		int not null primary key,
+	_Sequence_key		int not null,
+	_Marker_key		int not null,
+	_Organism_key		int not null,
+	_Refs_key		int not null,
+	_Qualifier_key		int not null,
+	_SequenceProvider_key	int not null,
+	_SequenceType_key	int not null,
+	_LogicalDB_key		int not null,
+	_Marker_Type_key	int not null,
+	_BiotypeConflict_key	int not null,
+	accID			text not null,
+	rawbiotype		text,
+	annotation_date		timestamp,
+	_CreatedBy_key		int not null,
+	_ModifiedBy_key		int not null,
+	creation_date		timestamp not null default now(),
+	modification_date	timestamp not null default now()
+);
+create index SEQ_Marker_Cache_idx_Sequence_key on SEQ_Marker_Cache (_Sequence_key);
+create index SEQ_Marker_Cache_idx_Marker_key on SEQ_Marker_Cache (_Marker_key);
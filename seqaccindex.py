@@ -0,0 +1,135 @@
+#
+# seqaccindex.py
+#####################################################################
+#
+#  Purpose: builds the normalized accession index used by the sequence
+#	    cache loads in place of their lower(accID) = lower(accID) joins:
+#
+#	    seqcache_accindex : the marker (2), probe (3) and sequence (19)
+#	    accession ids of ACC_Accession with lower(accID) as a column,
+#	    indexed by (lowerAccID, _LogicalDB_key, _MGIType_key)
+#
+#	    seqcacheload.py builds it once per run (SEQCACHE_ACCINDEX=true),
+#	    adds the accession ids of the dummy sequences after seqdummy
+#	    (-u) and runs the loads with SEQCACHE_USEACCINDEX=true
+#
+#  Usage:
+#	seqaccindex.py [-u]
+#
+#	-u : add the accession ids created since the index was built
+#	     (_Accession_key greater than its largest) instead of building it
+#
+#  Env Vars: PG_DB_SCHEMA
+#
+#  Inputs: 1) mgd database
+#          2) Configuration
+#
+#  Outputs: 1) log file (stdout)
+#           2) table seqcache_accindex
+#
+#  Exit Codes: 0 if the index was built, else 1
+#
+#  History
+#
+# 10/18/2026
+#	- new
+#
+
+import sys
+import getopt
+import mgi_utils
+import db
+import seqcachelib
+import seqcachestats
+
+db.setTrace()
+
+USAGE = 'Usage: seqaccindex.py [-u]'
+
+# the accession ids the loads match on
+SELECT = '''
+    select _Accession_key, _Object_key, _MGIType_key, _LogicalDB_key,
+        accID, lower(accID) as lowerAccID, preferred
+    from ACC_Accession
+    where _MGIType_key in (2, 3, 19)
+    '''
+
+# per-phase timing and row counts
+stats = seqcachestats.Stats('seqaccindex')
+
+def build():
+    # Purpose: (re)create seqcache_accindex
+    # Returns: Nothing
+    # Assumes: Nothing
+    # Effects: drops and creates a table
+    # Throws: Nothing
+
+    table = '%s.%s' % (seqcachelib.schema, seqcachelib.accIndexTable)
+
+    with stats.phase('index table creation') as phase:
+        db.sql('drop table if exists %s' % (table), None)
+        db.sql('create unlogged table %s as %s' % (table, SELECT), None)
+        results = db.sql('select count(*) as rowCount from %s' % (table), 'auto')
+        phase.rowsOut = results[0]['rowCount']
+
+    with stats.phase('index creation'):
+        db.sql('create unique index %s_idx_key on %s (_Accession_key)' \
+                % (seqcachelib.accIndexTable, table), None)
+        db.sql('create index %s_idx_lower on %s (lowerAccID, _LogicalDB_key, _MGIType_key)' \
+                % (seqcachelib.accIndexTable, table), None)
+        db.sql('create index %s_idx_object on %s (_Object_key, _MGIType_key)' \
+                % (seqcachelib.accIndexTable, table), None)
+        db.sql('analyze %s' % (table), None)
+
+    db.commit()
+
+def update():
+    # Purpose: add the accession ids created since seqcache_accindex
+    #          was built (e.g. by seqdummy)
+    # Returns: the phase
+    # Assumes: accession keys are assigned in increasing order
+    # Effects: inserts into a table
+    # Throws: Nothing
+
+    table = '%s.%s' % (seqcachelib.schema, seqcachelib.accIndexTable)
+
+    with stats.phase('index table update') as phase:
+        results = db.sql('select coalesce(max(_Accession_key), 0) as maxKey from %s' % (table), 'auto')
+        maxKey = results[0]['maxKey']
+        db.sql('insert into %s %s and _Accession_key > %s' % (table, SELECT, maxKey), None)
+        results = db.sql('select count(*) as rowCount from %s where _Accession_key > %s' \
+                % (table, maxKey), 'auto')
+        phase.rowsOut = results[0]['rowCount']
+        if phase.rowsOut > 0:
+            db.sql('analyze %s' % (table), None)
+
+    db.commit()
+    return phase
+
+#
+# Main Routine
+#
+
+try:
+    optlist, args = getopt.getopt(sys.argv[1:], 'u')
+except getopt.GetoptError:
+    sys.exit(USAGE)
+
+if len(args) != 0:
+    sys.exit(USAGE)
+
+print('%s' % mgi_utils.date())
+db.useOneConnection(1)
+
+if ('-u', '') in optlist:
+    # add to the phases of the build
+    stats = seqcachestats.read('seqaccindex')
+    phase = update()
+    db.useOneConnection(0)
+    stats.write([phase])
+else:
+    build()
+    db.useOneConnection(0)
+    stats.write()
+
+print('%s' % mgi_utils.date())
@@ -0,0 +1,206 @@
+#
+# seqcachebcp.py
+#####################################################################
+#
+#  Purpose: the bcp rows of the tables written by the sequence cache loads
+#
+#	    Each table is described once (Table : its columns, their types
+#	    and which may be null); a Writer formats the rows given to it,
+#	    tuples in column order, a batch at a time with one precompiled
+#	    format per table and writes each batch with one write()
+#
+#	    The format is that of bcpin.csh and seqcachelib.copyIn():
+#	    COLDELIM between columns, a newline after each row and an
+#	    empty string for null
+#
+#  Usage:
+#	import seqcachebcp
+#
+#	writer = seqcachebcp.Writer(outBCP, seqcachebcp.SEQ_Probe_Cache)
+#	writer.write((sequenceKey, probeKey, ...))
+#	writer.flush()
+#	stats.close(outBCP)
+#
+#  History
+#
+# 10/18/2026
+#	- new
+#
+
+import seqcachelib
+
+NL = '\n'
+DL = seqcachelib.DL
+
+# column types; an INT column that may not be null is formatted with %d,
+# so that a value of the wrong type fails instead of being written
+INT = 'int'
+FLOAT = 'float'
+TEXT = 'text'
+DATE = 'date'
+
+# number of rows formatted and written at a time
+batchSize = 10000
+
+class Table:
+    # A representation of a table's bcp row : its columns, in order,
+    # and the format of one row
+
+    def __init__(self, name, columns, nullable = ()):
+        # name : table name
+        # columns : list of (column name, type)
+        # nullable : names of the columns that may be null (None)
+
+        self.name = name
+        self.columns = [c for c, t in columns]
+
+        # the positions of the nullable columns
+        self.nullable = [i for i in range(len(columns)) if columns[i][0] in nullable]
+
+        fields = []
+        for i in range(len(columns)):
+            if columns[i][1] == INT and i not in self.nullable:
+                fields.append('%d')
+            else:
+                fields.append('%s')
+        self.template = DL.join(fields) + NL
+
+    def fillNulls(self, row):
+        # the row, with '' for each null in a nullable column
+
+        row = list(row)
+        for i in self.nullable:
+            if row[i] is None:
+                row[i] = ''
+        return tuple(row)
+
+    def format(self, rows):
+        # the bcp lines of 'rows' (tuples in column order), as one string
+
+        template = self.template
+        if self.nullable:
+            rows = map(self.fillNulls, rows)
+        return ''.join([template % row for row in rows])
+
+class Writer:
+    # Writes the bcp rows of a Table to an output of
+    # seqcachelib.openOutput() (or any text file), batchSize rows at a time.
+    # flush() before closing the output.
+
+    def __init__(self, output, table):
+
+        self.output = output
+        self.table = table
+        self.rows = []
+        self.rowCount = 0
+
+    def write(self, row):
+        # row : tuple, in the table's column order
+
+        self.rows.append(row)
+        if len(self.rows) >= batchSize:
+            self.flush()
+
+    def writeRows(self, rows):
+        # rows : iterable of tuples
+
+        for row in rows:
+            self.rows.append(row)
+            if len(self.rows) >= batchSize:
+                self.flush()
+
+    def flush(self):
+        # format and write the rows held
+
+        if self.rows:
+            self.output.write(self.table.format(self.rows))
+            self.rowCount = self.rowCount + len(self.rows)
+            self.rows = []
+
+#
+# the tables
+#
+
+# the audit columns every table ends with
+AUDIT = [('_CreatedBy_key', INT), ('_ModifiedBy_key', INT),
+         ('creation_date', DATE), ('modification_date', DATE)]
+
+SEQ_Coord_Cache = Table('SEQ_Coord_Cache', [
+    ('_Map_key', INT),
+    ('_Sequence_key', INT),
+    ('chromosome', TEXT),
+    ('startCoordinate', FLOAT),
+    ('endCoordinate', FLOAT),
+    ('strand', TEXT),
+    ('mapUnits', TEXT),
+    ('provider', TEXT),
+    ('version', TEXT)] + AUDIT,
+    nullable = ('startCoordinate', 'endCoordinate', 'strand', 'version'))
+
+SEQ_Probe_Cache = Table('SEQ_Probe_Cache', [
+    ('_Sequence_key', INT),
+    ('_Probe_key', INT),
+    ('_Refs_key', INT),
+    ('annotation_date', DATE)] + AUDIT)
+
+SEQ_Marker_Cache = Table('SEQ_Marker_Cache', [
+    ('_Cache_key', INT),
+    ('_Sequence_key', INT),
+    ('_Marker_key', INT),
+    ('_Organism_key', INT),
+    ('_Refs_key', INT),
+    ('_Qualifier_key', INT),
+    ('_SequenceProvider_key', INT),
+    ('_SequenceType_key', INT),
+    ('_LogicalDB_key', INT),
+    ('_Marker_Type_key', INT),
+    ('_BiotypeConflict_key', INT),
+    ('accID', TEXT),
+    ('rawbiotype', TEXT),
+    ('annotation_date', DATE)] + AUDIT,
+    nullable = ('rawbiotype',))
+
+SEQ_Sequence = Table('SEQ_Sequence', [
+    ('_Sequence_key', INT),
+    ('_SequenceType_key', INT),
+    ('_SequenceQuality_key', INT),
+    ('_SequenceStatus_key', INT),
+    ('_SequenceProvider_key', INT),
+    ('_Organism_key', INT),
+    ('length', INT),
+    ('description', TEXT),
+    ('version', TEXT),
+    ('division', TEXT),
+    ('virtual', INT),
+    ('numberOfOrganisms', INT),
+    ('seqrecord_date', DATE),
+    ('sequence_date', DATE)] + AUDIT,
+    nullable = ('length', 'description', 'version', 'division', 'numberOfOrganisms'))
+
+SEQ_Sequence_Raw = Table('SEQ_Sequence_Raw', [
+    ('_Sequence_key', INT),
+    ('rawType', TEXT),
+    ('rawLibrary', TEXT),
+    ('rawOrganism', TEXT),
+    ('rawStrain', TEXT),
+    ('rawTissue', TEXT),
+    ('rawAge', TEXT),
+    ('rawSex', TEXT),
+    ('rawCellLine', TEXT)] + AUDIT)
+
+SEQ_Source_Assoc = Table('SEQ_Source_Assoc', [
+    ('_Assoc_key', INT),
+    ('_Sequence_key', INT),
+    ('_Source_key', INT)] + AUDIT)
+
+ACC_Accession = Table('ACC_Accession', [
+    ('_Accession_key', INT),
+    ('accID', TEXT),
+    ('prefixPart', TEXT),
+    ('numericPart', INT),
+    ('_LogicalDB_key', INT),
+    ('_Object_key', INT),
+    ('_MGIType_key', INT),
+    ('private', INT),
+    ('preferred', INT)] + AUDIT,
+    nullable = ('prefixPart', 'numericPart'))
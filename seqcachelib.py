@@ -0,0 +1,357 @@
+#
+# seqcachelib.py
+#####################################################################
+#
+#  Purpose: routines shared by the sequence cache loads
+#
+#  Usage:
+#	import seqcachelib
+#
+#  Env Vars:
+#	SEQCACHE_BATCHSIZE : number of rows fetched per round trip
+#			     by streamRows() (default 50000)
+#	SEQCACHE_LOADMODE  : bcp  : openOutput() returns the bcp file
+#			     copy : openOutput() returns a CopyWriter that
+#				    loads the rows as they are written
+#	SEQCACHE_TEEBCP    : copy mode; also write the bcp file (default true)
+#	SEQCACHE_COPYTO    : true : seqcoord/seqprobe export their rows with
+#				    COPY (select ...) TO STDOUT (copyOut())
+#	SEQCACHE_USEACCINDEX : true : accessionTable()/lowerAccID() use the
+#				    normalized accession index (seqaccindex.py)
+#	MGD_DBSERVER, MGD_DBNAME, MGD_DBUSER, MGD_DBPASSWORDFILE, PG_DB_SCHEMA
+#
+#  History
+#
+# 10/18/2026
+#	- new; streamRows(), peakRSS(), reportPhase()
+#	- connect(), CopyWriter, openOutput()
+#	- copyOut()
+#	- createParBogus()
+#	- peakRSS(), reportPhase() replaced by seqcachestats
+#	- accessionTable(), lowerAccID()
+#	- snapshotTable(), closeConnection() (seqcachesession.py)
+#	- copyIn()
+#	- partitionFileName()
+#	- CopyWriter truncates the table in the COPY's transaction
+#
+
+import os
+import threading
+import psycopg2
+import mgi_utils
+import db
+
+# number of rows fetched from a server-side cursor per round trip
+batchSize = int(os.environ.get('SEQCACHE_BATCHSIZE', '50000'))
+
+# bcp or copy (see Configuration)
+loadMode = os.environ.get('SEQCACHE_LOADMODE', 'bcp')
+
+# copy mode; write the bcp file as well
+teeBCP = os.environ.get('SEQCACHE_TEEBCP', 'true')
+
+# export with COPY (select ...) TO STDOUT
+copyTo = os.environ.get('SEQCACHE_COPYTO', 'false')
+
+# column delimiter
+DL = os.environ['COLDELIM']
+
+# database schema of the cache tables
+schema = os.environ.get('PG_DB_SCHEMA', 'mgd')
+
+# use the normalized accession index built by seqaccindex.py
+useAccIndex = os.environ.get('SEQCACHE_USEACCINDEX', 'false')
+
+# the normalized accession index (seqaccindex.py)
+accIndexTable = 'seqcache_accindex'
+
+# set by seqcachesession.py : the loads share its connection and read
+# its accession snapshot
+inSession = 'false'
+
+# seqcachesession.py : the temp tables holding the snapshot of each table;
+# the ACC_Accession snapshot has the columns of the normalized accession
+# index as well (lowerAccID)
+snapshotTables = {'ACC_Accession' : 'accSnapshot',
+                  'ACC_AccessionReference' : 'accRefSnapshot'}
+
+# buffer size of the pipe between a CopyWriter and its COPY
+pipeBufferSize = 1024 * 1024
+
+def streamRows(cmd, cursorName, size = None):
+    # Purpose: iterate over the results of 'cmd' without holding the
+    #          entire result set in memory; rows are fetched 'size' at
+    #          a time from a server-side cursor
+    # Returns: generator of db.sql result rows (dictionaries)
+    # Assumes: db.useOneConnection(1), so that the cursor and any temp
+    #          tables used by 'cmd' are on the same connection
+    # Effects: declares/closes cursor 'cursorName'
+    # Throws: Nothing
+
+    if size is None:
+        size = batchSize
+
+    # 'with hold' so that the cursor survives a commit
+    db.sql('declare %s no scroll cursor with hold for %s' % (cursorName, cmd), None)
+
+    try:
+        while True:
+            results = db.sql('fetch forward %s from %s' % (size, cursorName), 'auto')
+            if len(results) == 0:
+                break
+            for r in results:
+                yield r
+    finally:
+        db.sql('close %s' % (cursorName), None)
+
+def connect():
+    # Purpose: open a new database connection
+    # Returns: psycopg2 connection
+    # Assumes: a password is in MGD_DBPASSWORDFILE or ~/.pgpass
+    # Effects: connects to a database
+    # Throws: psycopg2.Error
+    #
+    # This is not the connection used by db.sql() : temp tables
+    # created through db.sql() are not visible on it.
+
+    password = None
+    if 'MGD_DBPASSWORDFILE' in os.environ:
+        fp = open(os.environ['MGD_DBPASSWORDFILE'], 'r')
+        password = fp.readline().strip()
+        fp.close()
+
+    return psycopg2.connect(host = os.environ['MGD_DBSERVER'],
+                            database = os.environ['MGD_DBNAME'],
+                            user = os.environ['MGD_DBUSER'],
+                            password = password)
+
+class CopyWriter:
+    # A write-only file whose contents (bcp format) are loaded into
+    # 'table' with COPY FROM STDIN while they are being written.
+    # The rows go through a pipe to a thread running the COPY on its
+    # own connection, so generating and loading the rows overlap.
+    # The COPY is committed by close().
+
+    def __init__(self, table, teeFileName = None, truncate = False):
+        # table : the table to load
+        # teeFileName : also write the rows to this (bcp) file
+        # truncate : truncate 'table' in the COPY's transaction, so that
+        #            a failed COPY leaves the rows it would have replaced
+
+        self.table = table
+        self.truncate = truncate
+        self.rowCount = 0
+        self.error = None
+
+        if teeFileName is None:
+            self.tee = None
+        else:
+            self.tee = open(teeFileName, 'wb')
+
+        readFd, writeFd = os.pipe()
+        self.reader = os.fdopen(readFd, 'rb')
+        self.writer = os.fdopen(writeFd, 'wb', pipeBufferSize)
+
+        self.connection = connect()
+        self.thread = threading.Thread(target = self.copy)
+        self.thread.start()
+
+    def copy(self):
+        # runs in self.thread until the write end of the pipe is closed
+
+        try:
+            cursor = self.connection.cursor()
+            if self.truncate:
+                cursor.execute('truncate table %s.%s' % (schema, self.table))
+            self.rowCount = copyIn(cursor, self.table, self.reader)
+            self.connection.commit()
+        except Exception as message:
+            self.error = message
+            self.connection.rollback()
+        finally:
+            self.reader.close()
+
+    def write(self, data):
+        # data : str or bytes
+
+        if isinstance(data, str):
+            data = data.encode()
+
+        try:
+            self.writer.write(data)
+        except BrokenPipeError:
+            # the COPY has failed; report its error rather than the pipe's
+            self.thread.join()
+            if self.error is not None:
+                raise self.error
+            raise
+
+        if self.tee is not None:
+            self.tee.write(data)
+
+    def close(self):
+        # finish the COPY; raises the COPY error, if any
+
+        try:
+            self.writer.close()
+        except BrokenPipeError:
+            pass
+
+        self.thread.join()
+        self.connection.close()
+
+        if self.tee is not None:
+            self.tee.close()
+
+        if self.error is not None:
+            raise self.error
+
+        print('%s rows copied into %s ...%s' % (self.rowCount, self.table, mgi_utils.date()))
+
+def openOutput(table, fileName, binary = False):
+    # Purpose: open the output for 'table' according to SEQCACHE_LOADMODE
+    # Returns: the bcp file 'fileName' (bcp mode) or a CopyWriter into
+    #          'table' (copy mode) that also writes 'fileName' if SEQCACHE_TEEBCP
+    # Assumes: Nothing
+    # Effects: opens a file and/or a database connection; copy mode :
+    #          'table' is truncated in the COPY's transaction
+    # Throws: Nothing
+    #
+    # binary : bcp mode; open the file for bytes (see copyOut())
+
+    if loadMode != 'copy':
+        if binary:
+            return open(fileName, 'wb')
+        return open(fileName, 'w')
+
+    if teeBCP == 'true':
+        return CopyWriter(table, fileName, truncate = True)
+
+    return CopyWriter(table, truncate = True)
+
+def copyIn(cursor, table, input):
+    # Purpose: load the rows of 'input' (bcp format) into 'table'
+    #          with COPY FROM STDIN
+    # Returns: number of rows
+    # Assumes: 'cursor' is on a connect() connection; the caller commits
+    # Effects: inserts into 'table'
+    # Throws: psycopg2.Error
+
+    cursor.copy_expert("copy %s.%s from stdin with (format text, delimiter '%s', null '')" \
+            % (schema, table, DL), input)
+    return cursor.rowcount
+
+def partitionFileName(bcpFileName, partition):
+    # Purpose: the name of partition 'partition' (1..n) of the bcp file
+    #          'bcpFileName' : <table>.bcp -> <table>.<partition>.bcp
+    # Returns: string
+    # Assumes: 'bcpFileName' ends in .bcp
+    # Effects: Nothing
+    # Throws: Nothing
+
+    return '%s.%s.bcp' % (bcpFileName[:-len('.bcp')], partition)
+
+def copyOut(cmd, output):
+    # Purpose: run the select 'cmd' as COPY (cmd) TO STDOUT and write
+    #          the rows, in bcp format, straight to 'output'
+    # Returns: number of rows
+    # Assumes: 'output' accepts bytes (see openOutput(..., binary = True));
+    #          'cmd' does not use temp tables created through db.sql(),
+    #          as it runs on its own connection
+    # Effects: queries a database, writes to 'output'
+    # Throws: psycopg2.Error
+
+    connection = connect()
+    try:
+        cursor = connection.cursor()
+        cursor.copy_expert("copy (%s) to stdout with (format text, delimiter '%s', null '')" \
+                % (cmd, DL), output)
+        rowCount = cursor.rowcount
+    finally:
+        connection.close()
+
+    return rowCount
+
+def accessionTable():
+    # Purpose: the table to match marker, probe and sequence accession ids in
+    # Returns: the accession snapshot if inSession, the normalized
+    #          accession index if SEQCACHE_USEACCINDEX, else ACC_Accession;
+    #          each has _Accession_key, _Object_key, _MGIType_key,
+    #          _LogicalDB_key, accID, preferred
+    # Assumes: seqaccindex.py has been run if SEQCACHE_USEACCINDEX
+    # Effects: Nothing
+    # Throws: Nothing
+
+    if inSession == 'true':
+        return snapshotTables['ACC_Accession']
+    if useAccIndex == 'true':
+        return accIndexTable
+    return 'ACC_Accession'
+
+def lowerAccID(alias):
+    # Purpose: the lower case accID of the accessionTable() aliased 'alias'
+    # Returns: string; a column of the normalized accession index, or the
+    #          lower() of ACC_Accession.accID
+    # Assumes: Nothing
+    # Effects: Nothing
+    # Throws: Nothing
+
+    if accessionTable() != 'ACC_Accession':
+        return '%s.lowerAccID' % (alias)
+    return 'lower(%s.accID)' % (alias)
+
+def snapshotTable(table):
+    # Purpose: the table to read the marker, probe and sequence rows of
+    #          ACC_Accession or ACC_AccessionReference from, with all
+    #          of their columns
+    # Returns: the seqcachesession.py snapshot of 'table' if
+    #          inSession, else 'table'
+    # Assumes: the rows read have _MGIType_key 2, 3 or 19
+    # Effects: Nothing
+    # Throws: Nothing
+
+    if inSession == 'true':
+        return snapshotTables[table]
+    return table
+
+def closeConnection():
+    # Purpose: end a load's db.useOneConnection(1)
+    # Returns: Nothing
+    # Assumes: Nothing
+    # Effects: closes the database connection, unless inSession;
+    #          seqcachesession.py runs the loads on its connection, which
+    #          holds the accession snapshot
+    # Throws: Nothing
+
+    if inSession != 'true':
+        db.useOneConnection(0)
+
+def createParBogus():
+    # Purpose: create temp table 'parBogus' of the bogus SEQ_Marker_Cache
+    #          marker/sequence pairs for PAR markers : an NCBI gene model
+    #          on X associated with the Y marker of an X/Y pair (its
+    #          symbol ends in Y), or vice versa
+    # Returns: Nothing
+    # Assumes: db.useOneConnection(1)
+    # Effects: creates temp tables 'ncbi', 'parBogus'
+    # Throws: Nothing
+
+    # join back to the accession table via ID to get marker information for NCBI markers on 'XY', i
+    # get the last char on the symbol as symbolChromosome
+    db.sql(''' select a._object_key as _marker_key, m.symbol as markerSymbol, 
+            UPPER(RIGHT(m.symbol, 1)) as symbolChromosome, m.chromosome as geneticChromosome, gm.*
+        into temporary table ncbi
+        from map_gm_coord_feature_view gm, acc_accession a, mrk_marker m
+        where gm.seqID = a.accID
+        and a._mgitype_key = 2
+        and a._logicaldb_key in (55)
+        and m.chromosome = 'XY' -- genetic
+        and gm.genomicChromosome in ('X', 'Y')
+        and a._object_key = m._marker_key''', None)
+
+    db.sql('''select distinct _marker_key, _sequence_key
+        into temporary table parBogus
+        from ncbi
+        where (genomicChromosome = 'Y' and symbolChromosome = 'X')
+        or (genomicChromosome = 'X' and symbolChromosome = 'Y')''', None)
+    db.sql('create index idx_parbogus on parBogus (_marker_key, _sequence_key)', None)
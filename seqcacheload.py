@@ -0,0 +1,255 @@
+#
+# seqcacheload.py
+#####################################################################
+#
+#  Purpose: runs all of the sequence cache loads, concurrently
+#	    where their dependencies allow:
+#
+#	    seqdummy.csh   : dummy sequences for marker/probe accession ids
+#	    seqcoord.csh   : SEQ_Coord_Cache
+#	    seqprobe.csh   : SEQ_Probe_Cache  (after seqdummy)
+#	    seqmarker.csh  : SEQ_Marker_Cache (after seqdummy)
+#	    parupdate      : seqmarker_parupdate.py (after seqmarker)
+#
+#	    SEQCACHE_ACCINDEX=true adds:
+#
+#	    accindex       : seqaccindex.py, before seqdummy
+#	    accupdate      : seqaccindex.py -u (after seqdummy); seqprobe
+#			     and seqmarker run after it
+#
+#	    SEQCACHE_SESSION=true replaces seqdummy, seqprobe and seqmarker
+#	    (and accindex, accupdate) with:
+#
+#	    session        : seqcachesession.py; seqdummy, seqprobe and
+#			     seqmarker in one process against one snapshot
+#			     of their accession rows (bcp load mode)
+#
+#	    seqprobe and seqmarker associate sequences with probes/markers
+#	    by accession id and must see the dummy sequences; seqcoord
+#	    only caches sequences with coordinates, which dummy sequences
+#	    never have, so it runs alongside seqdummy.
+#
+#	    Each stage is a separate process with its own database connection.
+#
+#  Usage:
+#	seqcacheload.py
+#
+#  Env Vars:
+#	SEQCACHE_MAXJOBS : maximum number of stages run at the same time
+#	SEQCACHE_ACCINDEX : true : build and use the normalized accession index
+#	SEQCACHE_SESSION : true : run seqdummy, seqprobe and seqmarker
+#			   in one session (seqcachesession.py)
+#
+#  Outputs: 1) log file (stdout); each stage also writes its own log
+#
+#  Exit Codes: 0 if every stage succeeded, else 1
+#
+#  History
+#
+# 10/18/2026
+#	- new
+#	- SEQCACHE_ACCINDEX : accindex, accupdate stages
+#	- SEQCACHE_SESSION : session stage
+#
+
+import sys
+import os
+import time
+import subprocess
+import tempfile
+import concurrent.futures
+import mgi_utils
+
+# maximum number of stages run at the same time
+maxJobs = int(os.environ.get('SEQCACHE_MAXJOBS', '3'))
+
+# true : build the normalized accession index (seqaccindex.py) and
+# run seqdummy, seqprobe and seqmarker against it
+accIndex = os.environ.get('SEQCACHE_ACCINDEX', 'false')
+
+# true : run seqdummy, seqprobe and seqmarker in one session against
+# one snapshot of their accession rows (seqcachesession.py)
+session = os.environ.get('SEQCACHE_SESSION', 'false')
+
+# stage status
+PENDING = 'pending'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+SKIPPED = 'skipped'
+
+# number of lines of a failed stage's output to print
+TAIL = 20
+
+class Stage:
+    # A representation of one load : the command that runs it
+    # and the stages that must finish before it may start
+    def __init__(self, name, command, depends, env = None):
+
+        self.name = name
+        self.command = command
+        self.depends = depends
+        self.env = env
+        self.status = PENDING
+        self.returnCode = None
+        self.startTime = None
+        self.endTime = None
+
+    def elapsed(self):
+        if self.startTime is None or self.endTime is None:
+            return 0
+        return self.endTime - self.startTime
+
+def createStages():
+    # Purpose: the stages of the sequence cache load, in dependency order
+    # Returns: list of Stage
+    # Assumes: Nothing
+    # Throws: Nothing
+
+    python = os.environ['PYTHON']
+
+    if session == 'true':
+        return [
+            Stage('session', [python, './seqcachesession.py'], [],
+                  {'SEQCACHE_LOADMODE' : 'bcp', 'SEQMARKER_PARUPDATE' : 'false'}),
+            Stage('seqcoord', ['./seqcoord.csh'], []),
+            Stage('parupdate', [python, './seqmarker_parupdate.py'], ['session']),
+            ]
+
+    if accIndex != 'true':
+        return [
+            Stage('seqdummy', ['./seqdummy.csh'], []),
+            Stage('seqcoord', ['./seqcoord.csh'], []),
+            Stage('seqprobe', ['./seqprobe.csh'], ['seqdummy']),
+            # seqmarker_parupdate.py is its own stage
+            Stage('seqmarker', ['./seqmarker.csh'], ['seqdummy'], {'SEQMARKER_PARUPDATE' : 'false'}),
+            Stage('parupdate', [python, './seqmarker_parupdate.py'], ['seqmarker']),
+            ]
+
+    # the normalized accession index is built before seqdummy and gets
+    # the dummy sequences' accession ids before seqprobe and seqmarker
+    useIndex = {'SEQCACHE_USEACCINDEX' : 'true'}
+
+    return [
+        Stage('accindex', [python, './seqaccindex.py'], []),
+        Stage('seqdummy', ['./seqdummy.csh'], ['accindex'], useIndex),
+        Stage('accupdate', [python, './seqaccindex.py', '-u'], ['seqdummy']),
+        Stage('seqcoord', ['./seqcoord.csh'], []),
+        Stage('seqprobe', ['./seqprobe.csh'], ['accupdate'], useIndex),
+        # seqmarker_parupdate.py is its own stage
+        Stage('seqmarker', ['./seqmarker.csh'], ['accupdate'],
+              dict(useIndex, SEQMARKER_PARUPDATE = 'false')),
+        Stage('parupdate', [python, './seqmarker_parupdate.py'], ['seqmarker']),
+        ]
+
+def runStage(stage):
+    # Purpose: run the stage's command and wait for it to finish
+    # Returns: the stage
+    # Assumes: runs in a worker thread
+    # Effects: runs a process
+    # Throws: Nothing
+
+    env = dict(os.environ)
+    if stage.env is not None:
+        env.update(stage.env)
+
+    # the stage's own log has its full output; keep it here only
+    # to report the end of it if the stage fails
+    output = tempfile.TemporaryFile(mode = 'w+')
+
+    stage.startTime = time.time()
+    try:
+        stage.returnCode = subprocess.call(stage.command, env = env,
+                stdout = output, stderr = subprocess.STDOUT)
+    except OSError as message:
+        output.write('%s\n' % (message))
+        stage.returnCode = -1
+    stage.endTime = time.time()
+
+    if stage.returnCode == 0:
+        stage.status = SUCCEEDED
+    else:
+        stage.status = FAILED
+        output.seek(0)
+        lines = output.readlines()
+        print('%s failed (exit %s); last lines of its output:' % (stage.name, stage.returnCode))
+        for line in lines[-TAIL:]:
+            print('    %s' % (line.rstrip()))
+
+    output.close()
+    return stage
+
+def runStages(stages):
+    # Purpose: run the stages, at most maxJobs at a time, each as soon as
+    #          the stages it depends on have succeeded; a stage whose
+    #          dependency failed or was skipped is skipped
+    # Returns: Nothing
+    # Assumes: Nothing
+    # Effects: runs processes, sets the status of each stage
+    # Throws: Nothing
+
+    stageByName = {}
+    for stage in stages:
+        stageByName[stage.name] = stage
+
+    running = {}
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers = maxJobs)
+
+    while True:
+        for stage in stages:
+            if stage.status != PENDING or stage in list(running.values()):
+                continue
+
+            depStatus = [stageByName[d].status for d in stage.depends]
+
+            if FAILED in depStatus or SKIPPED in depStatus:
+                stage.status = SKIPPED
+                print('%s skipped ...%s' % (stage.name, mgi_utils.date()))
+
+            elif depStatus.count(SUCCEEDED) == len(depStatus) and len(running) < maxJobs:
+                print('%s started ...%s' % (stage.name, mgi_utils.date()))
+                running[executor.submit(runStage, stage)] = stage
+
+        if len(running) == 0:
+            break
+
+        done, notDone = concurrent.futures.wait(list(running.keys()),
+                return_when = concurrent.futures.FIRST_COMPLETED)
+
+        for future in done:
+            stage = future.result()
+            del running[future]
+            print('%s %s in %.1f sec ...%s' % (stage.name, stage.status, stage.elapsed(), mgi_utils.date()))
+
+    executor.shutdown()
+    return
+
+def report(stages, startTime):
+    # Purpose: print the status and elapsed time of each stage
+    # Returns: 0 if every stage succeeded, else 1
+    # Assumes: Nothing
+    # Throws: Nothing
+
+    returnCode = 0
+
+    print('')
+    print('%-12s %-10s %10s' % ('stage', 'status', 'seconds'))
+    for stage in stages:
+        print('%-12s %-10s %10.1f' % (stage.name, stage.status, stage.elapsed()))
+        if stage.status != SUCCEEDED:
+            returnCode = 1
+    print('%-12s %-10s %10.1f' % ('total', '', time.time() - startTime))
+
+    return returnCode
+
+#
+# Main Routine
+#
+
+# the stage commands are relative to this directory
+os.chdir(os.path.dirname(os.path.abspath(sys.argv[0])))
+
+print('Sequence cache load, %s concurrent stages ...%s' % (maxJobs, mgi_utils.date()))
+startTime = time.time()
+stages = createStages()
+runStages(stages)
+sys.exit(report(stages, startTime))
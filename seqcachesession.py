@@ -0,0 +1,236 @@
+#
+# seqcachesession.py
+#####################################################################
+#
+#  Purpose: runs seqdummy, seqprobe and seqmarker in this one process,
+#	    on one database connection, against one snapshot of the
+#	    ACC_Accession/ACC_AccessionReference rows they read:
+#
+#	    accSnapshot    : the marker (2), probe (3) and sequence (19)
+#			     rows of ACC_Accession, with lower(accID) as a
+#			     column (lowerAccID)
+#	    accRefSnapshot : their ACC_AccessionReference rows
+#
+#	    Both are temp tables created in one repeatable read transaction,
+#	    so ACC_Accession is scanned once and the caches are consistent
+#	    with each other as of that point in time.  The loads read them
+#	    through seqcachelib.accessionTable()/snapshotTable().
+#
+#	    seqdummy.py        : the dummy sequence bcp files
+#	    seqdummy.csh       : loads them (SEQCACHE_SKIPGEN=true); their
+#				 accession ids are added to accSnapshot
+#	    seqprobe.py        : the SEQ_Probe_Cache bcp file
+#	    seqprobe.csh       : loads it (SEQCACHE_SKIPGEN=true)
+#	    seqmarker.py       : the SEQ_Marker_Cache bcp file (or delta)
+#	    seqmarker.csh      : loads it (SEQCACHE_SKIPGEN=true)
+#
+#	    The temp tables of each load are dropped after it has run.
+#	    Bcp load mode only (SEQCACHE_LOADMODE=bcp) : in copy mode each
+#	    python script truncates and loads its table itself.
+#
+#  Usage:
+#	seqcachesession.py
+#
+#	run by seqcacheload.py when SEQCACHE_SESSION=true
+#
+#  Env Vars: SEQCACHE_LOADMODE, SEQMARKER_MODE, CACHEDATADIR
+#
+#  Inputs: 1) mgd database
+#          2) Configuration
+#
+#  Outputs: 1) log file (stdout); the .csh wrappers write their own logs
+#           2) see seqdummy.py, seqprobe.py, seqmarker.py
+#
+#  Exit Codes: 0 if every load succeeded, else 1
+#
+#  History
+#
+# 10/18/2026
+#	- new
+#
+
+import sys
+import os
+import importlib
+import subprocess
+import mgi_utils
+import db
+import seqcachelib
+import seqcachestats
+
+db.setTrace()
+
+# per-phase timing and row counts
+stats = seqcachestats.Stats('seqcachesession')
+
+# largest ACC_Accession._Accession_key when the snapshot was taken
+snapshotMaxKey = 0
+
+# the snapshot temp tables
+accSnapshot = seqcachelib.snapshotTables['ACC_Accession']
+accRefSnapshot = seqcachelib.snapshotTables['ACC_AccessionReference']
+
+def takeSnapshot():
+    # Purpose: create the accession snapshot temp tables
+    # Returns: Nothing
+    # Assumes: db.useOneConnection(1)
+    # Effects: creates temp tables 'accSnapshot', 'accRefSnapshot'
+    # Throws: Nothing
+
+    global snapshotMaxKey
+
+    print('snapshot begin...%s' % (mgi_utils.date()))
+
+    # the isolation level must be set before the first statement of
+    # the transaction; temp tables survive the commit
+    db.commit()
+    db.sql('set transaction isolation level repeatable read', None)
+
+    stats.sql('temp table creation', '''
+        select a.*, lower(a.accID) as lowerAccID
+        INTO TEMPORARY TABLE %s
+        from ACC_Accession a
+        where a._MGIType_key in (2, 3, 19)
+        ''' % (accSnapshot))
+
+    stats.sql('temp table creation', '''
+        select r.*
+        INTO TEMPORARY TABLE %s
+        from ACC_AccessionReference r, %s a
+        where r._Accession_key = a._Accession_key
+        ''' % (accRefSnapshot, accSnapshot))
+
+    results = db.sql('select max(_Accession_key) as maxKey from ACC_Accession', 'auto')
+    snapshotMaxKey = results[0]['maxKey']
+
+    db.commit()
+
+    # the same indexes as the normalized accession index (seqaccindex.py)
+    stats.sql('index creation', 'create unique index accSnapshot_idx_key on %s (_Accession_key)' % (accSnapshot))
+    stats.sql('index creation', 'create index accSnapshot_idx_lower on %s (lowerAccID, _LogicalDB_key, _MGIType_key)' % (accSnapshot))
+    stats.sql('index creation', 'create index accSnapshot_idx_object on %s (_Object_key, _MGIType_key)' % (accSnapshot))
+    stats.sql('index creation', 'create index accRefSnapshot_idx_key on %s (_Accession_key)' % (accRefSnapshot))
+    db.sql('analyze %s' % (accSnapshot), None)
+    db.sql('analyze %s' % (accRefSnapshot), None)
+    db.commit()
+
+    print('snapshot end...%s' % (mgi_utils.date()))
+
+def addDummySequences(seqdummy):
+    # Purpose: add the accession ids of the dummy sequences loaded by
+    #          seqdummy.csh to the snapshot, so that seqprobe and
+    #          seqmarker associate them as they would without a session
+    # Returns: Nothing
+    # Assumes: seqdummy.csh has loaded ACC_Accession.bcp; the dummy
+    #          accession keys follow the snapshot's largest key
+    # Effects: inserts into temp table 'accSnapshot'
+    # Throws: Nothing
+
+    with stats.phase('snapshot update') as phase:
+        db.sql('''
+            insert into %s
+            select a.*, lower(a.accID) as lowerAccID
+            from ACC_Accession a
+            where a._Accession_key > %s
+            and a._Accession_key < %s
+            and a._MGIType_key = 19
+            and a._CreatedBy_key = %s
+            ''' % (accSnapshot, snapshotMaxKey, seqdummy.accKey, seqdummy.userKey), None)
+        results = db.sql('select count(*) as rowCount from %s where _Accession_key > %s' \
+                % (accSnapshot, snapshotMaxKey), 'auto')
+        phase.rowsOut = results[0]['rowCount']
+        if phase.rowsOut > 0:
+            db.sql('analyze %s' % (accSnapshot), None)
+        db.commit()
+
+def dropTempTables():
+    # Purpose: drop the temp tables of the load that has just run, so
+    #          that the next load can create its own (and its indexes)
+    #          under the same names
+    # Returns: Nothing
+    # Assumes: db.useOneConnection(1)
+    # Effects: drops temp tables
+    # Throws: Nothing
+
+    results = db.sql('''
+        select relname
+        from pg_class
+        where relnamespace = pg_my_temp_schema()
+        and relkind = 'r'
+        ''', 'auto')
+
+    for r in results:
+        if r['relname'].lower() not in (accSnapshot.lower(), accRefSnapshot.lower()):
+            db.sql('drop table %s' % (r['relname']), None)
+
+    db.commit()
+
+def runLoad(name, table = None):
+    # Purpose: run the main() of load 'name' on this connection
+    # Returns: the load's module
+    # Assumes: the load reads env TABLE when imported
+    # Effects: see the load
+    # Throws: SystemExit if the load fails
+
+    if table is not None:
+        os.environ['TABLE'] = table
+
+    print('%s begin...%s' % (name, mgi_utils.date()))
+    load = importlib.import_module(name)
+    load.main()
+    dropTempTables()
+    print('%s end...%s' % (name, mgi_utils.date()))
+
+    return load
+
+def runWrapper(name):
+    # Purpose: run the .csh wrapper of load 'name' to bulk load the
+    #          bcp file(s) its python script has written
+    # Returns: Nothing
+    # Assumes: Nothing
+    # Effects: runs a process
+    # Throws: SystemExit if the wrapper fails
+
+    env = dict(os.environ)
+    env['SEQCACHE_SKIPGEN'] = 'true'
+
+    print('%s.csh begin...%s' % (name, mgi_utils.date()))
+    if subprocess.call(['./%s.csh' % (name)], env = env) != 0:
+        sys.exit('%s.csh failed' % (name))
+    print('%s.csh end...%s' % (name, mgi_utils.date()))
+
+#
+# Main Routine
+#
+
+if seqcachelib.loadMode != 'bcp':
+    sys.exit('seqcachesession.py requires SEQCACHE_LOADMODE=bcp')
+
+# the wrappers are relative to this directory
+os.chdir(os.path.dirname(os.path.abspath(sys.argv[0])))
+
+# as seqmarker.csh : incremental mode needs the date of a previous run
+if os.environ.get('SEQMARKER_MODE', 'full') == 'incremental' and \
+        not os.path.exists('%s/SEQ_Marker_Cache.lastrun' % (os.environ['CACHEDATADIR'])):
+    print('No previous run recorded : running full load of SEQ_Marker_Cache')
+    os.environ['SEQMARKER_MODE'] = 'full'
+
+print('%s' % mgi_utils.date())
+db.useOneConnection(1)
+seqcachelib.inSession = 'true'
+
+takeSnapshot()
+
+seqdummy = runLoad('seqdummy')
+runWrapper('seqdummy')
+addDummySequences(seqdummy)
+
+runLoad('seqprobe', 'SEQ_Probe_Cache')
+runWrapper('seqprobe')
+
+runLoad('seqmarker', 'SEQ_Marker_Cache')
+runWrapper('seqmarker')
+
+db.useOneConnection(0)
+stats.write()
+print('%s' % mgi_utils.date())
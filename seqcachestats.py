@@ -0,0 +1,321 @@
+#
+# seqcachestats.py
+#####################################################################
+#
+#  Purpose: per-phase timing and row counts for the sequence cache loads
+#
+#	    For each named phase of a load (temp table creation, index
+#	    creation, lookup load, representative selection, bcp write,
+#	    bulk load <table>, table index creation, ...) records wall time, CPU time, rows in, rows out
+#	    and peak RSS, and writes them to:
+#
+#	    ${CACHELOGSDIR}/<load>.stats.json : this run, one entry per phase
+#	    ${CACHELOGSDIR}/<load>.stats.csv  : every run, one line per phase;
+#						for trending night over night
+#
+#  Usage:
+#	in a load:
+#
+#	stats = seqcachestats.Stats('seqmarker')
+#	with stats.phase('bcp write') as phase:
+#	    ...
+#	    phase.rowsOut = rowCount
+#	or
+#	phase = stats.phase('representative selection')
+#	phase.begin()
+#	...
+#	phase.end()
+#	stats.sql('index creation', 'create index ...')
+#	stats.close(outBCP)
+#	stats.write()
+#
+#	from a csh wrapper, to time a command as a phase of <load>:
+#
+#	seqcachestats.py [-r bcpFile] load phase command [arg ...]
+#
+#	-r bcpFile : rows in/out = number of lines in bcpFile
+#
+#  Env Vars:
+#	CACHELOGSDIR
+#
+#  Exit Codes: command mode; the exit code of the command
+#
+#  History
+#
+# 10/18/2026
+#	- new
+#
+
+import sys
+import os
+import time
+import json
+import getopt
+import resource
+import subprocess
+import mgi_utils
+import db
+import seqcachelib
+
+logsdir = os.environ.get('CACHELOGSDIR', '.')
+
+# columns of the csv file
+CSV_COLUMNS = ['runDate', 'load', 'phase', 'calls', 'wallSeconds', 'cpuSeconds',
+        'rowsIn', 'rowsOut', 'peakRSSKB']
+
+def cpuTime(who):
+    # Purpose: user + system CPU seconds of this process (or its children)
+    # Returns: float
+    # Assumes: Nothing
+    # Throws: Nothing
+
+    usage = resource.getrusage(who)
+    return usage.ru_utime + usage.ru_stime
+
+def peakRSS(who = resource.RUSAGE_SELF):
+    # Purpose: peak resident set size of this process (or its largest child)
+    # Returns: kilobytes
+    # Assumes: Linux, where ru_maxrss is reported in kilobytes
+    # Throws: Nothing
+
+    return resource.getrusage(who).ru_maxrss
+
+class Phase:
+    # A representation of one named phase of a load; entering the same
+    # phase again adds to its times and row counts
+
+    def __init__(self, name):
+
+        self.name = name
+        self.calls = 0
+        self.wallSeconds = 0.0
+        self.cpuSeconds = 0.0
+        self.rowsIn = 0
+        self.rowsOut = 0
+        self.peakRSSKB = 0
+        self.verbose = True
+        self.startWall = None
+        self.startCPU = None
+
+    def __enter__(self):
+        return self.begin()
+
+    def __exit__(self, excType, excValue, traceback):
+        self.end()
+        return False
+
+    def begin(self):
+        # start timing the phase
+
+        if self.verbose:
+            print('%s begin...%s' % (self.name, mgi_utils.date()))
+
+        self.startWall = time.time()
+        self.startCPU = cpuTime(resource.RUSAGE_SELF)
+        return self
+
+    def end(self):
+        # stop timing the phase; add to its totals
+
+        wall = time.time() - self.startWall
+        self.calls = self.calls + 1
+        self.wallSeconds = self.wallSeconds + wall
+        self.cpuSeconds = self.cpuSeconds + cpuTime(resource.RUSAGE_SELF) - self.startCPU
+        self.peakRSSKB = max(self.peakRSSKB, peakRSS())
+
+        if self.verbose:
+            print('%s end : %.1f sec, %s rows in, %s rows out, %.0f rows/sec, peak RSS %s KB ...%s' \
+                % (self.name, wall, self.rowsIn, self.rowsOut, self.rate(),
+                   self.peakRSSKB, mgi_utils.date()))
+
+    def rate(self):
+        # rows out (or in) per second over all calls
+        rows = max(self.rowsIn, self.rowsOut)
+        if self.wallSeconds > 0:
+            return rows / self.wallSeconds
+        return rows
+
+    def asDict(self, runDate, load):
+        return {'runDate' : runDate,
+                'load' : load,
+                'phase' : self.name,
+                'calls' : self.calls,
+                'wallSeconds' : round(self.wallSeconds, 3),
+                'cpuSeconds' : round(self.cpuSeconds, 3),
+                'rowsIn' : self.rowsIn,
+                'rowsOut' : self.rowsOut,
+                'peakRSSKB' : self.peakRSSKB}
+
+class Stats:
+    # The phases of one run of a load
+
+    def __init__(self, load):
+
+        self.load = load
+        self.runDate = mgi_utils.date()
+        self.phases = []
+        self.phaseByName = {}
+
+    def phase(self, name, verbose = True):
+        # the phase 'name'; use in a with statement
+
+        if name not in self.phaseByName:
+            self.phaseByName[name] = Phase(name)
+            self.phases.append(self.phaseByName[name])
+
+        phase = self.phaseByName[name]
+        phase.verbose = verbose
+        return phase
+
+    def sql(self, name, cmd):
+        # run db.sql(cmd, None) as part of phase 'name'
+
+        with self.phase(name, verbose = False):
+            db.sql(cmd, None)
+
+    def close(self, output):
+        # close an output of seqcachelib.openOutput(); closing a CopyWriter
+        # waits for its COPY to finish, so that is phase 'bulk load <table>'
+        # (a bcp file is loaded by the csh wrapper, as the same phase)
+
+        if isinstance(output, seqcachelib.CopyWriter):
+            with self.phase('bulk load %s' % (output.table), verbose = False) as phase:
+                output.close()
+                phase.rowsIn = phase.rowsIn + output.rowCount
+                phase.rowsOut = phase.rowsOut + output.rowCount
+        else:
+            output.close()
+
+    def add(self, entry):
+        # add a phase from its asDict()
+
+        phase = self.phase(entry['phase'])
+        phase.calls = phase.calls + entry['calls']
+        phase.wallSeconds = phase.wallSeconds + entry['wallSeconds']
+        phase.cpuSeconds = phase.cpuSeconds + entry['cpuSeconds']
+        phase.rowsIn = phase.rowsIn + entry['rowsIn']
+        phase.rowsOut = phase.rowsOut + entry['rowsOut']
+        phase.peakRSSKB = max(phase.peakRSSKB, entry['peakRSSKB'])
+
+    def jsonFileName(self):
+        return '%s/%s.stats.json' % (logsdir, self.load)
+
+    def csvFileName(self):
+        return '%s/%s.stats.csv' % (logsdir, self.load)
+
+    def write(self, phases = None):
+        # Purpose: write this run's phases to the json file (replacing it)
+        #          and append 'phases' (default: all) to the csv file
+        # Returns: Nothing
+        # Assumes: Nothing
+        # Effects: writes files
+        # Throws: Nothing
+
+        if phases is None:
+            phases = self.phases
+
+        print('%-30s %8s %10s %10s %12s %12s %12s' \
+                % ('phase', 'calls', 'wall sec', 'cpu sec', 'rows in', 'rows out', 'peak RSS KB'))
+        for p in self.phases:
+            print('%-30s %8s %10.1f %10.1f %12s %12s %12s' \
+                % (p.name, p.calls, p.wallSeconds, p.cpuSeconds, p.rowsIn, p.rowsOut, p.peakRSSKB))
+
+        fp = open(self.jsonFileName(), 'w')
+        json.dump({'load' : self.load,
+                   'runDate' : self.runDate,
+                   'phases' : [p.asDict(self.runDate, self.load) for p in self.phases]},
+                  fp, indent = 2)
+        fp.write('\n')
+        fp.close()
+
+        newFile = not os.path.exists(self.csvFileName())
+        fp = open(self.csvFileName(), 'a')
+        if newFile:
+            fp.write(','.join(CSV_COLUMNS) + '\n')
+        for p in phases:
+            entry = p.asDict(self.runDate, self.load)
+            fp.write(','.join([str(entry[c]) for c in CSV_COLUMNS]) + '\n')
+        fp.close()
+
+def read(load):
+    # Purpose: the Stats of the current run of 'load', from its json file
+    # Returns: Stats
+    # Assumes: Nothing
+    # Throws: Nothing
+
+    stats = Stats(load)
+
+    if os.path.exists(stats.jsonFileName()):
+        fp = open(stats.jsonFileName(), 'r')
+        saved = json.load(fp)
+        fp.close()
+        stats.runDate = saved['runDate']
+        for entry in saved['phases']:
+            stats.add(entry)
+
+    return stats
+
+def countLines(fileName):
+    # Purpose: number of lines in 'fileName', 0 if it does not exist
+    # Returns: integer
+    # Throws: Nothing
+
+    if not os.path.exists(fileName):
+        return 0
+
+    count = 0
+    fp = open(fileName, 'rb')
+    for block in iter(lambda: fp.read(1024 * 1024), b''):
+        count = count + block.count(b'\n')
+    fp.close()
+    return count
+
+def runCommand(load, name, command, bcpFileName = None):
+    # Purpose: run 'command' as phase 'name' of 'load' and add it to
+    #          the load's stats files
+    # Returns: the exit code of 'command'
+    # Assumes: Nothing
+    # Effects: runs a process, writes files
+    # Throws: Nothing
+
+    stats = read(load)
+    phase = stats.phase(name, verbose = False)
+
+    startWall = time.time()
+    startCPU = cpuTime(resource.RUSAGE_CHILDREN)
+    sys.stdout.flush()
+    returnCode = subprocess.call(command)
+
+    phase.calls = phase.calls + 1
+    phase.wallSeconds = phase.wallSeconds + time.time() - startWall
+    phase.cpuSeconds = phase.cpuSeconds + cpuTime(resource.RUSAGE_CHILDREN) - startCPU
+    phase.peakRSSKB = max(phase.peakRSSKB, peakRSS(resource.RUSAGE_CHILDREN))
+    if bcpFileName is not None:
+        rows = countLines(bcpFileName)
+        phase.rowsIn = phase.rowsIn + rows
+        phase.rowsOut = phase.rowsOut + rows
+
+    stats.write([phase])
+    return returnCode
+
+#
+# Main Routine : time a command as a phase of a load
+#
+if __name__ == '__main__':
+
+    USAGE = 'Usage: seqcachestats.py [-r bcpFile] load phase command [arg ...]'
+
+    try:
+        optlist, args = getopt.getopt(sys.argv[1:], 'r:')
+    except getopt.GetoptError:
+        sys.exit(USAGE)
+
+    if len(args) < 3:
+        sys.exit(USAGE)
+
+    bcpFileName = None
+    for opt, arg in optlist:
+        if opt == '-r':
+            bcpFileName = arg
+
+    sys.exit(runCommand(args[0], args[1], args[2:], bcpFileName))
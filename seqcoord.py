@@ -13,6 +13,13 @@
 #
 # History
 #
+# 10/18/2026
+#	- SEQCACHE_LOADMODE=copy : load the table with COPY while writing the rows
+#	- SEQCACHE_COPYTO=true : exportBCP()
+#	- per-phase timing and row counts (seqcachestats)
+#	- write the rows with seqcachebcp.Writer
+#	- selectCmd() : the select shared by createBCP() and exportBCP()
+#
 # 07/07/2004	lec
 #	- Assembly (TR 5395)
 #
@@ -26,24 +33,27 @@ import os
 import mgi_utils
 import loadlib
 import db
+import seqcachelib
+import seqcachebcp
+import seqcachestats
 
-NL = '\n'
-DL = os.environ['COLDELIM']
 table = os.environ['TABLE']
 datadir = os.environ['CACHEDATADIR']
 userKey = 0
 loaddate = loadlib.loaddate
 
-def createBCP():
+# per-phase timing and row counts
+stats = seqcachestats.Stats('seqcoord')
 
-        print('Creating %s.bcp...%s' % (table, mgi_utils.date()))
+def selectCmd(columns = ''):
 
-        outBCP = open('%s/%s.bcp' % (datadir, table), 'w')
+        # the select of the SEQ_Coord_Cache rows, used by createBCP() and
+        # exportBCP(); 'columns' : more columns, after mc.version
 
-        cmd = '''
-            select distinct mc._Map_key, mc.version, t2.abbreviation as mapUnits,
-            mcf._Object_key, mcf.startCoordinate, mcf.endCoordinate, mcf.strand,
-            c.chromosome, t3.term as provider 
+        return '''
+            select distinct mc._Map_key, mcf._Object_key, c.chromosome,
+            mcf.startCoordinate, mcf.endCoordinate, mcf.strand,
+            t2.abbreviation as mapUnits, t3.term as provider, mc.version%s
             from MAP_Coordinate mc, MAP_Coord_Feature mcf,
             MRK_Chromosome c, SEQ_Sequence s, VOC_Term t1, VOC_Term t2, VOC_Term t3 
             where mc._MapType_key = t1._Term_key 
@@ -55,25 +65,56 @@ def createBCP():
             and mcf._MGIType_key = 19 
             and mcf._Object_key = s._Sequence_key 
             and s._SequenceProvider_key = t3._Term_key
-            '''
+            ''' % (columns)
+
+def createBCP():
+
+        print('Creating %s.bcp...%s' % (table, mgi_utils.date()))
+
+        outBCP = seqcachelib.openOutput(table, '%s/%s.bcp' % (datadir, table))
+
+        cmd = selectCmd()
+
+        with stats.phase('query') as phase:
+                results = db.sql(cmd, 'auto')
+                phase.rowsOut = len(results)
+
+        phase = stats.phase('bcp write')
+        phase.begin()
+        writer = seqcachebcp.Writer(outBCP, seqcachebcp.SEQ_Coord_Cache)
+        writer.writeRows([(r['_Map_key'], r['_Object_key'], r['chromosome'],
+                        r['startCoordinate'], r['endCoordinate'], r['strand'],
+                        r['mapUnits'], r['provider'], r['version'],
+                        userKey, userKey, loaddate, loaddate) for r in results])
+        writer.flush()
+        phase.rowsIn = len(results)
+        phase.rowsOut = writer.rowCount
+        phase.end()
+
+        stats.close(outBCP)
+
+def exportBCP():
+
+        # same rows as createBCP(), but selectCmd(), including the user and
+        # date columns, runs inside COPY (...) TO STDOUT and the rows are
+        # streamed straight to the bcp file or into the table
+
+        print('Exporting %s.bcp...%s' % (table, mgi_utils.date()))
+
+        outBCP = seqcachelib.openOutput(table, '%s/%s.bcp' % (datadir, table), binary = True)
 
-        results = db.sql(cmd, 'auto')
+        cmd = selectCmd(''',
+            %s as _CreatedBy_key, %s as _ModifiedBy_key,
+            '%s' as creation_date, '%s' as modification_date''' \
+            % (userKey, userKey, loaddate, loaddate))
 
-        for r in results:
+        with stats.phase('bcp write') as phase:
+                rowCount = seqcachelib.copyOut(cmd, outBCP)
+                phase.rowsOut = rowCount
 
-                outBCP.write(str(r['_Map_key']) + DL + \
-                        str(r['_Object_key']) + DL + \
-                        r['chromosome'] + DL + \
-                        str(r['startCoordinate']) + DL + \
-                        str(r['endCoordinate']) + DL + \
-                        str(r['strand']) + DL + \
-                        str(r['mapUnits']) + DL + \
-                        str(r['provider']) + DL + \
-                        str(r['version']) + DL + \
-                        str(userKey) + DL + str(userKey) + DL + \
-                        loaddate + DL + loaddate + NL)
+        stats.close(outBCP)
 
-        outBCP.close()
+        print('%s rows exported...%s' % (rowCount, mgi_utils.date()))
 
 #
 # Main Routine
@@ -83,6 +124,10 @@ userKey = loadlib.verifyUser(os.environ['MGD_DBUSER'], 1, None)
 
 db.useOneConnection(1)
 print('%s' % mgi_utils.date())
-createBCP()
+if seqcachelib.copyTo == 'true':
+        exportBCP()
+else:
+        createBCP()
+stats.write()
 print('%s' % mgi_utils.date())
 db.useOneConnection(0)
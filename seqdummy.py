@@ -22,6 +22,12 @@
 #
 # Envvars:
 #
+#	SEQDUMMY_SPLITSQL : true : split the Acc IDs into prefix and numeric
+#			    parts in the query instead of accessionlib
+#	SEQCACHE_LOADMODE : copy : reserve the keys and load the four
+#			    tables from the bcp files with COPY, in one
+#			    transaction (see reserveKeys(), loadTables())
+#
 # Outputs:
 #
 #       BCP files:
@@ -37,12 +43,32 @@
 #
 # Assumes:
 #
-#	That no one else is adding such records to the database.
+#	bcp mode : that no one else is adding such records to the database.
+#	copy mode : the tables are locked (share row exclusive) from the
+#	key reservation, after the candidate Acc IDs are selected, until
+#	the load commits; other loads writing them wait.
 #
 # Bugs:
 #
 # Implementation:
 #
+# History:
+#
+# 10/18/2026
+#	- per-phase timing and row counts (seqcachestats)
+#	- SEQCACHE_USEACCINDEX=true : match the accession ids in the
+#	  normalized accession index (seqaccindex.py)
+#	- main(); seqcachesession.py : match in the accession snapshot
+#	- SEQCACHE_LOADMODE=copy : reserveKeys(), loadTables()
+#	- process : match the probe and marker Acc IDs against one set of
+#	  sequence IDs (seqIDs), mouse and non-mouse together
+#	- process : stream allaccs from a server-side cursor; precompiled
+#	  bcp line formats, 1MB write buffers; SEQDUMMY_SPLITSQL=true
+#	- write the rows with seqcachebcp.Writer
+#	- copy mode : lock the tables only from reserveKeys(), after the
+#	  candidate Acc IDs are selected; re-check the candidates against the
+#	  Acc IDs added since (lastAccessionKey())
+#
 
 import sys
 import os
@@ -50,13 +76,14 @@ import accessionlib
 import mgi_utils
 import loadlib
 import db
+import seqcachelib
+import seqcachebcp
+import seqcachestats
 
 db.setTrace()
 
 #globals
 
-NL = '\n'
-DL = os.environ['COLDELIM']
 datadir = os.environ['CACHEDATADIR']
 
 seqFile = ''          	# file descriptor
@@ -79,6 +106,11 @@ assocKey = 0		# SEQ_Source_Assoc._Assoc_key
 accKey = 0              # ACC_Accession._Accession_key
 userKey = 1670		# MGI_User._User_key
 
+# copy mode : the connection that reserves the keys and loads the tables;
+# the _Assoc_keys drawn from seq_source_assoc_seq, in row order
+connection = None
+assocKeys = None
+
 mgiTypeKey = 19		# Sequence
 statusKey = 316345	# "Not Loaded" Sequence Status
 mouseSourceKey = 47395
@@ -87,23 +119,49 @@ notLoaded = 'Not Loaded'
 
 loaddate = loadlib.loaddate
 
+# the _SequenceType_key, _SequenceQuality_key, _SequenceProvider_key
+# and virtual flag of a dummy sequence, by the _LogicalDB_key of its Acc ID
+#
+# types:  316347 (DNA), 316346 (RNA), 316348 (polypeptide), 316349 (not loaded)
+# quality:  316338 (high), 316339 (medium), 316340 (low), 316341 (not loaded)
+# provider: 316380 (GenBank/EMBL/DDBJ), 316372 (RefSeq)
+#           316384 (SwissProt), 316385 (TrEMBL)
+sequenceTypes = {
+    9 : (316349, 316341, 316380, 0),	# GenBank
+    27 : (316349, 316338, 316372, 1),	# RefSeq
+    13 : (316348, 316338, 316384, 1),	# SwissProt
+    41 : (316348, 316340, 316385, 1),	# TrEMBL
+    }
+
+# size of the write buffer of each bcp file
+bufferSize = 1024 * 1024
+
+# split the Acc IDs into prefix and numeric parts in the query
+splitSQL = os.environ.get('SEQDUMMY_SPLITSQL', 'false')
+
+# per-phase timing and row counts
+stats = seqcachestats.Stats('seqdummy')
+
 
 def init():
     """
     Initialize database connection
     Open output files
     """
-    global seqFile, rawFile, sourceFile, accFile
+    global seqFile, rawFile, sourceFile, accFile, connection
  
     db.useOneConnection(1)
+
+    if seqcachelib.loadMode == 'copy':
+        connection = seqcachelib.connect()
  
-    seqFile = open(seqFileName, 'w')
+    seqFile = open(seqFileName, 'w', bufferSize)
 
-    rawFile = open(rawFileName, 'w')
+    rawFile = open(rawFileName, 'w', bufferSize)
 
-    sourceFile = open(sourceFileName, 'w')
+    sourceFile = open(sourceFileName, 'w', bufferSize)
 
-    accFile = open(accFileName, 'w')
+    accFile = open(accFileName, 'w', bufferSize)
 
 
 def setPrimaryKeys():
@@ -114,6 +172,9 @@ def setPrimaryKeys():
 
     global seqKey, assocKey, accKey, userKey
 
+    phase = stats.phase('key assignment', verbose = False)
+    phase.begin()
+
     results = db.sql("select max(_Sequence_key) + 1 as maxKey from %s" % (seqTable), "auto")
     seqKey = results[0]["maxKey"]
 
@@ -123,9 +184,107 @@ def setPrimaryKeys():
     results = db.sql("select max(_Accession_key) + 1 as maxKey from %s" % (accTable), "auto")
     accKey = results[0]["maxKey"]
 
+    phase.end()
+
     #userKey = loadlib.verifyUser(os.environ['MGD_DBUSER'], 1, None)
 
 
+def lastAccessionKey():
+    """
+    Copy mode:  the largest _Accession_key before the candidate
+        Acc IDs are selected; reserveKeys() re-checks the candidates
+        against the ACC_Accession rows added after it
+    """
+
+    results = db.sql('select max(_Accession_key) as maxKey from %s' % (accTable), 'auto')
+    return results[0]['maxKey']
+
+
+def reserveKeys(lastAccKey):
+    """
+    Copy mode:  lock the tables on the load connection, drop the
+        candidate Acc IDs that a load committed since 'lastAccKey'
+        has given a sequence, and reserve the keys of the rest
+    Returns the number of dummy sequences
+
+    The candidates are selected before the lock is taken; only the
+        ACC_Accession rows added since (_Accession_key > lastAccKey)
+        are checked again under it
+    _Sequence_key and _Accession_key are not drawn from a database
+        sequence (as _Assoc_key is) : the other MGD loads assign them
+        with max() + 1, so the range is only reserved while the tables
+        are locked, and the locks are held until loadTables() commits.
+        The max() are read from the primary key indexes
+    """
+
+    global seqKey, assocKey, accKey, assocKeys
+
+    phase = stats.phase('key assignment', verbose = False)
+    phase.begin()
+
+    cursor = connection.cursor()
+
+    cursor.execute('lock table %s, %s, %s, %s in share row exclusive mode' \
+        % (seqTable, rawTable, sourceTable, accTable))
+
+    # runs on the db.sql() connection (allaccs) once the lock is
+    # held, so it sees every load that committed before it
+    db.sql('''delete from allaccs 
+        using %s s 
+        where s._Accession_key > %s 
+        and s._MGIType_key = 19 
+        and s._LogicalDB_key = allaccs._LogicalDB_key 
+        and lower(s.accID) = lower(allaccs.accID)
+        ''' % (accTable, lastAccKey), None)
+    db.commit()
+
+    results = db.sql('select count(*) as rowCount from allaccs', 'auto')
+    rowCount = results[0]['rowCount']
+
+    cursor.execute('select max(_Sequence_key) + 1 from %s' % (seqTable))
+    seqKey = cursor.fetchone()[0]
+
+    cursor.execute('select max(_Accession_key) + 1 from %s' % (accTable))
+    accKey = cursor.fetchone()[0]
+
+    # each nextval() is atomic, but other loads may draw from the
+    # sequence at the same time, so the keys need not be contiguous
+    cursor.execute('''select nextval('seq_source_assoc_seq') from generate_series(1, %s)''' \
+        % (rowCount))
+    assocKeys = iter(sorted([r[0] for r in cursor.fetchall()]))
+
+    phase.end()
+
+    return rowCount
+
+
+def loadTables():
+    """
+    Copy mode:  load the four bcp files with COPY and commit,
+        which releases the locks taken by reserveKeys()
+    """
+
+    try:
+        cursor = connection.cursor()
+
+        for table, fileName in ((seqTable, seqFileName),
+                                (rawTable, rawFileName),
+                                (sourceTable, sourceFileName),
+                                (accTable, accFileName)):
+            with stats.phase('bulk load %s' % (table), verbose = False) as phase:
+                fp = open(fileName, 'r')
+                rowCount = seqcachelib.copyIn(cursor, table, fp)
+                fp.close()
+                phase.rowsIn = rowCount
+                phase.rowsOut = rowCount
+            print('%s rows copied into %s ...%s' % (rowCount, table, mgi_utils.date()))
+
+        connection.commit()
+
+    finally:
+        connection.close()
+
+
 def process():
     """
     Query database to determine if dummy sequences need to
@@ -135,90 +294,87 @@ def process():
 
     global seqKey, assocKey, accKey
 
-    # generate table of all mouse molecular segments Acc IDs whose GenBank SeqIDs
-    # are not represented as Sequence objects.
-
-    db.sql("""select a.accID, a._LogicalDB_key, ps._Organism_key 
-        INTO TEMPORARY TABLE probeaccs1 
-        from ACC_Accession a, PRB_Probe p, PRB_Source ps 
+    # ACC_Accession, the normalized accession index (seqaccindex.py)
+    # or the accession snapshot (seqcachesession.py)
+    accTable = seqcachelib.accessionTable()
+    lowerS = seqcachelib.lowerAccID('s')
+    lowerA = seqcachelib.lowerAccID('a')
+
+    if connection is not None:
+        lastAccKey = lastAccessionKey()
+
+    # the GenBank, SWISSProt, RefSeq, TrEMBL sequence IDs, lower case;
+    # the molecular segment and marker Acc IDs are matched against this
+    # set once each
+
+    stats.sql('temp table creation', """select distinct %s as seqID, s._LogicalDB_key 
+        INTO TEMPORARY TABLE seqIDs 
+        from %s s 
+        where s._MGIType_key = 19 
+        and s._LogicalDB_key in (9,13,27,41)
+        """ % (lowerS, accTable))
+    stats.sql('index creation', 'create index idx_seqids on seqIDs (seqID, _LogicalDB_key)')
+    db.sql('analyze seqIDs', None)
+
+    # generate table of all molecular segments (mouse and non-mouse) Acc IDs
+    # whose GenBank SeqIDs are not represented as Sequence objects.
+
+    stats.sql('temp table creation', """select a.accID, a._LogicalDB_key, ps._Organism_key 
+        INTO TEMPORARY TABLE probeaccs 
+        from %s a, PRB_Probe p, PRB_Source ps 
         where a._MGIType_key = 3 
         and a._LogicalDB_key = 9 
         and a._Object_key = p._Probe_key 
         and p._Source_key = ps._Source_key 
-        and ps._Organism_key = 1 
-        and not exists (select 1 from ACC_Accession s 
-            where s._MGIType_key = 19 
-                and s._LogicalDB_key = a._LogicalDB_key 
-                and lower(s.accID) = lower(a.accID)
-        )""", None)
-
-    # generate table of all mouse marker Acc IDs whose GenBank, SWISSProt, RefSeq,
-    # TrEMBL IDs are not represented as Sequence objects.
-
-    db.sql("""select a.accID, a._LogicalDB_key, m._Organism_key 
-        INTO TEMPORARY TABLE markeraccs1 
-        from ACC_Accession a, MRK_Marker m 
+        and not exists (select 1 from seqIDs s 
+            where s._LogicalDB_key = a._LogicalDB_key 
+                and s.seqID = %s
+        )""" % (accTable, lowerA))
+
+    # generate table of all marker (mouse and non-mouse) Acc IDs whose GenBank,
+    # SWISSProt, RefSeq, TrEMBL IDs are not represented as Sequence objects.
+
+    stats.sql('temp table creation', """select a.accID, a._LogicalDB_key, m._Organism_key 
+        INTO TEMPORARY TABLE markeraccs 
+        from %s a, MRK_Marker m 
         where a._MGIType_key = 2 
         and a._LogicalDB_key in (9,13,27,41) 
         and a._Object_key = m._Marker_key 
-        and m._Organism_key = 1 
         and m._Marker_Status_key in (1,2)
-        and not exists (select 1 from ACC_Accession s 
-            where s._MGIType_key = 19 
-                and s._LogicalDB_key = a._LogicalDB_key 
-                and lower(s.accID) = lower(a.accID)
-        )""", None)
-
-    # generate table of all non-mouse molecular segments Acc IDs whose GenBank SeqIDs
-    # are not represented as Sequence objects.
-
-    db.sql("""select a.accID, a._LogicalDB_key, s._Organism_key 
-        INTO TEMPORARY TABLE probeaccs2 
-        from ACC_Accession a, PRB_Probe p, PRB_Source s 
-        where a._MGIType_key = 3 
-        and a._LogicalDB_key = 9 
-        and a._Object_key = p._Probe_key 
-        and p._Source_key = s._Source_key 
-        and s._Organism_key != 1 
-        and not exists (select 1 from ACC_Accession s 
-            where s._MGIType_key = 19 
-                and s._LogicalDB_key = a._LogicalDB_key 
-                and lower(s.accID) = lower(a.accID)
-        )""", None)
-
-    # generate table of all non-mouse marker Acc IDs whose GenBank, SWISSProt, RefSeq,
-    # TrEMBL IDs are not represented as Sequence objects.
-
-    db.sql("""select a.accID, a._LogicalDB_key, m._Organism_key 
-        INTO TEMPORARY TABLE markeraccs2 
-        from ACC_Accession a, MRK_Marker m 
-        where a._MGIType_key = 2 
-        and a._LogicalDB_key in (9,13,27,41) 
-        and a._Object_key = m._Marker_key 
-        and m._Organism_key != 1 
-        and not exists (select 1 from ACC_Accession s 
-            where s._MGIType_key = 19 
-                and s._LogicalDB_key = a._LogicalDB_key 
-                and lower(s.accID) = lower(a.accID)
-        )""", None)
+        and not exists (select 1 from seqIDs s 
+            where s._LogicalDB_key = a._LogicalDB_key 
+                and s.seqID = %s
+        )""" % (accTable, lowerA))
 
-    # union these 4 sets together to form one unique set
+    # combine these 2 sets to form one unique set
 
-    db.sql('select accID, _LogicalDB_key, _Organism_key ' + \
+    stats.sql('temp table creation', 'select distinct accID, _LogicalDB_key, _Organism_key ' + \
         'INTO TEMPORARY TABLE allaccs ' + \
-        'from probeaccs1 ' + \
-        'union ' + \
-        'select accID, _LogicalDB_key, _Organism_key ' + \
-        'from markeraccs1 ' + \
-        'union ' + \
-        'select accID, _LogicalDB_key, _Organism_key ' + \
-        'from probeaccs2 ' + \
-        'union ' + \
-        'select accID, _LogicalDB_key, _Organism_key ' + \
-        'from markeraccs2', None)
-
-    results = db.sql('select * from allaccs', 'auto')
-    for r in results:
+        'from (select accID, _LogicalDB_key, _Organism_key from probeaccs ' + \
+        'union all ' + \
+        'select accID, _LogicalDB_key, _Organism_key from markeraccs) accs')
+
+    phase = stats.phase('bcp write')
+    phase.begin()
+
+    if connection is not None:
+        reserveKeys(lastAccKey)
+
+    if splitSQL == 'true':
+        # the same split as accessionlib.split_accnum()
+        cmd = """select accID, _LogicalDB_key, _Organism_key, 
+            regexp_replace(accID, '[0-9]+$', '') as prefixPart, 
+            cast(substring(accID from '[0-9]+$') as bigint) as numericPart 
+            from allaccs"""
+    else:
+        cmd = 'select accID, _LogicalDB_key, _Organism_key from allaccs'
+
+    seqWriter = seqcachebcp.Writer(seqFile, seqcachebcp.SEQ_Sequence)
+    rawWriter = seqcachebcp.Writer(rawFile, seqcachebcp.SEQ_Sequence_Raw)
+    sourceWriter = seqcachebcp.Writer(sourceFile, seqcachebcp.SEQ_Source_Assoc)
+    accWriter = seqcachebcp.Writer(accFile, seqcachebcp.ACC_Accession)
+
+    for r in seqcachelib.streamRows(cmd, 'allaccsCursor'):
 
         accID = r['accID']
         logicalDB = r['_LogicalDB_key']
@@ -229,89 +385,50 @@ def process():
         else:
             sourceKey = nonmouseSourceKey
 
-        virtual = 1
-
-        # change values for specific cases
-
-        # types:  316347 (DNA), 316346 (RNA), 316348 (polypeptide), 316349 (not loaded)
-        # quality:  316338 (high), 316339 (medium), 316340 (low), 316341 (not loaded)
-        # provider: 316380 (GenBank/EMBL/DDBJ), 316372 (RefSeq)
-        #           316384 (SwissProt), 316385 (TrEMBL)
-
-        if logicalDB == 9:	# GenBank
-            typeKey = 316349
-            qualityKey = 316341
-            providerKey = 316380
-            virtual = 0
-
-        elif logicalDB == 27:     # RefSeq
-            typeKey = 316349
-            qualityKey = 316338
-            providerKey = 316372
-
-        elif logicalDB == 13:     # SwissProt
-            typeKey = 316348
-            qualityKey = 316338
-            providerKey = 316384
-
-        elif logicalDB == 41:     # TrEMBL
-            typeKey = 316348
-            qualityKey = 316340
-            providerKey = 316385
-
-        seqFile.write(mgi_utils.prvalue(seqKey) + DL + \
-                mgi_utils.prvalue(typeKey) + DL + \
-                mgi_utils.prvalue(qualityKey) + DL + \
-                mgi_utils.prvalue(statusKey) + DL + \
-                mgi_utils.prvalue(providerKey) + DL + \
-                mgi_utils.prvalue(organism) + DL + \
-                DL + DL + DL + DL + \
-                mgi_utils.prvalue(virtual) + DL + \
-                DL + \
-                loaddate + DL + loaddate + DL + \
-                str(userKey) + DL + str(userKey) + DL + \
-                loaddate + DL + loaddate + NL)
-
-        rawFile.write(mgi_utils.prvalue(seqKey) + DL + \
-                notLoaded + DL + \
-                notLoaded + DL + \
-                notLoaded + DL + \
-                notLoaded + DL + \
-                notLoaded + DL + \
-                notLoaded + DL + \
-                notLoaded + DL + \
-                notLoaded + DL + \
-                str(userKey) + DL + str(userKey) + DL + \
-                loaddate + DL + loaddate + NL)
-
-        sourceFile.write(mgi_utils.prvalue(assocKey) + DL + \
-                mgi_utils.prvalue(seqKey) + DL + \
-                mgi_utils.prvalue(sourceKey) + DL + \
-                str(userKey) + DL + str(userKey) + DL + \
-                loaddate + DL + loaddate + NL)
-
-        prefixPart, numericPart = accessionlib.split_accnum(accID)
-        accFile.write(mgi_utils.prvalue(accKey) + DL + \
-                mgi_utils.prvalue(accID) + DL + \
-                mgi_utils.prvalue(prefixPart) + DL + \
-                mgi_utils.prvalue(numericPart) + DL + \
-                mgi_utils.prvalue(logicalDB) + DL + \
-                mgi_utils.prvalue(seqKey) + DL + \
-                mgi_utils.prvalue(mgiTypeKey) + DL + \
-                '0' + DL + \
-                '1' + DL + \
-                str(userKey) + DL + str(userKey) + DL + \
-                loaddate + DL + loaddate + NL)
+        typeKey, qualityKey, providerKey, virtual = sequenceTypes[logicalDB]
+
+        if splitSQL == 'true':
+            prefixPart = r['prefixPart']
+            numericPart = r['numericPart']
+        else:
+            prefixPart, numericPart = accessionlib.split_accnum(accID)
+
+        if assocKeys is not None:
+            assocKey = next(assocKeys)
+
+        seqWriter.write((seqKey, typeKey, qualityKey, statusKey, providerKey, organism,
+                None, None, None, None, virtual, None, loaddate, loaddate,
+                userKey, userKey, loaddate, loaddate))
+        rawWriter.write((seqKey, notLoaded, notLoaded, notLoaded, notLoaded,
+                notLoaded, notLoaded, notLoaded, notLoaded,
+                userKey, userKey, loaddate, loaddate))
+        sourceWriter.write((assocKey, seqKey, sourceKey,
+                userKey, userKey, loaddate, loaddate))
+        accWriter.write((accKey, accID, prefixPart, numericPart, logicalDB, seqKey,
+                mgiTypeKey, 0, 1, userKey, userKey, loaddate, loaddate))
 
         seqKey = seqKey + 1
         assocKey = assocKey + 1
         accKey = accKey + 1
 
+        phase.rowsIn = phase.rowsIn + 1
+
+    for writer in (seqWriter, rawWriter, sourceWriter, accWriter):
+        writer.flush()
+
+    phase.rowsOut = seqWriter.rowCount
+    phase.end()
+
+
+def main():
+    """
+    Create the bcp files of the dummy sequences
+    """
 
-if __name__ == "__main__":
     try:
         init()
-        setPrimaryKeys()
+        if connection is None:
+            setPrimaryKeys()
         process()
 
     finally:
@@ -320,3 +437,12 @@ if __name__ == "__main__":
         rawFile.close()
         sourceFile.close()
         accFile.close()
+
+    if connection is not None:
+        loadTables()
+
+    stats.write()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+#
+# seqlookup.py
+#####################################################################
+#
+#  Purpose: compact in-memory lookups for the sequence cache loads
+#
+#	    GroupedLookup : key -> ordered group of (value, length) pairs,
+#	    stored as sorted integer arrays with CSR-style offsets instead
+#	    of a dictionary of lists/dictionaries; a few bytes per entry
+#	    instead of a few hundred
+#
+#	    ClosureLookup : the descendents of the terms of a DAG (DAG_Closure)
+#	    as integer bitmasks, one bit per term; a set of terms is one
+#	    integer and the intersection of two sets is one '&'
+#
+#  Usage:
+#	import seqlookup
+#
+#	builder = seqlookup.GroupedLookupBuilder()
+#	builder.add(key, value, length)		# in key order
+#	lookup = builder.build()
+#
+#	key in lookup
+#	lookup.count(key)
+#	for value, length in lookup.items(key): ...
+#
+#	closure = seqlookup.ClosureLookup()
+#	closure.add(ancestorKey, descendentKey)	# each DAG_Closure row
+#	mask = closure.descendents(ancestorKey) | closure.mask([termKey, ...])
+#	seqlookup.bitCount(mask & closure.known([termKey, ...]))
+#
+#  History
+#
+# 10/18/2026
+#	- new
+#	- unpackKey()
+#	- ClosureLookup, bitCount()
+#	- GroupedLookupBuilder(mergeRepeats = False)
+#
+
+import bisect
+from array import array
+
+# integer array type code; 64 bit
+TYPECODE = 'q'
+
+def packKey(key1, key2):
+    # Purpose: combine two database keys into one integer dictionary key;
+    #          smaller than a tuple or a '%s:%s' string
+    # Returns: integer
+    # Assumes: key2 < 2**32
+    # Throws: Nothing
+
+    return (key1 << 32) | key2
+
+def unpackKey(key):
+    # Purpose: the two database keys combined by packKey()
+    # Returns: tuple (key1, key2)
+    # Assumes: Nothing
+    # Throws: Nothing
+
+    return (key >> 32, key & 0xffffffff)
+
+class GroupedLookup:
+    # A read-only lookup of key -> [(value, length), ...]
+    # keys    : sorted, unique keys
+    # offsets : the group of keys[i] is values/lengths[offsets[i]:offsets[i + 1]]
+    # values, lengths : the groups, in the order they were added
+
+    def __init__(self, keys, offsets, values, lengths):
+        self.keys = keys
+        self.offsets = offsets
+        self.values = values
+        self.lengths = lengths
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, key):
+        return self.index(key) >= 0
+
+    def __getitem__(self, key):
+        # the values of 'key', like the list of a dictionary of lists
+        i = self.index(key)
+        if i < 0:
+            raise KeyError(key)
+        return self.values[self.offsets[i]:self.offsets[i + 1]]
+
+    def index(self, key):
+        # position of 'key' in self.keys, -1 if not found
+        i = bisect.bisect_left(self.keys, key)
+        if i < len(self.keys) and self.keys[i] == key:
+            return i
+        return -1
+
+    def count(self, key):
+        # number of values of 'key', 0 if not found
+        i = self.index(key)
+        if i < 0:
+            return 0
+        return self.offsets[i + 1] - self.offsets[i]
+
+    def items(self, key):
+        # the (value, length) pairs of 'key', [] if not found
+        i = self.index(key)
+        if i < 0:
+            return []
+        start = self.offsets[i]
+        end = self.offsets[i + 1]
+        return zip(self.values[start:end], self.lengths[start:end])
+
+class GroupedLookupBuilder:
+    # Builds a GroupedLookup from (key, value, length) added in key order
+    # mergeRepeats : True  : like lookup[key][value] = length, a repeated
+    #                        (key, value) keeps its first position and its
+    #                        last length, provided that repeats are adjacent
+    #                False : like lookup[key].append(value), a repeated
+    #                        (key, value) is kept and counted again
+
+    def __init__(self, mergeRepeats = True):
+        self.mergeRepeats = mergeRepeats
+        self.keys = array(TYPECODE)
+        self.offsets = array(TYPECODE)
+        self.values = array(TYPECODE)
+        self.lengths = array(TYPECODE)
+
+    def add(self, key, value, length = 0):
+
+        if length is None:
+            length = 0
+
+        if len(self.keys) == 0 or self.keys[-1] != key:
+            if len(self.keys) > 0 and key < self.keys[-1]:
+                raise ValueError('GroupedLookupBuilder: keys out of order: %s' % (key))
+            self.keys.append(key)
+            self.offsets.append(len(self.values))
+
+        elif self.mergeRepeats and self.values[-1] == value:
+            self.lengths[-1] = length
+            return
+
+        self.values.append(value)
+        self.lengths.append(length)
+
+    def build(self):
+        self.offsets.append(len(self.values))
+        return GroupedLookup(self.keys, self.offsets, self.values, self.lengths)
+
+def bitCount(mask):
+    # Purpose: the number of terms in a ClosureLookup mask
+    # Returns: integer
+    # Assumes: mask >= 0
+    # Throws: Nothing
+
+    return bin(mask).count('1')
+
+class ClosureLookup:
+    # The descendents of the terms of one DAG, as bitmasks
+    # bits        : term -> its bit; a bit is allocated the first time a
+    #               term is added or masked
+    # descendentMasks : ancestor term -> the mask of its descendents
+    #               (not the ancestor itself, as DAG_Closure)
+
+    def __init__(self):
+        self.bits = {}
+        self.descendentMasks = {}
+
+    def __len__(self):
+        return len(self.bits)
+
+    def bit(self, term):
+        # the bit of 'term'; allocated if it has none
+        bit = self.bits.get(term)
+        if bit is None:
+            bit = 1 << len(self.bits)
+            self.bits[term] = bit
+        return bit
+
+    def add(self, ancestor, descendent):
+        # one DAG_Closure row
+        self.descendentMasks[ancestor] = \
+                self.descendentMasks.get(ancestor, 0) | self.bit(descendent)
+
+    def descendents(self, ancestor):
+        # the mask of the descendents of 'ancestor', 0 if it has none
+        return self.descendentMasks.get(ancestor, 0)
+
+    def mask(self, terms):
+        # the mask of 'terms'; bits are allocated for new terms
+        mask = 0
+        for term in terms:
+            mask = mask | self.bit(term)
+        return mask
+
+    def known(self, terms):
+        # the mask of those 'terms' that have a bit; a term without one
+        # is in no mask, so it can be left out of an intersection
+        mask = 0
+        for term in terms:
+            mask = mask | self.bits.get(term, 0)
+        return mask
@@ -14,7 +14,11 @@
 #  http://mgiwiki/mediawiki/index.php/sw:Seqcacheload#2._Sequence_Marker_Cache_Load
 #
 #  Usage:
-#	seqmarker.py
+#	seqmarker.py [--resume]
+#
+#	--resume : continue the bcp file of a failed run from its last
+#	     checkpoint (SEQ_Marker_Cache.checkpoint); a full run if
+#	     there is none
 #
 #  Env Vars: Uses environment variables to determine Server and Database
 #	  (DSQUERY and MGD).
@@ -24,11 +28,85 @@
 #
 #  Outputs: 1) log file
 #           2) bcp file
+#           3) SEQ_Marker_Cache.lastrun.new : date of this run; renamed to
+#	       SEQ_Marker_Cache.lastrun (the date of the last successful
+#	       run) by seqmarker.csh once the table has been loaded
+#           4) SEQ_Marker_Cache.snapshot : the lookups (SEQMARKER_SNAPSHOT=true)
+#           5) SEQ_Marker_Cache.checkpoint : the last checkpoint of the bcp
+#	       write (SEQMARKER_CHECKPOINT); removed when the run is finished
+#
+#  SEQMARKER_PARTITIONS=n (n > 1; full mode, bcp load mode) : the bcp file
+#	is written as n files, SEQ_Marker_Cache.1.bcp .. SEQ_Marker_Cache.n.bcp,
+#	each of a range of _Marker_key (and so of _Cache_key), of about
+#	the same number of rows; seqmarker.csh loads them with
+#	seqmarker_load.py
+#
+#  SEQMARKER_MODE=full : the bcp file contains the entire cache and
+#	is loaded by seqmarker.csh (truncate/bcp)
+#
+#  SEQMARKER_MODE=incremental : only markers changed since the date in
+#	SEQ_Marker_Cache.lastrun are recomputed; the bcp file contains
+#	the new rows for those markers only and this script replaces
+#	their SEQ_Marker_Cache rows itself (delete + insert, one transaction)
 #
 #  Exit Codes:
 #
 #  History
 #
+# 10/18/2026
+#	- add SEQMARKER_MODE=incremental : delete/insert delta for changed markers
+#	- deriveQuality and finalannot passes stream from a server-side cursor
+#	  (SEQCACHE_BATCHSIZE); log rows/sec and peak RSS for each pass
+#	- SEQCACHE_LOADMODE=copy : load the table with COPY while writing the rows
+#	- SEQMARKER_PARFILTER=true : do not write the bogus PAR rows that
+#	  seqmarker_parupdate.py would delete
+#	- compact lookups : seqlookup.GroupedLookup for the marker/genomic and
+#	  SEQ_Sequence_Assoc lookups, integer keys for biotypeLookup,
+#	  __slots__ on GeneModel
+#	- per-phase timing and row counts (seqcachestats); replaces the
+#	  rows/sec and peak RSS log lines
+#	- the representative sequence algorithm is in seqmarker_repseq.py;
+#	  the candidates are collected per marker (seqmarker_repseq.Candidates)
+#	- SEQMARKER_WORKERS : select the representative sequences in forked
+#	  worker processes, SEQMARKER_CHUNKSIZE markers at a time
+#	- SEQMARKER_COLUMNAR=true : classify the candidate sequences with
+#	  numpy (seqmarker_columnar.py)
+#	- SEQMARKER_SQLTIERS=true : classify the candidate sequences and pick
+#	  the longest transcript/polypeptide per tier in the query (tieredQuery)
+#	- SEQCACHE_USEACCINDEX=true : match the accession ids in the
+#	  normalized accession index (seqaccindex.py)
+#	- main(); seqcachesession.py : read the accession snapshot
+#	- writeRecord : one qualifier per row; write the rows with
+#	  seqcachebcp.Writer
+#	- createQualifierTables() : the final query joins in the qualifier
+#	  and biotype columns; writeRecord only assigns the _Cache_key
+#	- generateBiotypeLookups : one query each for the DAG_Closure
+#	  descendents and the raw biotype mappings of all four vocabularies;
+#	  shared equivalency sets, gene model intersections per set group
+#	- generateBiotypeLookups : the feature type DAG is loaded once into a
+#	  seqlookup.ClosureLookup; the equivalency sets are its bitmasks
+#	- SEQMARKER_SNAPSHOT=true : save the lookups to SEQ_Marker_Cache.snapshot
+#	  (seqmarker_snapshot.py) and read them from it when the tables they
+#	  are built from have not changed; init() split into createSeqTables()
+#	  and loadLookups()
+#	- SEQMARKER_CHECKPOINT : checkpoints of the bcp write (full mode, bcp
+#	  load mode; the rows are written in _Marker_key order); --resume
+#	  continues the bcp file from the last one
+#	- SEQMARKER_PARTITIONS : write the bcp file as partitions by
+#	  _Marker_key range, loaded in parallel by seqmarker_load.py
+#	- write SEQ_Marker_Cache.lastrun.new; seqmarker.csh renames it once
+#	  the table has been loaded
+#	- createDeltaMarkers() : a changed polypeptide changes the genomic
+#	  sequence of the transcript it is translated from
+#	- createDeltaMarkers() : find deleted accessions and references by
+#	  key (counts, anti-joins) instead of matching every cache row's ids
+#	- applyDelta() : load the delta with COPY (seqcachelib.copyIn())
+#	- createQualifierTables() : load the qualifier and biotype rows with
+#	  COPY into unlogged tables (seqmarker_repseqs, seqmarker_biotypes)
+#	- the candidates are streamed in _Marker_key, _SequenceProvider_key,
+#	  _Sequence_key order, so that a length tie within a provider picks the
+#	  same sequence as tieredQuery (SEQMARKER_SQLTIERS=true)
+#
 # 03/29/2022
 #       wts2-813/Load ENSEMBL and VISTA Regulatory Elements
 #       add sequence provider:  Ensembl Regulatory Feature (222), VISTA Enhancer Element (223)
@@ -79,9 +157,18 @@
 
 import sys
 import os
+import getopt
+import multiprocessing
 import mgi_utils
 import loadlib
 import db
+import seqcachelib
+import seqcachebcp
+import seqcachestats
+import seqlookup
+import seqmarker_repseq
+import seqmarker_columnar
+import seqmarker_snapshot
 
 db.setTrace()
 
@@ -103,10 +190,9 @@ debug = os.environ['SEQMARKER_DEBUG']
 # column delimiter
 DL = os.environ['COLDELIM']
 
-# record delimiter
-NL = '\n'
-
 # database errors
+USAGE = 'Usage: seqmarker.py [--resume]'
+
 DB_ERROR = 'A database error occured: '
 DB_CONNECT_ERROR = 'Connection to the database failed: '
 
@@ -120,9 +206,99 @@ TRANSLATED_FROM_KEY = 5445465
 # date with which to record stamp database records
 loaddate = loadlib.loaddate
 
+# full or incremental (see Configuration)
+mode = os.environ.get('SEQMARKER_MODE', 'full')
+
+# number of processes selecting the representative sequences;
+# 1 : in this process
+workers = int(os.environ.get('SEQMARKER_WORKERS', '1'))
+
+# number of markers per unit of work handed to a worker process
+workerChunkSize = int(os.environ.get('SEQMARKER_CHUNKSIZE', '2000'))
+
+# true : classify the candidate sequences with numpy (seqmarker_columnar.py),
+# if it is available
+columnar = os.environ.get('SEQMARKER_COLUMNAR', 'false')
+
+# true : classify the candidate sequences and pick the longest transcript and
+# polypeptide per tier in the database (tieredQuery); overrides columnar
+sqlTiers = os.environ.get('SEQMARKER_SQLTIERS', 'false')
+
+# true : leave out the bogus PAR marker/sequence rows (see seqmarker_parupdate.py)
+parFilter = os.environ.get('SEQMARKER_PARFILTER', 'false')
+
+# bcp file
+bcpFileName = '%s/%s.bcp' % (datadir, table)
+
+# date of the last successful run; used by the incremental mode
+lastRunFileName = '%s/%s.lastrun' % (datadir, table)
+
+# the date of this run; renamed to lastRunFileName by seqmarker.csh
+# once the table has been loaded
+newLastRunFileName = '%s.new' % (lastRunFileName)
+
+# true : save the lookups to snapshotFileName and read them from it on
+# the next run if the tables they are built from have not changed
+snapshot = os.environ.get('SEQMARKER_SNAPSHOT', 'false')
+snapshotFileName = '%s/%s.snapshot' % (datadir, table)
+
+# number of rows written between checkpoints of the bcp write (0 : none);
+# full mode, bcp load mode only
+checkpointRows = int(os.environ.get('SEQMARKER_CHECKPOINT', '0'))
+checkpointFileName = '%s/%s.checkpoint' % (datadir, table)
+
+# number of bcp files, by _Marker_key range (1 : bcpFileName);
+# full mode, bcp load mode only
+partitions = int(os.environ.get('SEQMARKER_PARTITIONS', '1'))
+
+# the largest _Marker_key of each partition but the last
+partitionBounds = []
+
+# the partition being written (1..partitions)
+partitionIndex = 0
+
+# --resume : continue from the checkpoint of a failed run
+resume = False
+
+# the checkpoint resumed from (see readCheckpoint())
+resumeCheckpoint = None
+
+# date of this run, written to newLastRunFileName when the run is finished
+runDate = None
+
+# the representative sequence qualifier and the biotype conflict/raw
+# biotype of each marker/sequence, joined in by the final query
+# (createQualifierTables()); unlogged tables rather than temp tables, as
+# they are loaded with COPY on a seqcachelib.connect() connection, which
+# cannot see the temp tables of the db.sql() connection; dropped by finalize()
+repSeqsTable = 'seqmarker_repseqs'
+biotypesTable = 'seqmarker_biotypes'
+
+REPSEQS = seqcachebcp.Table(repSeqsTable, [
+    ('_Marker_key', seqcachebcp.INT),
+    ('_Sequence_key', seqcachebcp.INT),
+    ('_Qualifier_key', seqcachebcp.INT)])
+
+BIOTYPES = seqcachebcp.Table(biotypesTable, [
+    ('_Marker_key', seqcachebcp.INT),
+    ('_Sequence_key', seqcachebcp.INT),
+    ('_BiotypeConflict_key', seqcachebcp.INT),
+    ('rawbiotype', seqcachebcp.TEXT)],
+    nullable = ('rawbiotype',))
+
+# existing _Cache_key of the rows being replaced in incremental mode
+# looks like {(seqKey, markerKey, refsKey):cacheKey, ...}
+cacheKeyLookup = {}
+
 # name of bcp file descriptor
 outBCP = None
 
+# formats the rows written to outBCP (seqcachebcp)
+bcpWriter = None
+
+# per-phase timing and row counts
+stats = seqcachestats.Stats('seqmarker')
+
 # representative sequence qualifier lookup by term
 # looks like {qualifier:qualKey, ...}
 qualByTermLookup = {}
@@ -132,75 +308,33 @@ qualByTermLookup = {}
 qualByTermKeyLookup = {}
 
 # marker lookup by genomic sequence key (to see if seq assoc with other markers)
-# looks like {seqKey:[mkrKey1, ..., mkrKeyn], ...}
-mkrsByGenomicSeqKeyLookup = {}
+# a seqlookup.GroupedLookup : seqKey -> [mkrKey1, ..., mkrKeyn]
+mkrsByGenomicSeqKeyLookup = None
 
-# biotype lookup by genomic sequence key + marker key
-# {seqKey:mkrKey:[conflictType, rawBiotype], ...}
+# biotype lookup by marker key + genomic sequence key
+# {seqlookup.packKey(mkrKey, seqKey):(conflictType, rawBiotype), ...}
 biotypeLookup = {}
 
 # biotype default vocabulary = Not Applicable (_Vocab_key = 76)
-biotypeDefaultConflict = '5420769'
+biotypeDefaultConflict = 5420769
 
 # {markerKey:[GeneModel1, ...GeneModelN} 
 markerToGMDict = {}
 
-# represents all genomic seqs for the current marker by provider - see indexes
-# each dictionary looks like (_Marker_key:{}, ...} 
-# where {} is a db.sql result set
-allgenomic = [{}, {}, {}, {}, {}, {}]
-
-# indexes of allgenomic
-ENSEMBL = 1
-NCBI = 2
-gGENBANK = 3
-ENSEMBLR = 4
-VISTA = 5
-
-# genomic sequence provider terms, these are used when the 
-# provider is Ensembl, to determine the rep transcript and
-# protein associated with the gene model.
-genbank_prov = 'GENBANK'
-ncbi_prov = 'NCBI'
-ensembl_prov = 'ENSEMBL'
-ensemblr_prov = 'ENSEMBLR'
-vista_prov = 'VISTA'
-
 # Lookups from SEQ_Sequence_Assoc to determine relationships 
 # between Ensembl genomic, transcript, and protein sequences
+# (see seqmarker_repseq.py)
 
-# Looks like {gKey1:{tKey1:length, tKey2:length, ...},...,gKeyn:{tKeyn:length, ...}, ...}
-transcriptLookupByGenomicKey = {}
+# each is a seqlookup.GroupedLookup
 
-# Looks like {pKey1:{tKey1:length, tKey2:length, ...},...,pKeyn:{tKeyn:length, ...}, ...}
-transcriptLookupByProteinKey = {}
+# gKey -> [(tKey1, length), (tKey2, length), ...]
+transcriptLookupByGenomicKey = None
 
-# Looks like {gKey1:{pKey1:length, pKey2:length, ...},...,gKeyn:{pKeyn:length, ...}, ...}
-proteinLookupByGenomicKey = {}
+# pKey -> [(tKey1, length), (tKey2, length), ...]
+transcriptLookupByProteinKey = None
 
-# indexes of genomic sequence dictionaries
-SEQKEY=0
-UNIQ=1
-LENGTH=2
-
-# represents the longest transcript for the current marker by provider 
-# each dictionary looks like {_Marker_key:_Sequence_key, ...}
-alltranscript = [{}, {}, {}, {}, {}, {}, {}]
-
-# indexes of alltranscript:
-# 0=RefSeq NR
-# 1=GenBank RNA, not EST
-# 2=Refseq XM
-# 3=GenBank RNA, EST
-
-#  represents the longest protein for the current marker by provider
-# each dictionary looks like: {_Marker_key:_Sequence_key, ...}
-allpolypeptide = [{}, {}, {}, {}]
-# indexes of allpolypeptide:
-# 0=SwissProt
-# 1=RefSeq NP
-# 2=TrEMBL
-# 3=RefSeq XP
+# gKey -> [(pKey1, length), (pKey2, length), ...]
+proteinLookupByGenomicKey = None
 
 # each dictionary looks like {_Marker_key:_Sequence_key, ...}
 # the set of genomic representative sequences for markers
@@ -218,12 +352,16 @@ nextMaxKey = 0
 class GeneModel:
     # A representation of an gene model
     # as it applies to determining the biotype conflict
+    # equivalentBiotypeMask : seqlookup.ClosureLookup mask of the
+    #	feature types equivalent to the raw biotype
+    __slots__ = ('sequenceKey', 'ldbKey', 'rawBiotype', 'equivalentBiotypeMask')
+
     def __init__(self):
 
         self.sequenceKey = None
         self.ldbKey = None
         self.rawBiotype = None
-        self.equivalentBiotypeSet = None
+        self.equivalentBiotypeMask = 0
 
 # Purpose: Initialize db.sql settings, lookups, and file descriptor
 # Returns: Nothing
@@ -232,93 +370,193 @@ class GeneModel:
 # Throws: Nothing
 
 def init ():
-    global qualByTermLookup, qualByTermKeyLookup, mkrsByGenomicSeqKeyLookup
-    global proteinLookupByGenomicKey, transcriptLookupByGenomicKey
-    global transcriptLookupByProteinKey, outBCP
+    global outBCP, bcpWriter, runDate, nextMaxKey, resumeCheckpoint
     
     db.useOneConnection(1)
 
+    results = db.sql('''select to_char(now(), 'YYYY-MM-DD HH24:MI:SS') as runDate''', 'auto')
+    runDate = results[0]['runDate']
+
+    if resume:
+        if mode != 'full' or seqcachelib.loadMode != 'bcp':
+            sys.exit('--resume : SEQMARKER_MODE=full and SEQCACHE_LOADMODE=bcp only')
+        resumeCheckpoint = readCheckpoint()
+        if resumeCheckpoint is None:
+            print('No checkpoint : running full load')
+        elif resumeCheckpoint['partitions'] != numberOfFiles():
+            sys.exit('--resume : the checkpoint is of %s bcp file(s), SEQMARKER_PARTITIONS is %s' \
+                    % (resumeCheckpoint['partitions'], partitions))
+    elif os.path.exists(checkpointFileName):
+        # from a failed run; not of this run's bcp file
+        os.remove(checkpointFileName)
+
+    if resumeCheckpoint is not None:
+        print('Resuming after _Marker_key %s' % (resumeCheckpoint['lastMarkerKey']))
+        # the rows already written were read as of the failed run
+        runDate = resumeCheckpoint['runDate']
+        nextMaxKey = resumeCheckpoint['nextMaxKey']
+
+    print('Initializing ...%s' % (mgi_utils.date()))
+
     #
-    # load representative sequence qualifer lookups
+    # the lookups : read from the snapshot of a previous run if none
+    # of the tables they are built from has changed
     #
-    print('Initializing ...%s' % (mgi_utils.date()))
-    results = db.sql('select _Term_key, term from VOC_Term_RepQualifier_View', 'auto')
-    for r in results:
-       qualByTermLookup[r['term']] = r['_Term_key']
-       qualByTermKeyLookup[r['_Term_key']] = r['term']
+    loaded = False
+    if snapshot == 'true':
+        fingerprint = sourceFingerprint()
+        with stats.phase('snapshot read', verbose = False) as phase:
+            loaded = readSnapshot(fingerprint)
+            if loaded:
+                phase.rowsIn = len(biotypeLookup) + len(mkrsByGenomicSeqKeyLookup.values)
+
+    if loaded:
+        print('Lookups read from %s' % (snapshotFileName))
+        # createDeltaMarkers() joins allSeqs
+        if mode == 'incremental':
+            createSeqTables()
+    else:
+        loadLookups()
+        if snapshot == 'true':
+            with stats.phase('snapshot write', verbose = False):
+                writeSnapshot(fingerprint)
+
+    #
+    # create file descriptor for bcp file
+    #
+    # incremental mode : the delta is applied from the bcp file by applyDelta()
+    # resume : append to the rows written up to the checkpoint
+    # partitions : opened by createBCP() (openPartition())
+    if mode == 'incremental':
+        outBCP = open(bcpFileName, 'w')
+    elif partitioned():
+        return
+    elif resumeCheckpoint is not None:
+        outBCP = openResumed(bcpFileName, resumeCheckpoint['offset'])
+    else:
+        outBCP = seqcachelib.openOutput(table, bcpFileName)
+    bcpWriter = seqcachebcp.Writer(outBCP, seqcachebcp.SEQ_Marker_Cache)
+    return
+
+def openResumed(fileName, offset):
+    # Purpose: open the bcp file 'fileName' of a failed run to append to
+    #          the rows written up to its checkpoint
+    # Returns: the file
+    # Assumes: Nothing
+    # Effects: truncates 'fileName' to 'offset'
+    # Throws: SystemExit if 'fileName' is shorter than 'offset'
+
+    if not os.path.exists(fileName) or os.path.getsize(fileName) < offset:
+        sys.exit('%s is shorter than at its checkpoint' % (fileName))
+    os.truncate(fileName, offset)
+    return open(fileName, 'a')
+
+def createSeqTables():
+    # Purpose: create the temp tables of the genomic and gene model
+    #          sequences ('gbDNA', 'gm', 'allSeqs')
+    # Returns: Nothing
+    # Assumes: Nothing
+    # Effects: creates temp tables
+    # Throws: Nothing
 
     # query with which to load
     # genomic sequences associated with markers lookup
     # for Ensembl Gene Model (60), # NCBI Gene Model(59), GenBank DNA (9)
 
     # get the set of all preferred GenBank DNA sequences
-    db.sql('''
+    stats.sql('temp table creation', '''
         select upper(a.accID) as seqID, a._Object_key as _Sequence_key 
         INTO TEMPORARY TABLE gbDNA 
-        from ACC_Accession a, SEQ_Sequence s 
+        from %s a, SEQ_Sequence s 
         where a._LogicalDB_key = 9
         and a._MGIType_key = 19  
         and a.preferred = 1 
         and a._Object_key = s._Sequence_key  
         and s._SequenceType_key = 316347
-        ''', None)
+        ''' % (seqcachelib.snapshotTable('ACC_Accession')))
 
     # get the set of all Ensembl, NCBI gene models, Ensembl Regulatory Feature (222), VISTA Enhancer Element (223)
-    db.sql('''
+    stats.sql('temp table creation', '''
         select upper(a.accID) as seqID, a._Object_key as _Sequence_key 
         INTO TEMPORARY TABLE gm 
-        from ACC_Accession a 
+        from %s a 
         where a._LogicalDB_key in (59, 60, 222) 
         and a.preferred = 1 
         and a._MGIType_key = 19
         union
         select a.accID as seqID, a._Object_key as _Sequence_key 
-        from ACC_Accession a 
+        from %s a 
         where a._LogicalDB_key in (223) 
         and a.preferred = 1 
         and a._MGIType_key = 19
-        ''', None)
-    db.sql('create index idx_1 on gm (lower(seqID))', None)
-    db.sql('create index idx_2 on gm (_Sequence_key)', None)
+        ''' % (seqcachelib.snapshotTable('ACC_Accession'), seqcachelib.snapshotTable('ACC_Accession')))
+    stats.sql('index creation', 'create index idx_1 on gm (lower(seqID))')
+    stats.sql('index creation', 'create index idx_2 on gm (_Sequence_key)')
 
     # union the set
-    db.sql('''
+    stats.sql('temp table creation', '''
         select seqID, _Sequence_key 
         INTO TEMPORARY TABLE allSeqs 
         from gbDNA 
         union 
         select seqID, _Sequence_key 
         from gm
-        ''', None)
-    db.sql('create index idx_3_lower on allSeqs (lower(seqID))', None)
+        ''')
+    stats.sql('index creation', 'create index idx_3_lower on allSeqs (lower(seqID))')
+
+def loadLookups():
+    # Purpose: load the qualifier, marker/genomic sequence, 
+    #          SEQ_Sequence_Assoc and biotype lookups
+    # Returns: Nothing
+    # Assumes: Nothing
+    # Effects: queries a database, creates temp tables
+    # Throws: Nothing
+
+    global mkrsByGenomicSeqKeyLookup
+    global proteinLookupByGenomicKey, transcriptLookupByGenomicKey
+    global transcriptLookupByProteinKey
+
+    #
+    # load representative sequence qualifer lookups
+    #
+    lookupPhase = stats.phase('lookup load', verbose = False)
+    lookupPhase.begin()
+    results = db.sql('select _Term_key, term from VOC_Term_RepQualifier_View', 'auto')
+    for r in results:
+       qualByTermLookup[r['term']] = r['_Term_key']
+       qualByTermKeyLookup[r['_Term_key']] = r['term']
+    lookupPhase.rowsIn = lookupPhase.rowsIn + len(results)
+    lookupPhase.end()
+
+    createSeqTables()
 
     # get markers for these sequences
-    results = db.sql('''
+    lookupPhase.begin()
+    results = seqcachelib.streamRows('''
         select s._Sequence_key, a._Object_key as _Marker_key 
-        from allSeqs s, ACC_Accession a 
+        from allSeqs s, %s a 
         where a._MGIType_key = 2 
         and a._LogicalDB_key in (59, 60, 9, 222, 223) 
-        and lower(s.seqID) = lower(a.accid) 
-        order by _Sequence_key 
-        ''', 'auto')
+        and lower(s.seqID) = %s 
+        order by _Sequence_key, _Marker_key
+        ''' % (seqcachelib.accessionTable(), seqcachelib.lowerAccID('a')), 'mkrsByGenomicCursor')
 
     # load genomic sequences associated with markers lookup
-    prevSeqKey = ''
+    # a (sequence, marker) pair matched by more than one accession row is
+    # kept once per row, as in a list; seqmarker_repseq isUniq counts them
+    builder = seqlookup.GroupedLookupBuilder(mergeRepeats = False)
     for r in results:
-        seqKey = r['_Sequence_key']
-        markerKey = r['_Marker_key']
-        if seqKey != prevSeqKey:
-            mkrsByGenomicSeqKeyLookup[seqKey] = [markerKey]
-        else:
-            mkrsByGenomicSeqKeyLookup[seqKey].append(markerKey)
-        prevSeqKey = seqKey
+        builder.add(r['_Sequence_key'], r['_Marker_key'])
+    mkrsByGenomicSeqKeyLookup = builder.build()
+    lookupPhase.rowsIn = lookupPhase.rowsIn + len(mkrsByGenomicSeqKeyLookup.values)
+    lookupPhase.end()
 
     #
     # Load lookups determine relationships between Ensembl 
     # genomic, transcript, and protein sequences
     #
     # Load transcriptLookupByGenomicKey 
-    db.sql('''
+    stats.sql('temp table creation', '''
         select sa._Sequence_key_1 as transcriptKey, 
                 ss.length as transcriptLength, 
                 sa._Sequence_key_2 as genomicKey 
@@ -326,21 +564,18 @@ def init ():
         from SEQ_Sequence_Assoc sa, SEQ_Sequence ss 
         where sa._Qualifier_key = %s 
         and sa._Sequence_key_1 = ss._Sequence_key
-        ''' % (TRANSCRIBED_FROM_KEY), None)
-    db.sql('create index idx4 on transGen(transcriptKey)', None)
-    results = db.sql('select * from transGen order by genomicKey', 'auto')
-    prevGKey = ''
+        ''' % (TRANSCRIBED_FROM_KEY))
+    stats.sql('index creation', 'create index idx4 on transGen(transcriptKey)')
+    lookupPhase.begin()
+    results = seqcachelib.streamRows('select * from transGen order by genomicKey, transcriptKey',
+        'transGenCursor')
+    builder = seqlookup.GroupedLookupBuilder()
     for r in results:
-        gKey = r['genomicKey']
-        tKey = r['transcriptKey']
-        tLength = r['transcriptLength']
-        if gKey != prevGKey:
-            transcriptLookupByGenomicKey[gKey] = {}
-        transcriptLookupByGenomicKey[gKey][tKey] = tLength
-        prevGKey = gKey
+        builder.add(r['genomicKey'], r['transcriptKey'], r['transcriptLength'])
+    transcriptLookupByGenomicKey = builder.build()
 
     # Load proteinLookupByGenomicKey
-    results = db.sql('''
+    results = seqcachelib.streamRows('''
         select tg.genomicKey, 
                 sa._Sequence_key_1 as proteinKey, 
                 ss.length as proteinLength 
@@ -348,21 +583,17 @@ def init ():
         where sa._Qualifier_key = %s
         and tg.transcriptKey =  sa._Sequence_key_2 
         and sa._Sequence_key_1 = ss._Sequence_key 
-        order by tg.genomicKey
-        ''' % (TRANSLATED_FROM_KEY), 'auto')
+        order by tg.genomicKey, proteinKey
+        ''' % (TRANSLATED_FROM_KEY), 'protGenCursor')
 
-    prevGKey = ''
+    builder = seqlookup.GroupedLookupBuilder()
     for r in results:
-        gKey = r['genomicKey']
-        pKey = r['proteinKey']
-        pLength = r['proteinLength']
-        if gKey != prevGKey:
-            proteinLookupByGenomicKey[gKey] = {}
-        proteinLookupByGenomicKey[gKey][pKey] = pLength
-        prevGKey = gKey
+        builder.add(r['genomicKey'], r['proteinKey'], r['proteinLength'])
+    proteinLookupByGenomicKey = builder.build()
+
     # Load transcriptLookupByProteinKey
     # there should be only one transcript for a protein, but one never knows
-    results = db.sql('''
+    results = seqcachelib.streamRows('''
                 select sa._Sequence_key_1 as proteinKey, 
                         sa._Sequence_key_2 as transcriptKey,
                         ss.length as transcriptLength 
@@ -370,763 +601,485 @@ def init ():
                 SEQ_Sequence ss 
                 where sa._Qualifier_key = %s 
                 and sa._Sequence_key_2 = ss._Sequence_key 
-                order by sa._Sequence_key_1
-                ''' % (TRANSLATED_FROM_KEY), 'auto')
-    prevPKey = ''
+                order by sa._Sequence_key_1, sa._Sequence_key_2
+                ''' % (TRANSLATED_FROM_KEY), 'transProtCursor')
+    builder = seqlookup.GroupedLookupBuilder()
     for r in results:
-        pKey = r['proteinKey']
-        tKey = r['transcriptKey']
-        tLength = r['transcriptLength']
-        if pKey != prevPKey:
-            transcriptLookupByProteinKey[pKey] = {}
-        transcriptLookupByProteinKey[pKey][tKey] = tLength
-        prevPKey = pKey
+        builder.add(r['proteinKey'], r['transcriptKey'], r['transcriptLength'])
+    transcriptLookupByProteinKey = builder.build()
+
+    for lookup in (transcriptLookupByGenomicKey, proteinLookupByGenomicKey, transcriptLookupByProteinKey):
+        lookupPhase.rowsIn = lookupPhase.rowsIn + len(lookup.values)
+    lookupPhase.end()
 
     # generate biotype lookup
-    generateBiotypeLookups()
+    with stats.phase('biotype lookup') as phase:
+        generateBiotypeLookups()
+        phase.rowsOut = len(biotypeLookup)
+
+def sourceFingerprint():
+    # Purpose: the fingerprint of the tables the lookups are built from :
+    #          their row counts and max(modification_date)
+    # Returns: string (see seqmarker_snapshot.fingerprint())
+    # Assumes: Nothing
+    # Effects: queries a database
+    # Throws: Nothing
 
-    #
-    # create file descriptor for bcp file
-    #
-    outBCP = open('%s/%s.bcp' % (datadir, table), 'w')
-    return
+    # (name, table, where clause, has modification_date)
+    sources = [
+        ('ACC_Accession', seqcachelib.snapshotTable('ACC_Accession'), 'where _MGIType_key in (2, 19)', 1),
+        ('SEQ_Sequence', 'SEQ_Sequence', '', 1),
+        ('SEQ_Sequence_Assoc', 'SEQ_Sequence_Assoc', '', 1),
+        ('SEQ_GeneModel', 'SEQ_GeneModel', '', 1),
+        ('MRK_MCV_Cache', 'MRK_MCV_Cache', '', 1),
+        ('MRK_BiotypeMapping', 'MRK_BiotypeMapping', '', 1),
+        ('VOC_Term', 'VOC_Term', '', 1),
+        ('DAG_Closure', 'DAG_Closure', 'where _DAG_key = 9', 0)]
+
+    cmds = []
+    for name, fromTable, where, hasDate in sources:
+        if hasDate:
+            maxDate = "to_char(max(modification_date), 'YYYY-MM-DD HH24:MI:SS.US')"
+        else:
+            maxDate = "''"
+        cmds.append("select '%s' as name, count(*) as rowCount, %s as maxDate from %s %s" \
+                % (name, maxDate, fromTable, where))
 
-def writeError(sKey, lKey, rawBiotype):
-    print('No equivalency set for sequenceKey: %s, ldbKey: %s, rawBiotype: %s' % (sKey, lKey, rawBiotype))
+    results = db.sql(' union all '.join(cmds), 'auto')
+    rows = {}
+    for r in results:
+        rows[r['name']] = (r['name'], r['rowCount'], r['maxDate'])
 
-# Purpose: Determines representative genomic, transcript, and protein for the given marker
-# Returns: Nothing
-# Assumes: Nothing
-# Effects: Nothing
-# Throws: Nothing
+    return seqmarker_snapshot.fingerprint([rows[s[0]] for s in sources])
 
-def determineRepresentative(marker):
-    global genomic, transcript, polypeptide
+def readSnapshot(fingerprint):
+    # Purpose: read the lookups from snapshotFileName
+    # Returns: True if they were read; False if there is no snapshot
+    #          of 'fingerprint'
+    # Assumes: Nothing
+    # Effects: sets the lookups
+    # Throws: Nothing
 
-    if debug == 'true':
-        print('determineRep for marker: %s' % marker)
+    global mkrsByGenomicSeqKeyLookup, biotypeLookup
+    global proteinLookupByGenomicKey, transcriptLookupByGenomicKey
+    global transcriptLookupByProteinKey
 
-    #
-    # Determine Representative Genomic Sequence
-    #
-    # see algorithm here: 
-    # http://mgiwiki/mediawiki/index.php/sw:Representative_sequence_algorithm
-    # 
-
-    ##-----------------------------------------------------------------------------
-    # Determine attributes for each provider and provider sequence for this marker
-    ##-----------------------------------------------------------------------------
-
-    ##--------------------------------------
-    # The attributes
-    ##--------------------------------------
-
-    # * = Ensembl|NCBI|GenBank
-    # True if this marker has a * sequence
-    # NOTE: we need these has* variables to determine multiple and not uniq
-    hasEnsembl = False
-    hasNCBI = False
-    hasGenBank = False
-    hasEnsemblr = False
-    hasVISTA = False
-
-    # True if this marker has only one * id
-    ensemblIsSgl = False
-    ncbiIsSgl = False
-    genbankIsSgl = False
-    ensemblrIsSgl = False
-    vistaIsSgl = False
-
-    # True if this marker has a unique * sequence (associated with only
-    # this marker)
-    ensemblHasUniq = False
-    ncbiHasUniq = False
-    genbankHasUniq = False
-    ensemblrHasUniq = False
-    vistaHasUniq = False
-
-    # list of dictionaries of * seqs for this marker
-    # looks like [{UNIQ:True/False, SEQKEY:key, LENGTH:length}, ...]
-    ensemblSeqs = []
-    ncbiSeqs = []
-    genbankSeqs = []
-    ensemblrSeqs = []
-    vistaSeqs = []
-
-    ##--------------------------------------
-    # Get Ensembl attributes
-    ##--------------------------------------
-    if marker in allgenomic[ENSEMBL]:
-        hasEnsembl = True
-
-        # if this marker has only one ENSEMBL sequence flag it as single
-        if len(allgenomic[ENSEMBL][marker]) == 1:
-            ensemblIsSgl = True
-
-        # get seqKey, seqLength, and uniqueness for each ENSEMBL sequence
-        for result in allgenomic[ENSEMBL][marker]:
-            seqDict =  {}
-            seqKey = result['_Sequence_key']
-            length = result['length']
-            seqDict[SEQKEY] = seqKey
-            seqDict[LENGTH] = length
-
-            value = False
-            if seqKey in mkrsByGenomicSeqKeyLookup and len(mkrsByGenomicSeqKeyLookup[seqKey]) == 1:
-                value = True
-                ensemblHasUniq = True
-            seqDict[UNIQ] = value
-            ensemblSeqs.append(seqDict)
+    lookups = seqmarker_snapshot.read(snapshotFileName, fingerprint)
+    if lookups is None:
+        return False
 
-        if debug == 'true':
-            print('ensemblseqs: %s' % ensemblSeqs)
-
-    ##--------------------------------------
-    # Get NCBI attributes
-    ##--------------------------------------
-    if marker in allgenomic[NCBI]:
-        hasNCBI = True
-
-        # if this marker has only one NCBI sequence flag it as single
-        if len(allgenomic[NCBI][marker]) == 1:
-            ncbiIsSgl = True
-
-        # get seqKey, seqLength, and uniqueness for each NCBI sequence
-        for result in allgenomic[NCBI][marker]:
-            seqDict =  {}
-            seqKey = result['_Sequence_key']
-            length = result['length']
-            seqDict[SEQKEY] = seqKey
-            seqDict[LENGTH] = length
-
-            value = False
-            if seqKey in mkrsByGenomicSeqKeyLookup and len(mkrsByGenomicSeqKeyLookup[seqKey]) == 1:
-                value = True
-                ncbiHasUniq = True
-            seqDict[UNIQ] = value
-            ncbiSeqs.append(seqDict)
+    for term, termKey in lookups['qualifiers'].items():
+        qualByTermLookup[term] = termKey
+        qualByTermKeyLookup[termKey] = term
 
-        if debug == 'true':
-            print('ncbiseqs: %s' % ncbiSeqs)
-
-    ##--------------------------------------
-    # Get GenBank attributes
-    ##--------------------------------------
-    if marker in allgenomic[gGENBANK]:
-        hasGenBank = True 
-
-        # if this marker has only one GENBANK sequence flag it as single
-        if len(allgenomic[gGENBANK][marker]) == 1:
-            genbankIsSgl = True
-
-        # get seqKey, seqLength, and uniqueness for each GENBANK sequence
-        for result in allgenomic[gGENBANK][marker]:
-            seqDict =  {}
-            seqKey = result['_Sequence_key']
-            length = result['length']
-            seqDict[SEQKEY] = seqKey
-            seqDict[LENGTH] = length
-
-            value = False
-            if seqKey in mkrsByGenomicSeqKeyLookup and len(mkrsByGenomicSeqKeyLookup[seqKey]) == 1:
-                value = True
-                genbankHasUniq = True
-            seqDict[UNIQ] = value
-            genbankSeqs.append(seqDict)
-            
-        if debug == 'true':
-            print('genbankseqs: %s' % genbankSeqs)
-
-    ##--------------------------------------
-    # Get EnsemblR attributes
-    ##--------------------------------------
-    if marker in allgenomic[ENSEMBLR]:
-        hasEnsemblr = True
-
-        # if this marker has only one ENSEMBLR sequence flag it as single
-        if len(allgenomic[ENSEMBLR][marker]) == 1:
-            ensemblrIsSgl = True
-
-        # get seqKey, seqLength, and uniqueness for each ENSEMBL sequence
-        for result in allgenomic[ENSEMBLR][marker]:
-            seqDict =  {}
-            seqKey = result['_Sequence_key']
-            length = result['length']
-            seqDict[SEQKEY] = seqKey
-            seqDict[LENGTH] = length
-
-            value = False
-            if seqKey in mkrsByGenomicSeqKeyLookup and len(mkrsByGenomicSeqKeyLookup[seqKey]) == 1:
-                value = True
-                ensemblrHasUniq = True
-            seqDict[UNIQ] = value
-            ensemblrSeqs.append(seqDict)
+    mkrsByGenomicSeqKeyLookup = lookups['mkrsByGenomicSeqKeyLookup']
+    transcriptLookupByGenomicKey = lookups['transcriptLookupByGenomicKey']
+    proteinLookupByGenomicKey = lookups['proteinLookupByGenomicKey']
+    transcriptLookupByProteinKey = lookups['transcriptLookupByProteinKey']
+    biotypeLookup = lookups['biotypes']
 
-        if debug == 'true':
-            print('ensemblrseqs: %s' % ensemblrSeqs)
-
-    ##--------------------------------------
-    # Get VISTA attributes
-    ##--------------------------------------
-    if marker in allgenomic[VISTA]:
-        hasVISTA = True
-
-        # if this marker has only one VISTA sequence flag it as single
-        if len(allgenomic[VISTA][marker]) == 1:
-            vistaIsSgl = True
-
-        # get seqKey, seqLength, and uniqueness for each VISTA sequence
-        for result in allgenomic[VISTA][marker]:
-            seqDict =  {}
-            seqKey = result['_Sequence_key']
-            length = result['length']
-            seqDict[SEQKEY] = seqKey
-            seqDict[LENGTH] = length
-
-            value = False
-            if seqKey in mkrsByGenomicSeqKeyLookup and len(mkrsByGenomicSeqKeyLookup[seqKey]) == 1:
-                value = True
-                vistaHasUniq = True
-            seqDict[UNIQ] = value
-            vistaSeqs.append(seqDict)
+    return True
 
-        if debug == 'true':
-                print('vistaseqs: %s' % vistaSeqs)
-
-    #-------------------------------------------------------------------------------------------
-    # Determine representative genomic for marker using provider and provider sequence attributes
-    ##-------------------------------------------------------------------------------------------
-
-    genomicRepKey = 0
-    genomicRepProvider = ''
-    hasSglUniqEnsembl = False
-    hasSglUniqNCBI = False
-    hasSglUniqEnsemblr = False
-    hasSglUniqVISTA = False
-
-    # marker has no GMs
-    if not hasEnsembl and not hasNCBI and not hasEnsemblr and not hasVISTA:  
-
-        # is there a longest uniq
-        (s,l) = determineSeq(genbankSeqs, True, True)
-
-        # no sequence found that match parameters if s == 0
-        if s != 0:
-            genomicRepKey = s
-            genomicRepProvider = genbank_prov
-            if debug == 'true':
-                print('CASE 1')
-
-        # if no longest uniq get longest
-        if genomicRepKey == 0:
-            (s,l) = determineSeq(genbankSeqs, True, False)
-
-            if s != 0:
-                genomicRepKey = s
-                genomicRepProvider = genbank_prov
-                if debug == 'true':
-                    print('CASE 2')
-
-        # else NO REPRESENTATIVE SEQUENCE value of genomicRepKey is still 0
-
-    # marker has at least one GM, therefore WILL HAVE REP SEQUENCE
-    else: 
-
-        # check single uniq Ensembl, NCBI, EnsemblR, VISTA
-        if ensemblIsSgl and ensemblHasUniq:
-                hasSglUniqEnsembl = True
-
-        if ncbiIsSgl and ncbiHasUniq:
-                hasSglUniqNCBI = True
-
-        if ensemblrIsSgl and ensemblrHasUniq:
-                hasSglUniqEnsemblr = True
-
-        if vistaIsSgl and vistaHasUniq:
-                hasSglUniqVISTA = True
-
-        if hasSglUniqEnsembl and hasSglUniqNCBI:
-                ensemblLen = ensemblSeqs[0][LENGTH]
-                ncbiLen = ncbiSeqs[0][LENGTH]
-                value = determineShortest(ensemblLen, ncbiLen)
-                # if ensembl and ncbi length equal or ncbi shorter pick ncbi
-                if value == -1 or value == 1:
-                    genomicRepKey = ncbiSeqs[0][SEQKEY]
-                    genomicRepProvider = ncbi_prov
-                    if debug == 'true':
-                        print('CASE 3')
-                else:
-                    genomicRepKey =  ensemblSeqs[0][SEQKEY]
-                    genomicRepProvider = ensembl_prov
-                    if debug == 'true':
-                        print('CASE 4')
-
-        elif hasSglUniqEnsembl:
-                genomicRepKey = ensemblSeqs[0][SEQKEY]
-                genomicRepProvider = ensembl_prov
-                if debug == 'true':
-                    print('CASE 5')
-
-        elif hasSglUniqNCBI:
-                genomicRepKey = ncbiSeqs[0][SEQKEY]
-                genomicRepProvider = ncbi_prov
-                if debug == 'true':
-                    print('CASE 6')
-
-        elif hasSglUniqEnsemblr and hasSglUniqVISTA:
-                ensemblrLen = ensemblrSeqs[0][LENGTH]
-                vistaLen = vistaSeqs[0][LENGTH]
-                value = determineShortest(ensemblrLen, vistaLen)
-                # if ensemblr and vista length equal or vista shorter pick vista
-                if value == -1 or value == 1:
-                    genomicRepKey = vistaSeqs[0][SEQKEY]
-                    genomicRepProvider = vista_prov
-                    if debug == 'true':
-                        print('CASE 7')
-                else:
-                    genomicRepKey =  ensemblrSeqs[0][SEQKEY]
-                    genomicRepProvider = ensemblr_prov
-                    if debug == 'true':
-                        print('CASE 8')
-
-        elif hasSglUniqEnsemblr:
-                genomicRepKey = ensemblrSeqs[0][SEQKEY]
-                genomicRepProvider = ensemblr_prov
-                if debug == 'true':
-                    print('CASE 9')
-
-        elif hasSglUniqVISTA:
-                genomicRepKey = vistaSeqs[0][SEQKEY]
-                genomicRepProvider = vista_prov
-                if debug == 'true':
-                    print('CASE 10')
-
-        # only multiples (uniq or not) or single not-uniq left
-        else:
-                if ensemblHasUniq and ncbiHasUniq:
-                        # pick shortest uniq, if tie pick one
-                        (s_e, l_e) = determineSeq(ensemblSeqs, False, True)
-                        (s_n, l_n) = determineSeq(ncbiSeqs, False, True)
-                        value = determineShortest(l_e, l_n)
-                        if value == -1 or value == 1:
-                            genomicRepKey = s_n
-                            genomicRepProvider = ncbi_prov
-                            if debug == 'true':
-                                print('CASE 11')
-                        else:
-                            genomicRepKey = s_e
-                            genomicRepProvider = ensembl_prov	
-                            if debug == 'true':
-                                print('CASE 12')
-
-                elif ensemblHasUniq:
-                        (s_e, l_e) = determineSeq(ensemblSeqs, False, True)
-                        genomicRepKey = s_e
-                        genomicRepProvider = ensembl_prov
-                        if debug == 'true':
-                            print('CASE 13')
-
-                elif ncbiHasUniq:
-                        (s_n, l_n) = determineSeq(ncbiSeqs, False, True)
-                        genomicRepKey = s_n
-                        genomicRepProvider = ncbi_prov
-                        if debug == 'true':
-                            print('CASE 14')
-
-                elif ensemblrHasUniq and vistaHasUniq:
-                        # pick shortest uniq, if tie pick one
-                        (s_er, l_er) = determineSeq(ensemblrSeqs, False, True)
-                        (s_v, l_v) = determineSeq(vistaSeqs, False, True)
-                        value = determineShortest(l_er, l_v)
-                        if value == -1 or value == 1:
-                            genomicRepKey = s_v
-                            genomicRepProvider = vista_prov
-                            if debug == 'true':
-                                print('CASE 15')
-                        else:
-                            genomicRepKey = s_er
-                            genomicRepProvider = ensemblr_prov	
-                            if debug == 'true':
-                                print('CASE 16')
-
-                elif ensemblrHasUniq:
-                        (s_er, l_er) = determineSeq(ensemblrSeqs, False, True)
-                        genomicRepKey = s_er
-                        genomicRepProvider = ensemblr_prov
-                        if debug == 'true':
-                            print('CASE 17')
-
-                elif vistaHasUniq:
-                        (s_v, l_v) = determineSeq(vistaSeqs, False, True)
-                        genomicRepKey = s_v
-                        genomicRepProvider = vista_prov
-                        if debug == 'true':
-                            print('CASE 18')
-
-                # no uniques, only single or multiple non-uniq left
-                else:
-                    # check for ensembl and ncbi sgl
-                    if ensemblIsSgl or ncbiIsSgl:
-                            if ensemblIsSgl and ncbiIsSgl:
-                                value = determineShortest(ensemblSeqs[0][LENGTH], ncbiSeqs[0][LENGTH])
-                                if value == -1 or value == 1:
-                                    genomicRepKey = ncbiSeqs[0][SEQKEY]
-                                    genomicRepProvider = ncbi_prov
-                                    if debug == 'true':
-                                        print('CASE 19')
-
-                                else:
-                                    genomicRepKey =  ensemblSeqs[0][SEQKEY]
-                                    genomicRepProvider = ensembl_prov
-                                    if debug == 'true':
-                                        print('CASE 20')
-
-                            elif ensemblIsSgl:
-                                genomicRepKey = ensemblSeqs[0][SEQKEY]
-                                genomicRepProvider = ensembl_prov
-                                if debug == 'true':
-                                    print('CASE 21')
-
-                            elif ncbiIsSgl:
-                                genomicRepKey = ncbiSeqs[0][SEQKEY]
-                                genomicRepProvider = ncbi_prov
-                                if debug == 'true':
-                                    print('CASE 22')
-
-                    # check for ensemblr and vista sgl
-                    elif ensemblrIsSgl or vistaIsSgl:
-                            if ensemblrIsSgl and vistaIsSgl:
-                                value = determineShortest(ensemblrSeqs[0][LENGTH], ncbiSeqs[0][LENGTH])
-                                if value == -1 or value == 1:
-                                    genomicRepKey = vistaSeqs[0][SEQKEY]
-                                    genomicRepProvider = vista_prov
-                                    if debug == 'true':
-                                        print('CASE 23')
-
-                                else:
-                                    genomicRepKey =  ensemblrSeqs[0][SEQKEY]
-                                    genomicRepProvider = ensemblr_prov
-                                    if debug == 'true':
-                                        print('CASE 24')
-
-                            elif ensemblrIsSgl:
-                                genomicRepKey = ensemblrSeqs[0][SEQKEY]
-                                genomicRepProvider = ensemblr_prov
-                                if debug == 'true':
-                                    print('CASE 25')
-
-                            elif vistaIsSgl:
-                                genomicRepKey = vistaSeqs[0][SEQKEY]
-                                genomicRepProvider = vista_prov
-                                if debug == 'true':
-                                    print('CASE 26')
-
-                    # no singles, must be multiple non-uniq
-                    else:
-                            if hasEnsembl and hasNCBI:
-                                # pick shortest, NCBI if tie
-                                (s_e, l_e) = determineSeq(ensemblSeqs, False, False)
-                                (s_n, l_n) = determineSeq(ncbiSeqs, False, False)
-                                value = determineShortest(l_e, l_n)
-                                if value == -1 or value == 1:
-                                    genomicRepKey = s_n
-                                    genomicRepProvider = ncbi_prov
-                                    if debug == 'true':
-                                        print('CASE 27')
-                                else:
-                                    genomicRepKey =  s_e
-                                    genomicRepProvider = ensembl_prov
-                                    if debug == 'true':
-                                        print('CASE 28')
-
-                            elif hasEnsembl:
-                                # pick shortest
-                                (s_e, l_e) = determineSeq( ensemblSeqs, False, False)
-                                genomicRepKey = s_e
-                                genomicRepProvider = ensembl_prov
-                                if debug == 'true':
-                                    print('CASE 29')
-
-                            elif hasNCBI:
-                                # pick shortest
-                                (s_n, l_n) = determineSeq(ncbiSeqs, False, False)
-                                genomicRepKey = s_n
-                                genomicRepProvider = ncbi_prov
-                                if debug == 'true':
-                                    print('CASE 30')
-
-                            elif hasEnsemblr and hasVISTA:
-                                # pick shortest, VISTA if tie
-                                (s_er, l_er) = determineSeq(ensemblrSeqs, False, False)
-                                (s_v, l_v) = determineSeq(vistaSeqs, False, False)
-                                value = determineShortest(l_er, l_v)
-                                if value == -1 or value == 1:
-                                    genomicRepKey = s_v
-                                    genomicRepProvider = vista_prov
-                                    if debug == 'true':
-                                        print('CASE 31')
-                                else:
-                                    genomicRepKey =  s_er
-                                    genomicRepProvider = ensemblr_prov
-                                    if debug == 'true':
-                                        print('CASE 32')
-
-                            elif hasEnsemblr:
-                                # pick shortest
-                                (s_er, l_er) = determineSeq(ensemblrSeqs, False, False)
-                                genomicRepKey = s_er
-                                genomicRepProvider = ensemblr_prov
-                                if debug == 'true':
-                                    print('CASE 33')
-
-                            elif hasVISTA:
-                                # pick shortest
-                                (s_v, l_v) = determineSeq(vistaSeqs, False, False)
-                                genomicRepKey = s_v
-                                genomicRepProvider = vista_prov
-                                if debug == 'true':
-                                    print('CASE 34')
-
-    # if we found a genomicRepKey for this marker add it to the dictionary
-    if debug == 'true':
-        print('genomicRepKey: %s' % genomicRepKey)
-        print('genomicRepProvider: %s' % genomicRepProvider)
+def writeSnapshot(fingerprint):
+    # Purpose: save the lookups to snapshotFileName
+    # Returns: Nothing
+    # Assumes: loadLookups() has been run
+    # Effects: writes a file
+    # Throws: Nothing
 
-    if genomicRepKey != 0:
-        genomic[marker] = genomicRepKey
-    else:
-        if debug == 'true':
-            print('CASE 35')
+    seqmarker_snapshot.write(snapshotFileName, fingerprint, {
+        'qualifiers' : qualByTermLookup,
+        'mkrsByGenomicSeqKeyLookup' : mkrsByGenomicSeqKeyLookup,
+        'transcriptLookupByGenomicKey' : transcriptLookupByGenomicKey,
+        'proteinLookupByGenomicKey' : proteinLookupByGenomicKey,
+        'transcriptLookupByProteinKey' : transcriptLookupByProteinKey,
+        'biotypes' : biotypeLookup})
+
+def checkpointing():
+    # Purpose: are the rows written in _Marker_key order, with a
+    #          checkpoint every 'checkpointRows' rows
+    # Returns: True if so
+    # Assumes: Nothing
+    # Effects: Nothing
+    # Throws: Nothing
 
-    #
-    # Determine Representative Protein and Transcript Sequences
-    #
-    if genomicRepProvider == ensembl_prov:
-        determineVegaEnsProtTransRep(marker, genomicRepKey)
-    else: # not Ensembl
-        determineNonVegaEnsProtRep(marker)
-        determineNonVegaEnsTransRep(marker)
+    return mode == 'full' and seqcachelib.loadMode == 'bcp' and checkpointRows > 0
 
-    return
+def partitioned():
+    # Purpose: is the bcp file written as 'partitions' files, in
+    #          _Marker_key order
+    # Returns: True if so
+    # Assumes: Nothing
+    # Effects: Nothing
+    # Throws: Nothing
 
-def determineVegaEnsProtTransRep(marker, genomicRepKey):
-    # Purpose: Determine the representative protein and transcript
-    #     for 'marker'. When the rep genomic is Ensembl
-    #     the protein and transcript must be from same provider
-    #     if they exist
-    # Returns: nothing
-    # Assumes: nothing
-    # Effects: nothing
-    # Throws: nothing
+    return mode == 'full' and seqcachelib.loadMode == 'bcp' and partitions > 1
 
-    global allpolypeptide, polypeptide, alltranscript, transcript
-    global transcriptLookupByGenomicKey, transcriptLookupByProteinKey
+def numberOfFiles():
+    # Purpose: the number of bcp files written
+    # Returns: integer
+    # Assumes: Nothing
+    # Effects: Nothing
+    # Throws: Nothing
 
-    protRepKey = 0 	# default
-    transRepKey = 0 	# default
+    if partitioned():
+        return partitions
+    return 1
 
-    #
-    # we determine the reprentative protein first per requirements -
-    # see TR9774
-    #
-    if genomicRepKey not in proteinLookupByGenomicKey:
-        # no prots for this genomic, get rep protein in the usual way
-        determineNonVegaEnsProtRep(marker)
-
-        # now get Vega/Ensembl transcript(s) for the genomicRepKey
-        if genomicRepKey in transcriptLookupByGenomicKey:
-            # get the list of transcriptIds mapped to their length
-            #transDict- {t1:length, t2:length, ...}
-            transDict = transcriptLookupByGenomicKey[genomicRepKey]
-            # length of current longest transcript
-            currentLongestTransLen = 0
-            # Now determine the longest transcript
-            for tKey in list(transDict.keys()):
-                tLength = transDict[tKey]
-                if tLength > currentLongestTransLen:
-                    currentLongestTransLen = tLength
-                    transRepKey = tKey
-            if transRepKey != 0:
-                transcript[marker] = transRepKey
-            else:
-                print("This shouldn't happen 1")
-                sys.exit("This shouldn't happen 1")
-        else: # no trans for the genomic, get rep trans in the usual way
-            determineNonVegaEnsTransRep(marker)
-
-    else: # there are proteins for the genomicRepKey, determine longest
-        protDict = proteinLookupByGenomicKey[genomicRepKey]
-
-        # length of current longest polypeptide
-        currentLongestProtLen = 0
-        protRepKey = 0
-        # determine the longest polypeptide
-        for pKey in list(protDict.keys()):
-            pLength = protDict[pKey]
-
-            if int(pLength) > int(currentLongestProtLen):
-                currentLongestProtLen = pLength
-                protRepKey = pKey
-
-        if protRepKey != 0:
-            polypeptide[marker] = protRepKey
-        else: 
-            print("This shouldn't happen 2")
-            sys.exit("This shouldn't happen 2")
-        # now get Vega/Ensembl transcript(s) for the protRepKey
-        if protRepKey in transcriptLookupByProteinKey:
-            transDict = transcriptLookupByProteinKey[protRepKey]
-            # length of current longest transcript
-            currentLongestTransLen = 0
-            transRepKey = 0
-            # determine the longest transcript
-            for tKey in list(transDict.keys()):
-                tLength = transDict[tKey]
-                if tLength > currentLongestTransLen:
-                    currentLongestTransLen = tLength
-                    transRepKey = tKey
-            if transRepKey  != 0:
-                transcript[marker] = transRepKey
-        else:   # no Ensembl protein i.e.
-                # we have a protein w/o a transcript
-            print("This shouldn't happen 3")
-            sys.exit("This shouldn't happen 3")
-    return
+def createPartitions():
+    # Purpose: set the bounds of the partitions : about the same number
+    #          of 'finalannot' rows each, whole markers
+    # Returns: Nothing
+    # Assumes: partitioned(); temp table 'finalannot' has been created
+    # Effects: sets partitionBounds
+    # Throws: Nothing
 
-def determineNonVegaEnsProtRep(marker):
-    # Purpose: determine non-Ensembl rep protein
-    # Returns: nothing
-    # Assumes: nothing
-    # Effects: nothing
-    # Throws: nothing
-
-    global allpolypeptide, polypeptide
-    for i in range(len(allpolypeptide)):
-        if marker in allpolypeptide[i]:
-            polypeptide[marker] = allpolypeptide[i][marker]
-            return
-    return
+    global partitionBounds
 
-def determineNonVegaEnsTransRep(marker):
-    # Purpose: determine non-Ensembl rep transcript
-    # Returns: nothing
-    # Assumes: nothing
-    # Effects: nothing
-    # Throws: nothing
-
-    global alltranscript, transcript
-    for i in range(len(alltranscript)):
-        if marker in alltranscript[i]:
-            #transcript[marker] = []
-            # why is this different then loading polypeptide i.e. 
-            # why append to list
-            #transcript[marker].append(alltranscript[i][marker])
-            # changed to be the same as Prot
-            transcript[marker] = alltranscript[i][marker]
-            return
-    return
+    results = db.sql('''
+        select max(_Marker_key) as maxKey
+        from (select _Marker_key, ntile(%s) over (order by _Marker_key) as tile
+              from finalannot) p
+        group by tile
+        order by tile
+        ''' % (partitions), 'auto')
+
+    # a marker may be at the end of two ntiles : its partition is the first
+    partitionBounds = []
+    for r in results[:-1]:
+        if not partitionBounds or r['maxKey'] > partitionBounds[-1]:
+            partitionBounds.append(r['maxKey'])
+
+def openPartition(offset = None):
+    # Purpose: open the bcp file of partition 'partitionIndex'
+    # Returns: Nothing
+    # Assumes: partitioned()
+    # Effects: sets outBCP, bcpWriter; creates (or, resuming at
+    #          'offset', truncates) a file
+    # Throws: Nothing
 
-def determineSeq(seqList, 	# list of dictionaries
-                getLongest,     # boolean, determine longest if True, else shortest
-                useUniq): 	# boolean, consider uniq only if True
-    # Purpose: Find the longest or shortest sequence given a dictionary like:
-    #          [{UNIQ:True/False, SEQKEY:key, LENGTH:length}, ...]
-    # Returns: tuple (seqKey, length) where sequence key is the longest/shortest
-    #          uniq/notuniq depending on value of 'getLongest' and 'useUniq',
-    #          else both members of the tuple are 0
+    global outBCP, bcpWriter
+
+    fileName = seqcachelib.partitionFileName(bcpFileName, partitionIndex)
+    if offset is None:
+        outBCP = open(fileName, 'w')
+    else:
+        outBCP = openResumed(fileName, offset)
+    bcpWriter = seqcachebcp.Writer(outBCP, seqcachebcp.SEQ_Marker_Cache)
+
+def nextPartition(markerKey = None):
+    # Purpose: close the bcp file of the current partition and open the
+    #          next, until the partition of 'markerKey' (None : the last)
+    # Returns: Nothing
+    # Assumes: partitioned(); the rows are written in _Marker_key order
+    # Effects: closes and creates files
+    # Throws: Nothing
+
+    global partitionIndex
+
+    while partitionIndex < partitions:
+        # partition i has the markers up to partitionBounds[i - 1];
+        # the one after the last bound has the rest
+        if markerKey is not None and (partitionIndex > len(partitionBounds) \
+                or markerKey <= partitionBounds[partitionIndex - 1]):
+            break
+        bcpWriter.flush()
+        stats.close(outBCP)
+        partitionIndex = partitionIndex + 1
+        openPartition()
+
+def readCheckpoint():
+    # Purpose: read checkpointFileName
+    # Returns: dictionary {'lastMarkerKey', 'nextMaxKey', 'offset',
+    #          'partitions', 'partition' : integer, 'bounds' : list of
+    #          integers, 'runDate' : string}; None if there is no checkpoint
     # Assumes: Nothing
+    # Effects: reads a file
     # Throws: Nothing
-    #
 
-    # current choice considering only uniq sequences
-    # based on value of getLongest
+    if not os.path.exists(checkpointFileName):
+        return None
 
-    # a non-numeric default
-    currUniqLen = ''
-    currUniqSeqKey = 0
+    checkpoint = {}
+    fp = open(checkpointFileName, 'r')
+    for line in fp.readlines():
+        name, value = line.rstrip('\n').split(DL, 1)
+        checkpoint[name] = value
+    fp.close()
 
-    # current choice considering all sequences based on value of getLongest
-    currAllLen = ''
-    currAllSeqKey = 0
+    for name in ('lastMarkerKey', 'nextMaxKey', 'offset', 'partitions', 'partition'):
+        checkpoint[name] = int(checkpoint[name])
+    checkpoint['bounds'] = [int(b) for b in checkpoint['bounds'].split(',') if b]
 
-    if debug == 'true':
-        print('getLongest: %s, useUniq: %s' % (getLongest, useUniq))
-
-    for seq in seqList:
-
-        # if we are looking for the longest sequence
-        if getLongest == True:
-             # current choice from the uniq set only
-            if seq[UNIQ] == True:
-                l = determineLongest(currUniqLen, seq[LENGTH])
-                # if seq[LENGTH] is longest or equal
-                if l == 1 or l == -1:
-                    currUniqLen = seq[LENGTH]
-                    currUniqSeqKey = seq[SEQKEY]
-            # current choice from the full set 
-            l = determineLongest(currAllLen, seq[LENGTH])
-            # if seq[LENGTH] is longest or equal
-            if l == 1 or l == -1:
-                currAllLen = seq[LENGTH]
-                currAllSeqKey = seq[SEQKEY]
-
-        # if we are looking for the shortest sequence
-        else:
-            if seq[UNIQ] == True:
-                l = determineShortest(currUniqLen, seq[LENGTH])
-                # if seq[LENGTH] is shortest or equal
-                if l == 1  or l == -1:
-                    currUniqLen = seq[LENGTH]
-                    currUniqSeqKey = seq[SEQKEY]
-            # current choice from the full set
-            l = determineShortest(currAllLen, seq[LENGTH])
-            # if seq[LENGTH] is shortest or equal
-            if l == 1  or l == -1:
-                currAllLen = seq[LENGTH]
-                currAllSeqKey = seq[SEQKEY]
-   
-    if useUniq == True:
-        return (currUniqSeqKey, currUniqLen)
-    else:
-        return (currAllSeqKey, currAllLen)
+    return checkpoint
 
-def determineLongest (len1, len2): # integer sequence length
-    # Purpose: determine the longest length
-    # Returns: 0 if len1 longest, 1 if len2, -1 for tie
-    # Assumes: Nothing
+def writeCheckpoint(lastMarkerKey):
+    # Purpose: record that the rows of the markers up to 'lastMarkerKey'
+    #          are in the bcp file (partitions : in the files up to the
+    #          current one)
+    # Returns: Nothing
+    # Assumes: the rows are written in _Marker_key order; all rows of
+    #          'lastMarkerKey' have been written
+    # Effects: writes the bcp file to disk; writes checkpointFileName
+    #          (through a temporary file)
     # Throws: Nothing
 
-    # first comparison for a given seq set, one value will be the default of '' 
-    if len1 == '':
-        return 1
-    elif len2 == '':
-        return 0
-    # 2nd - n comparisons both will be integers
-    if len1 == len2:
-        return -1
-    elif  len1 > len2:
-        return 0
-    else:
-        return 1
-
-def determineShortest (len1, len2): # integer sequence length
-    # Purpose: determine the shortest length
-    # Returns:  0 if len1 shortest, 1 if len2, -1 for tie
-    # Assumes: Nothing
+    bcpWriter.flush()
+    outBCP.flush()
+    os.fsync(outBCP.fileno())
+
+    tmpName = checkpointFileName + '.tmp'
+    fp = open(tmpName, 'w')
+    for name, value in (('lastMarkerKey', lastMarkerKey),
+                        ('nextMaxKey', nextMaxKey),
+                        ('offset', outBCP.tell()),
+                        ('partitions', numberOfFiles()),
+                        ('partition', partitionIndex),
+                        ('bounds', ','.join([str(b) for b in partitionBounds])),
+                        ('runDate', runDate)):
+        fp.write('%s%s%s\n' % (name, DL, value))
+    fp.close()
+    os.replace(tmpName, checkpointFileName)
+
+def createDeltaMarkers():
+    # Purpose: incremental mode; create temp table 'deltaMarkers' of the
+    #          markers whose SEQ_Marker_Cache rows must be recomputed
+    #          and load the _Cache_key of their existing rows
+    # Returns: Nothing
+    # Assumes: init() has created temp table 'allSeqs'
+    # Effects: queries a database, creates temp tables
     # Throws: Nothing
 
-    # first comparison for a given seq set, one value will be the default of ''
-    if len1 == '':
-        return 1
-    elif len2 == '':
-        return 0
-    # 2nd - n comparisons both will be integers
-    if len1 == len2:
-        return -1
-    elif  len1 < len2:
-        return 0
-    else:
-        return 1
+    global nextMaxKey, cacheKeyLookup
+
+    fp = open(lastRunFileName, 'r')
+    lastRunDate = fp.readline().strip()
+    fp.close()
+
+    print('Determining markers changed since %s ...%s' % (lastRunDate, mgi_utils.date()))
+
+    # marker accessions/references and markers/feature types
+    stats.sql('temp table creation', '''
+        select a._Object_key as _Marker_key
+        INTO TEMPORARY TABLE changedMarkers
+        from %s a
+        where a._MGIType_key = 2
+        and a._LogicalDB_key != 1
+        and a.modification_date >= '%s'
+        union
+        select a._Object_key
+        from %s r, %s a
+        where r.modification_date >= '%s'
+        and r._Accession_key = a._Accession_key
+        and a._MGIType_key = 2
+        and a._LogicalDB_key != 1
+        union
+        select _Marker_key
+        from MRK_Marker
+        where modification_date >= '%s'
+        union
+        select _Marker_key
+        from MRK_MCV_Cache
+        where modification_date >= '%s'
+        ''' % (seqcachelib.snapshotTable('ACC_Accession'), lastRunDate,
+               seqcachelib.snapshotTable('ACC_AccessionReference'),
+               seqcachelib.snapshotTable('ACC_Accession'),
+               lastRunDate, lastRunDate, lastRunDate))
+
+    # sequences, sequence accessions, gene models and the
+    # genomic/transcript/protein associations
+    stats.sql('temp table creation', '''
+        select _Sequence_key
+        INTO TEMPORARY TABLE changedSeqs
+        from SEQ_Sequence
+        where modification_date >= '%s'
+        union
+        select _Sequence_key
+        from SEQ_GeneModel
+        where modification_date >= '%s'
+        union
+        select _Object_key
+        from %s
+        where _MGIType_key = 19
+        and modification_date >= '%s'
+        union
+        select _Sequence_key_1
+        from SEQ_Sequence_Assoc
+        where modification_date >= '%s'
+        union
+        select _Sequence_key_2
+        from SEQ_Sequence_Assoc
+        where modification_date >= '%s'
+        ''' % (lastRunDate, lastRunDate, seqcachelib.snapshotTable('ACC_Accession'),
+               lastRunDate, lastRunDate, lastRunDate))
+
+    # the transcript a changed polypeptide is translated from; the next
+    # insert follows it to its genomic sequence
+    db.sql('''
+        insert into changedSeqs
+        select sa._Sequence_key_2
+        from changedSeqs s, SEQ_Sequence_Assoc sa
+        where s._Sequence_key = sa._Sequence_key_1
+        and sa._Qualifier_key = %s
+        ''' % (TRANSLATED_FROM_KEY), None)
+
+    # the genomic sequence a changed transcript is transcribed from
+    db.sql('''
+        insert into changedSeqs
+        select sa._Sequence_key_2
+        from changedSeqs s, SEQ_Sequence_Assoc sa
+        where s._Sequence_key = sa._Sequence_key_1
+        and sa._Qualifier_key = %s
+        ''' % (TRANSCRIBED_FROM_KEY), None)
+    stats.sql('index creation', 'create index idx_cs1 on changedSeqs (_Sequence_key)')
+
+    # markers of changed sequences; as they were and as they are now
+    db.sql('''
+        insert into changedMarkers
+        select c._Marker_key
+        from changedSeqs s, SEQ_Marker_Cache c
+        where s._Sequence_key = c._Sequence_key
+        union
+        select m._Object_key
+        from changedSeqs s, %s sa, %s m
+        where s._Sequence_key = sa._Object_key
+        and sa._MGIType_key = 19
+        and m._MGIType_key = 2
+        and m._LogicalDB_key = sa._LogicalDB_key
+        and %s = %s
+        ''' % (seqcachelib.accessionTable(), seqcachelib.accessionTable(),
+               seqcachelib.lowerAccID('m'), seqcachelib.lowerAccID('sa')), None)
+
+    # markers with cache rows whose marker accession, reference or
+    # sequence accession has been deleted (a delete leaves no
+    # modification_date); by key, without matching the accession ids :
+    #   a cached sequence has no accession in the row's logical db
+    #   a marker has fewer accessions in a logical db than it has
+    #     cached sequences in it (each sequence matched one of them;
+    #     an accession added in its place is found by changedMarkers)
+    #   a cached reference is not a reference of any of the marker's
+    #     accessions in the row's logical db
+    db.sql('''
+        insert into changedMarkers
+        select c._Marker_key
+        from SEQ_Marker_Cache c
+        where not exists (select 1 from %s s
+            where s._Object_key = c._Sequence_key
+            and s._MGIType_key = 19
+            and s._LogicalDB_key = c._LogicalDB_key
+            )
+        union
+        select c._Marker_key
+        from (select _Marker_key, _LogicalDB_key, count(distinct _Sequence_key) as seqCount
+            from SEQ_Marker_Cache
+            group by _Marker_key, _LogicalDB_key) c
+        left outer join (select _Object_key, _LogicalDB_key, count(*) as accCount
+            from %s
+            where _MGIType_key = 2
+            group by _Object_key, _LogicalDB_key) a
+        on (a._Object_key = c._Marker_key and a._LogicalDB_key = c._LogicalDB_key)
+        where coalesce(a.accCount, 0) < c.seqCount
+        union
+        select c._Marker_key
+        from (select distinct _Marker_key, _LogicalDB_key, _Refs_key
+            from SEQ_Marker_Cache) c
+        where not exists (select 1 from %s a, %s r
+            where a._Object_key = c._Marker_key
+            and a._MGIType_key = 2
+            and a._LogicalDB_key = c._LogicalDB_key
+            and a._Accession_key = r._Accession_key
+            and r._Refs_key = c._Refs_key
+            )
+        ''' % (seqcachelib.accessionTable(), seqcachelib.accessionTable(),
+               seqcachelib.accessionTable(), seqcachelib.snapshotTable('ACC_AccessionReference')), None)
+    stats.sql('index creation', 'create index idx_cm1 on changedMarkers (_Marker_key)')
+
+    # the representative genomic sequence depends on whether a genomic
+    # sequence is associated with only one marker, so markers that share
+    # a genomic sequence with a changed marker must be recomputed as well
+    stats.sql('temp table creation', '''
+        select _Marker_key
+        INTO TEMPORARY TABLE deltaMarkers
+        from changedMarkers
+        union
+        select c2._Marker_key
+        from changedMarkers m, SEQ_Marker_Cache c1, SEQ_Marker_Cache c2
+        where m._Marker_key = c1._Marker_key
+        and c1._LogicalDB_key in (59, 60, 9, 222, 223)
+        and c1._Sequence_key = c2._Sequence_key
+        union
+        select a2._Object_key
+        from changedMarkers m, %s a1, allSeqs s, %s a2
+        where m._Marker_key = a1._Object_key
+        and a1._MGIType_key = 2
+        and a1._LogicalDB_key in (59, 60, 9, 222, 223)
+        and %s = lower(s.seqID)
+        and lower(s.seqID) = %s
+        and a2._MGIType_key = 2
+        and a2._LogicalDB_key in (59, 60, 9, 222, 223)
+        ''' % (seqcachelib.accessionTable(), seqcachelib.accessionTable(),
+               seqcachelib.lowerAccID('a1'), seqcachelib.lowerAccID('a2')))
+    stats.sql('index creation', 'create index idx_dm1 on deltaMarkers (_Marker_key)')
+
+    results = db.sql('select count(*) as deltaCount from deltaMarkers', 'auto')
+    print('Markers to recompute: %s' % (results[0]['deltaCount']))
+
+    #
+    # the rows being replaced keep their _Cache_key;
+    # new rows are numbered from max(_Cache_key) + 1
+    #
+    results = db.sql('select max(_Cache_key) as maxKey from %s' % (table), 'auto')
+    if results[0]['maxKey'] is not None:
+        nextMaxKey = results[0]['maxKey']
+
+    results = db.sql('''
+        select c._Cache_key, c._Sequence_key, c._Marker_key, c._Refs_key
+        from %s c, deltaMarkers d
+        where c._Marker_key = d._Marker_key
+        ''' % (table), 'auto')
+    for r in results:
+        cacheKeyLookup[(r['_Sequence_key'], r['_Marker_key'], r['_Refs_key'])] = r['_Cache_key']
+
+    return
+
+def applyDelta():
+    # Purpose: incremental mode; replaces the SEQ_Marker_Cache rows of
+    #          the markers in 'deltaMarkers' with the rows in the bcp file
+    # Returns: Nothing
+    # Assumes: the bcp file has been written and closed
+    # Effects: deletes from SEQ_Marker_Cache and loads the bcp file into
+    #          it with COPY, in one transaction
+    # Throws: psycopg2.Error
+    #
+    # The COPY needs a connect() connection, which cannot see the temp
+    # table 'deltaMarkers'; the delete is run on that connection too, with
+    # the marker keys as a parameter, so both are in one transaction.
+
+    phase = stats.phase('delta apply')
+    phase.begin()
+
+    markerKeys = [r['_Marker_key'] for r in db.sql('select _Marker_key from deltaMarkers', 'auto')]
+
+    connection = seqcachelib.connect()
+    try:
+        cursor = connection.cursor()
+        cursor.execute('delete from %s.%s where _Marker_key = any(%%s)' \
+                % (seqcachelib.schema, table), (markerKeys,))
+        inFile = open(bcpFileName, 'r')
+        rowCount = seqcachelib.copyIn(cursor, table, inFile)
+        inFile.close()
+        connection.commit()
+    finally:
+        connection.close()
+
+    phase.rowsIn = rowCount
+    phase.rowsOut = rowCount
+    phase.end()
+
+    return
+
+def writeError(sKey, lKey, rawBiotype):
+    print('No equivalency set for sequenceKey: %s, ldbKey: %s, rawBiotype: %s' % (sKey, lKey, rawBiotype))
 
 def generateBiotypeLookups():
     # Purpose: create lookups for use in determining biotype conflicts
@@ -1138,14 +1091,9 @@ def generateBiotypeLookups():
 
     global biotypeLookup
 
-    # non-coding RNA gene feature types and its descendents
-    ncRNAdescSet = set([])
-
-    # all feature types descendents
-    allFeatureTypesDescSet = set([])
-
-    # other genome feature descendents
-    otherGenomeFeatureDescSet = set([])
+    # the feature type DAG; the sets of feature types below are
+    # its bitmasks (seqlookup.ClosureLookup)
+    closure = seqlookup.ClosureLookup()
 
     # map mcv feature type terms from the VOC_Term table to their keys
     mcvTermToKeyDict = {}
@@ -1155,13 +1103,13 @@ def generateBiotypeLookups():
     featureTypesDict = {}
 
     # raw featureTypes translated to marker type 'pseudogene'
-    pseudogeneRawFeatureTypeList  = []
+    pseudogeneRawFeatureTypeSet = set()
 
     # raw featureTypes translated to marker type 'gene'
-    geneRawFeatureTypeList = []
+    geneRawFeatureTypeSet = set()
 
     # provider raw biotypes mapped to their set of equivalent terms
-    # equivalency dicts look like {rawTerm:[listOfEquivalentTermKeys], ...}
+    # equivalency dicts look like {rawTerm:mask of equivalentTermKeys, ...}
     NCBIEquivDict = {}
     EnsEquivDict = {}
     EnsRegEquivDict = {}
@@ -1171,63 +1119,40 @@ def generateBiotypeLookups():
     yesConflict = 5420767
     noConflict = 5420769
 
+    # the distinct (conflictType, rawBiotype) values of biotypeLookup
+    biotypeValues = {}
+
     print('Initializing Biotype Lookups ... %s' % (mgi_utils.date()))
 
     #
-    # create set of non-coding RNA gene and its descendent terms
+    # the whole feature type (MCV) DAG, in one query
     #
-    nonCodingRNAGeneTermKey = 6238162
-    
     results = db.sql('''
-            select t.term as descTerm, c._AncestorObject_key, c._DescendentObject_key
+            select c._AncestorObject_key, c._DescendentObject_key
             from DAG_Closure c, VOC_Term t
             where c._DAG_key = 9
                 and c._MGIType_key = 13
-                and _AncestorObject_key = %s
                 and c._DescendentObject_key = t._Term_key
             order by  c._AncestorObject_key, c._DescendentObject_key
-            ''' % nonCodingRNAGeneTermKey, 'auto')
-    # add the term itself
-    ncRNAdescSet.add(nonCodingRNAGeneTermKey)
-    # add the term 'gene' - C4AM/Build 38
-    ncRNAdescSet.add('gene')
-
+            ''', 'auto')
     for r in results:
-        ncRNAdescSet.add(r['_DescendentObject_key'])
+        closure.add(r['_AncestorObject_key'], r['_DescendentObject_key'])
 
-    #
-    # create set of all feature types descendent terms
-    #
+    nonCodingRNAGeneTermKey = 6238162
     allFeatureTypesTermKey = 6238159
+    otherGenomeFeatureTermKey = 6238178
 
-    results = db.sql('''
-            select t.term as descTerm, c._AncestorObject_key, c._DescendentObject_key
-            from DAG_Closure c, VOC_Term t
-            where c._DAG_key = 9
-                and c._MGIType_key = 13
-                and _AncestorObject_key = %s
-                and c._DescendentObject_key = t._Term_key
-            order by  c._AncestorObject_key, c._DescendentObject_key
-            ''' % allFeatureTypesTermKey, 'auto')
-    for r in results:
-        allFeatureTypesDescSet.add(r['_DescendentObject_key'])
+    # non-coding RNA gene feature types and its descendents
+    # add the term itself
+    # add the term 'gene' - C4AM/Build 38
+    ncRNAdescMask = closure.descendents(nonCodingRNAGeneTermKey) | \
+            closure.mask([nonCodingRNAGeneTermKey, 'gene'])
 
-    #
-    # create set of other genome feature descendent terms
-    #
-    otherGenomeFeatureTermKey = 6238178
+    # all feature types descendents
+    allFeatureTypesDescMask = closure.descendents(allFeatureTypesTermKey)
 
-    results = db.sql('''
-            select t.term as descTerm, c._AncestorObject_key, c._DescendentObject_key
-            from DAG_Closure c, VOC_Term t
-            where c._DAG_key = 9
-                and c._MGIType_key = 13
-                and _AncestorObject_key = %s
-                and c._DescendentObject_key = t._Term_key
-            order by  c._AncestorObject_key, c._DescendentObject_key
-            ''' % otherGenomeFeatureTermKey, 'auto')
-    for r in results:
-        otherGenomeFeatureDescSet.add(r['_DescendentObject_key'])
+    # other genome feature descendents
+    otherGenomeFeatureDescMask = closure.descendents(otherGenomeFeatureTermKey)
 
     #
     # map all feature type terms to their keys
@@ -1237,30 +1162,19 @@ def generateBiotypeLookups():
         mcvTermToKeyDict[r['term']] = r['_Term_key']
 
     #
-    # create list of all raw biotypes mapping to marker type 'pseudogene'
-    #
-    results = db.sql('''
-                select distinct lower(t.term) as term
-                from MRK_BiotypeMapping m, VOC_Term t
-                where m._biotypeterm_key = t._Term_key
-                and m._Marker_Type_key = 7
-                order by term
-                ''', 'auto')
-    for r in results:
-        pseudogeneRawFeatureTypeList.append(r['term'])
-
-    #
-    # create list of all raw biotypes mapping to marker type 'gene'
+    # the raw biotypes mapping to marker type 'pseudogene' (7) and 'gene' (1)
     #
     results = db.sql('''
-                select distinct lower(t.term) as term
+                select distinct m._Marker_Type_key, lower(t.term) as term
                 from MRK_BiotypeMapping m, VOC_Term t
                 where m._biotypeterm_key = t._Term_key
-                and m._Marker_Type_key = 1
-                order by term
+                and m._Marker_Type_key in (1, 7)
                 ''', 'auto')
     for r in results:
-        geneRawFeatureTypeList.append(r['term'])
+        if r['_Marker_Type_key'] == 7:
+            pseudogeneRawFeatureTypeSet.add(r['term'])
+        else:
+            geneRawFeatureTypeSet.add(r['term'])
 
     #
     # create NCBI, Ensembl Lookups 
@@ -1277,84 +1191,76 @@ def generateBiotypeLookups():
     # one raw biotype maps to only 1 marker type
     #
 
-    for v in [103,104,175,176]:
-
-        print('Initializing %s raw biotype to equivalency mapping ... %s' % (v, mgi_utils.date()))
+    print('Initializing raw biotype to equivalency mapping ... %s' % (mgi_utils.date()))
 
-        # select all distinct raw-biotype terms
-        rawresults = db.sql('''
-                select distinct m._biotypeterm_key, lower(t.term) as rawTerm, m.useMCVchildren
-                from MRK_BiotypeMapping m, VOC_Term t
-                where m._biotypevocab_key = t._vocab_key
-                and t._vocab_key = %s
-                and m._biotypeterm_key = t._Term_key
-                order by rawTerm
-                ''' % (v), 'auto')
-
-        for r in rawresults:
-
-                # equivalency for given raw biotype
-                equivList = []
+    # the mcvterms of every raw-biotype term of the four vocabularies
+    results = db.sql('''
+            select m._biotypeterm_key, lower(t1.term) as mcvterm
+            from MRK_BiotypeMapping m, VOC_Term t, VOC_Term t1
+            where m._biotypeterm_key = t._Term_key
+            and t._vocab_key in (103,104,175,176)
+            and m._mcvterm_key = t1._Term_key
+            order by m._biotypeterm_key, mcvterm
+            ''', 'auto')
+    mcvTermsByRawKey = {}
+    for r in results:
+        mcvTermsByRawKey.setdefault(r['_biotypeterm_key'], []).append(r['mcvterm'])
 
-                rawKey = r['_biotypeterm_key']
-                rawTerm = r['rawTerm']
-                useMCVchildren = r['useMCVchildren']
+    # all distinct raw-biotype terms
+    rawresults = db.sql('''
+            select distinct t._vocab_key, m._biotypeterm_key, lower(t.term) as rawTerm, m.useMCVchildren
+            from MRK_BiotypeMapping m, VOC_Term t
+            where m._biotypevocab_key = t._vocab_key
+            and t._vocab_key in (103,104,175,176)
+            and m._biotypeterm_key = t._Term_key
+            order by t._vocab_key, rawTerm
+            ''', 'auto')
 
-                # select all mcvterms for this raw-biotype term
-                mcvresults = db.sql('''
-                        select lower(t1.term) as mcvterm
-                        from MRK_BiotypeMapping m, VOC_Term t1
-                        where m._biotypeterm_key = %s
-                        and m._mcvterm_key = t1._Term_key
-                        order by mcvterm
-                        '''% (rawKey), 'auto')
+    equivDicts = {103 : EnsEquivDict, 104 : NCBIEquivDict,
+                  176 : EnsRegEquivDict, 175 : VistaRegEquivDict}
 
-                # append extra mcvterms to this raw-biotype term
-                for m in mcvresults:
-                        equivList.append(m['mcvterm'])
+    for r in rawresults:
 
-                        if rawTerm in pseudogeneRawFeatureTypeList:
-                                equivList.append('pseudogenic region')
-        
-                        elif rawTerm in geneRawFeatureTypeList:
-                                equivList.append('gene')
+            v = r['_vocab_key']
+            rawTerm = r['rawTerm']
+            useMCVchildren = r['useMCVchildren']
 
-                equivKeySet = set()
+            # equivalency for given raw biotype
+            equivList = []
 
-                for e in equivList:
+            # append extra mcvterms to this raw-biotype term
+            for mcvterm in mcvTermsByRawKey.get(r['_biotypeterm_key'], []):
+                    equivList.append(mcvterm)
 
-                        # consider all children
-                        if e == 'all feature types':
-                                print('biotype conflicts : allFeatureTypesDescSet')
-                                equivKeySet = equivKeySet.union(allFeatureTypesDescSet)
+                    if rawTerm in pseudogeneRawFeatureTypeSet:
+                            equivList.append('pseudogenic region')
+    
+                    elif rawTerm in geneRawFeatureTypeSet:
+                            equivList.append('gene')
 
-                        # consider all children
-                        elif e == 'non-coding rna gene' and useMCVchildren == 1:
-                                print('biotype conflicts : ncRNAdescSet')
-                                equivKeySet = equivKeySet.union(ncRNAdescSet)
+            equivKeyMask = 0
 
-                        # consider all children
-                        elif e == 'other genome feature' and useMCVchildren == 1:
-                                print('biotype conflicts : otherGenomeFeatureDescSet')
-                                equivKeySet = equivKeySet.union(otherGenomeFeatureDescSet)
+            for e in equivList:
 
-                        elif e in mcvTermToKeyDict:
-                                equivKeySet.add(mcvTermToKeyDict[e])
+                    # consider all children
+                    if e == 'all feature types':
+                            equivKeyMask = equivKeyMask | allFeatureTypesDescMask
 
-                        else:
-                                sys.exit('%s equivalency term does not resolve: %s' % (v, e))
+                    # consider all children
+                    elif e == 'non-coding rna gene' and useMCVchildren == 1:
+                            equivKeyMask = equivKeyMask | ncRNAdescMask
 
-                if v == 103:
-                        EnsEquivDict[rawTerm] = equivKeySet
+                    # consider all children
+                    elif e == 'other genome feature' and useMCVchildren == 1:
+                            equivKeyMask = equivKeyMask | otherGenomeFeatureDescMask
 
-                elif v == 104:
-                        NCBIEquivDict[rawTerm] = equivKeySet
+                    elif e in mcvTermToKeyDict:
+                            equivKeyMask = equivKeyMask | closure.bit(mcvTermToKeyDict[e])
 
-                elif v == 176:
-                        EnsRegEquivDict[rawTerm] = equivKeySet
+                    else:
+                            sys.exit('%s equivalency term does not resolve: %s' % (v, e))
 
-                elif v == 175:
-                        VistaRegEquivDict[rawTerm] = equivKeySet
+            equivDicts[v][rawTerm] = equivKeyMask
 
     if debug == 'true':
         print(len(NCBIEquivDict))
@@ -1371,13 +1277,13 @@ def generateBiotypeLookups():
 
     results = db.sql('''
          select s._Sequence_key, a._Object_key as _Marker_key, a._LogicalDB_key, g.rawBiotype
-         from gm s, ACC_Accession a, SEQ_GeneModel g
+         from gm s, %s a, SEQ_GeneModel g
          where a._MGIType_key = 2
          and a._LogicalDB_key in (59, 60, 222, 223)
-         and lower(s.seqID) = lower(a.accid)
+         and lower(s.seqID) = %s
          and s._Sequence_key = g._Sequence_key
          order by s._Sequence_key
-         ''', 'auto')
+         ''' % (seqcachelib.accessionTable(), seqcachelib.lowerAccID('a')), 'auto')
 
     for r in results:
         markerKey = r['_Marker_key']
@@ -1386,31 +1292,31 @@ def generateBiotypeLookups():
         rawBiotype = r['rawBiotype']
         if rawBiotype == None:
             rawBiotype = 'null'
-        currentEquivSet = set()
+        currentEquivMask = 0
 
         # equivalencies are in lower case, so compare with lower biotype
         lowerRawBiotype = str.lower(rawBiotype)
         if ldbKey == 59:
             if lowerRawBiotype in NCBIEquivDict:
-                currentEquivSet =  NCBIEquivDict[lowerRawBiotype]
+                currentEquivMask = NCBIEquivDict[lowerRawBiotype]
             else:
                 writeError(sequenceKey, ldbKey, rawBiotype)
                 continue
         elif ldbKey ==  60: 
             if lowerRawBiotype in EnsEquivDict:
-                currentEquivSet = EnsEquivDict[lowerRawBiotype]
+                currentEquivMask = EnsEquivDict[lowerRawBiotype]
             else: 
                 writeError(sequenceKey, ldbKey, rawBiotype)
                 continue
         elif ldbKey ==  222: 
             if lowerRawBiotype in EnsRegEquivDict:
-                currentEquivSet = EnsRegEquivDict[lowerRawBiotype]
+                currentEquivMask = EnsRegEquivDict[lowerRawBiotype]
             else: 
                 writeError(sequenceKey, ldbKey, rawBiotype)
                 continue
         elif ldbKey ==  223: 
             if lowerRawBiotype in VistaRegEquivDict:
-                currentEquivSet = VistaRegEquivDict[lowerRawBiotype]
+                currentEquivMask = VistaRegEquivDict[lowerRawBiotype]
             else: 
                 writeError(sequenceKey, ldbKey, rawBiotype)
                 continue
@@ -1423,7 +1329,7 @@ def generateBiotypeLookups():
         gm.sequenceKey = sequenceKey
         gm.ldbKey = ldbKey
         gm.rawBiotype = rawBiotype
-        gm.equivalentBiotypeSet = currentEquivSet
+        gm.equivalentBiotypeMask = currentEquivMask
         if markerKey not in markerToGMDict:
              markerToGMDict[markerKey] = []
         markerToGMDict[markerKey].append(gm)
@@ -1446,56 +1352,44 @@ def generateBiotypeLookups():
             featureTypesDict[key] = []
         featureTypesDict[key].append(value)
 
-    # now iterate through the MRK_MCV_Cache markers
+    # now iterate through the MRK_MCV_Cache markers that have gene models
     print('Iterating through all markers in MRK_MCV_Cache to determine conflicts ... %s' % (mgi_utils.date()))
-    markerKeys = list(featureTypesDict.keys())
+    markerKeys = [m for m in featureTypesDict if m in markerToGMDict]
     markerKeys.sort()
 
     for markerKey in markerKeys:
         # default conflict type
         conflictType = noConflict
 
-        # get the list of MGI feature types for the current marker
-        mkrFeatureTypeSet = set(featureTypesDict[markerKey])
-
-        equivalencyList = []
-        first = True
-        gmIntersectSet = set()
-
-        if markerKey in markerToGMDict:
-            for gm in markerToGMDict[markerKey]:
-                s = gm.equivalentBiotypeSet
-                if first == True:
-                    gmIntersectSet = s
-                    first = False
-                else:
-                    gmIntersectSet = gmIntersectSet.intersection(s)
-        else:
-             # No gene models, we can move on to the next marker
-             continue
-        
+        gms = markerToGMDict[markerKey]
+        gmIntersectMask = gms[0].equivalentBiotypeMask
+        for gm in gms[1:]:
+            gmIntersectMask = gmIntersectMask & gm.equivalentBiotypeMask
+
         # there are gene models so check for conflict
         # if the gene model set is empty that means conflicts btwn gene models
-        if len(gmIntersectSet) == 0:
+        if gmIntersectMask == 0:
+            conflictType = yesConflict
+        # otherwise the gene models agree, see if they agree with the
+        # MGI feature types of the marker
+        # (a feature type without a bit is in no equivalency set)
+        elif seqlookup.bitCount(gmIntersectMask & closure.known(featureTypesDict[markerKey])) != 1:
             conflictType = yesConflict
-        # otherwise the gene models agree, see if they agree with the marker
-        else:
-            finalIntersectSet = mkrFeatureTypeSet.intersection(gmIntersectSet)
-
-            if len(finalIntersectSet) != 1:
-                conflictType = yesConflict
 
         # now re-iterate thru the marker/sequences
         # and set the conflict key and raw biotype
         # all sequences for a given marker get the same conflict key value
-        if markerKey in markerToGMDict:
-            for gm in markerToGMDict[markerKey]:
-                rawBiotype = gm.rawBiotype
-                sequenceKey = gm.sequenceKey
-                key = '%s:%s' % (markerKey, sequenceKey)
-                value = [conflictType, rawBiotype]
-                if key not in biotypeLookup:
-                    biotypeLookup[key] = value
+        # (conflictType, rawBiotype) values are shared between keys
+        for gm in gms:
+            key = seqlookup.packKey(markerKey, gm.sequenceKey)
+            value = (conflictType, gm.rawBiotype)
+            value = biotypeValues.setdefault(value, value)
+            if key not in biotypeLookup:
+                biotypeLookup[key] = value
+
+    # the gene models are only needed to build biotypeLookup
+    markerToGMDict.clear()
+
     return
 
 def writeRecord(r):
@@ -1507,61 +1401,247 @@ def writeRecord(r):
 
     global nextMaxKey
 
-    nextMaxKey = nextMaxKey + 1
+    # incremental mode : a replaced row keeps its _Cache_key
+    cacheKey = cacheKeyLookup.pop((r['_Sequence_key'], r['_Marker_key'], r['_Refs_key']), None)
+    if cacheKey is None:
+        nextMaxKey = nextMaxKey + 1
+        cacheKey = nextMaxKey
 
-    outBCP.write(
-        str(nextMaxKey) + DL + \
-        mgi_utils.prvalue(r['_Sequence_key']) + DL + \
-        mgi_utils.prvalue(r['_Marker_key']) + DL + \
-        mgi_utils.prvalue(r['_Organism_key']) + DL + \
-        mgi_utils.prvalue(r['_Refs_key']) + DL)
+    bcpWriter.write((cacheKey, r['_Sequence_key'], r['_Marker_key'],
+        r['_Organism_key'], r['_Refs_key'], r['_Qualifier_key'],
+        r['_SequenceProvider_key'], r['_SequenceType_key'],
+        r['_LogicalDB_key'], r['_Marker_Type_key'], r['_BiotypeConflict_key'],
+        r['accID'], r['rawbiotype'], r['mdate'], r['_User_key'], r['_User_key'],
+        loaddate, loaddate))
 
-    printedQualifier = 0
+    return
 
-    if r['_Marker_key'] in genomic:
-        if genomic[r['_Marker_key']] == r['_Sequence_key']:
-            outBCP.write(mgi_utils.prvalue(qualByTermLookup['genomic']) + DL)
-            printedQualifier = 1
+def createQualifierTables():
+    # Purpose: create the tables of the representative sequence
+    #          qualifier (repSeqsTable) and the biotype conflict/raw biotype
+    #          (biotypesTable) of each marker/sequence, for the final query
+    # Returns: Nothing
+    # Assumes: createBCP() has selected the representative sequences;
+    #          generateBiotypeLookups() has been run
+    # Effects: creates (replaces) unlogged tables, loads them with COPY
+    # Throws: psycopg2.Error
+
+    # one qualifier per marker/sequence; genomic, then transcript,
+    # then polypeptide
+    qualifiers = {}
+    for lookup, term in ((polypeptide, 'polypeptide'),
+                         (transcript, 'transcript'),
+                         (genomic, 'genomic')):
+        qualKey = qualByTermLookup[term]
+        for markerKey, seqKey in lookup.items():
+            qualifiers[(markerKey, seqKey)] = qualKey
+
+    connection = seqcachelib.connect()
+    try:
+        cursor = connection.cursor()
+        for workTable in (REPSEQS, BIOTYPES):
+            cursor.execute('drop table if exists %s.%s' % (seqcachelib.schema, workTable.name))
+        cursor.execute('''create unlogged table %s.%s 
+            (_Marker_key int not null, _Sequence_key int not null, _Qualifier_key int not null)
+            ''' % (seqcachelib.schema, repSeqsTable))
+        cursor.execute('''create unlogged table %s.%s 
+            (_Marker_key int not null, _Sequence_key int not null, 
+             _BiotypeConflict_key int not null, rawbiotype text)
+            ''' % (seqcachelib.schema, biotypesTable))
+        connection.commit()
+    finally:
+        connection.close()
+
+    with stats.phase('temp table creation', verbose = False) as phase:
+        for workTable, rows in ((REPSEQS, [(m, s, q) for (m, s), q in qualifiers.items()]),
+                (BIOTYPES, [seqlookup.unpackKey(key) + (conflictType, rawBiotype)
+                            for key, (conflictType, rawBiotype) in biotypeLookup.items()])):
+            output = seqcachelib.CopyWriter(workTable.name)
+            writer = seqcachebcp.Writer(output, workTable)
+            writer.writeRows(rows)
+            writer.flush()
+            output.close()
+            phase.rowsOut = phase.rowsOut + writer.rowCount
+
+    # the rows were committed on the COPY connections
+    db.commit()
+    stats.sql('index creation', 'create index %s_idx on %s (_Marker_key, _Sequence_key)' \
+            % (repSeqsTable, repSeqsTable))
+    stats.sql('index creation', 'create index %s_idx on %s (_Marker_key, _Sequence_key)' \
+            % (biotypesTable, biotypesTable))
+    db.sql('analyze %s' % (repSeqsTable), None)
+    db.sql('analyze %s' % (biotypesTable), None)
+    db.commit()
+
+def markerChunks(results, phase):
+    # Purpose: group the deriveQuality rows by marker, 'workerChunkSize'
+    #          markers at a time
+    # Returns: generator of lists of (marker, [(seqKey, length, genomicIndex,
+    #          transcriptTier, polypeptideTier), ...]) as in
+    #          seqmarker_repseq.Candidates.addClassified(); rows that are
+    #          not candidates are left out
+    # Assumes: 'results' is ordered by _Marker_key
+    # Effects: counts the rows in phase.rowsIn
+    # Throws: Nothing
 
-    if r['_Marker_key'] in transcript:
-        # used to be transcript[markerKey] used to be a list of one now just seqKey
-        if r['_Sequence_key'] == transcript[r['_Marker_key']]:
-            outBCP.write(mgi_utils.prvalue(qualByTermLookup['transcript']) + DL)
-            printedQualifier = 1
+    chunk = []
+    prevMarker = None
+    rows = None
+    rowCount = 0
 
-    if r['_Marker_key'] in polypeptide:
-        if polypeptide[r['_Marker_key']] == r['_Sequence_key']:
-            outBCP.write(mgi_utils.prvalue(qualByTermLookup['polypeptide']) + DL)
-            printedQualifier = 1
+    for r in results:
+        rowCount = rowCount + 1
+        m = r['_Marker_key']
 
-    if not printedQualifier:
-        outBCP.write(mgi_utils.prvalue(qualByTermLookup['Not Specified']) + DL)
+        if m != prevMarker:
+            if len(chunk) == workerChunkSize:
+                yield chunk
+                chunk = []
+            rows = []
+            chunk.append((m, rows))
+            prevMarker = m
+
+        (genomicIndex, transcriptTier, polypeptideTier) = seqmarker_repseq.classify(
+                r['_SequenceProvider_key'], r['_SequenceType_key'], r['accID'])
+        if genomicIndex != 0 or transcriptTier >= 0 or polypeptideTier >= 0:
+            rows.append((r['_Sequence_key'], r['length'], genomicIndex, transcriptTier, polypeptideTier))
+
+    if chunk:
+        yield chunk
+
+    phase.rowsIn = phase.rowsIn + rowCount
+
+def tieredQuery():
+    # Purpose: the deriveQuality candidates classified in the database:
+    #          seqmarker_repseq.classify() as case expressions, and only
+    #          the longest transcript/polypeptide per marker per tier
+    #          (row_number() over the marker and tier)
+    # Returns: string; a select of _Marker_key, _Sequence_key, length,
+    #          genomicIndex, transcriptTier, polypeptideTier, ordered
+    #          by _Marker_key
+    # Assumes: temp table deriveQuality
+    # Effects: Nothing
+    # Throws: Nothing
 
-    #
-    # get the biotype information from biotypeLookup
-    # use defaults if there is no biotype record for this marker/sequence
-    #
-    biotypeKey = '%s:%s' % (r['_Marker_key'], r['_Sequence_key'])
-    if biotypeKey in biotypeLookup:
-        biotypeConflict = biotypeLookup[biotypeKey][0]
-        biotypeRaw = biotypeLookup[biotypeKey][1]
-    else:
-        biotypeConflict = biotypeDefaultConflict
-        biotypeRaw = None
-
-    outBCP.write(mgi_utils.prvalue(r['_SequenceProvider_key']) + DL + \
-        mgi_utils.prvalue(r['_SequenceType_key']) + DL + \
-        mgi_utils.prvalue(r['_LogicalDB_key']) + DL + \
-        mgi_utils.prvalue(r['_Marker_Type_key']) + DL + \
-        mgi_utils.prvalue(biotypeConflict) + DL + \
-        r['accID'] + DL + \
-        mgi_utils.prvalue(biotypeRaw) + DL + \
-        r['mdate'] + DL + \
-        mgi_utils.prvalue(r['_User_key']) + DL + \
-        mgi_utils.prvalue(r['_User_key']) + DL + \
-        loaddate + DL + loaddate + NL)
+    genbankDNA = ','.join(map(str, seqmarker_repseq.GENBANK_DNA_PROVIDERS))
+    genbankRNA = ','.join(map(str, seqmarker_repseq.GENBANK_RNA_PROVIDERS))
+    refseq = seqmarker_repseq.REFSEQ_PROVIDER
+
+    return '''
+        select _Marker_key, _Sequence_key, length, genomicIndex, transcriptTier, polypeptideTier
+        from (
+            select _Marker_key, _Sequence_key, _SequenceProvider_key, length, genomicIndex,
+                case when transcriptTier >= 0 and row_number() over (partition by _Marker_key, transcriptTier
+                        order by coalesce(length, 0) desc, _SequenceProvider_key, _Sequence_key) = 1
+                     then transcriptTier else -1 end as transcriptTier,
+                case when polypeptideTier >= 0 and row_number() over (partition by _Marker_key, polypeptideTier
+                        order by coalesce(length, 0) desc, _SequenceProvider_key, _Sequence_key) = 1
+                     then polypeptideTier else -1 end as polypeptideTier
+            from (
+                select q._Marker_key, q._Sequence_key, s._SequenceProvider_key, s.length,
+                    case when s._SequenceProvider_key = 615429 then %d
+                         when s._SequenceProvider_key = 706915 then %d
+                         when s._SequenceProvider_key in (%s) and s._SequenceType_key = 316347 then %d
+                         when s._SequenceProvider_key = 102032586 then %d
+                         when s._SequenceProvider_key = 102032585 then %d
+                         else 0 end as genomicIndex,
+                    case when s._SequenceProvider_key = %d and (strpos(q.accID, 'NM_') > 0 or strpos(q.accID, 'NR_') > 0) then 0
+                         when s._SequenceProvider_key in (%s) and s._SequenceType_key = 316346 then 1
+                         when s._SequenceProvider_key = %d and (strpos(q.accID, 'XM_') > 0 or strpos(q.accID, 'XR_') > 0) then 2
+                         when s._SequenceProvider_key = 316376 and s._SequenceType_key = 316346 then 3
+                         else -1 end as transcriptTier,
+                    case when s._SequenceProvider_key = 316384 then 0
+                         when s._SequenceProvider_key = %d and strpos(q.accID, 'NP_') > 0 then 1
+                         when s._SequenceProvider_key = 316385 then 2
+                         when s._SequenceProvider_key = %d and strpos(q.accID, 'XP_') > 0 then 3
+                         else -1 end as polypeptideTier
+                from deriveQuality q, SEQ_Sequence s 
+                where q._Sequence_key = s._Sequence_key 
+                and s._SequenceStatus_key != 316343 
+            ) c
+        ) t
+        where genomicIndex != 0 or transcriptTier >= 0 or polypeptideTier >= 0
+        order by _Marker_key, _SequenceProvider_key, _Sequence_key
+        ''' % (seqmarker_repseq.ENSEMBL, seqmarker_repseq.NCBI, genbankDNA,
+             seqmarker_repseq.gGENBANK, seqmarker_repseq.ENSEMBLR, seqmarker_repseq.VISTA,
+             refseq, genbankRNA, refseq, refseq, refseq)
+
+def tieredChunks(results, phase):
+    # Purpose: markerChunks() for the rows of tieredQuery(), which are
+    #          classified and reduced to the candidates already
+    # Returns: generator of lists as markerChunks()
+    # Assumes: 'results' is ordered by _Marker_key
+    # Effects: counts the rows in phase.rowsIn
+    # Throws: Nothing
 
-    return
+    chunk = []
+    prevMarker = None
+    rows = None
+    rowCount = 0
+
+    for r in results:
+        rowCount = rowCount + 1
+        m = r['_Marker_key']
+
+        if m != prevMarker:
+            if len(chunk) == workerChunkSize:
+                yield chunk
+                chunk = []
+            rows = []
+            chunk.append((m, rows))
+            prevMarker = m
+
+        rows.append((r['_Sequence_key'], r['length'], r['genomicIndex'],
+                r['transcriptTier'], r['polypeptideTier']))
+
+    if chunk:
+        yield chunk
+
+    phase.rowsIn = phase.rowsIn + rowCount
+
+def columnarChunks(results, phase):
+    # Purpose: markerChunks(), classifying the rows with numpy
+    #          (see seqmarker_columnar.py)
+    # Returns: generator of lists as markerChunks()
+    # Assumes: 'results' is ordered by _Marker_key and has the
+    #          seqmarker_columnar.COLUMNS
+    # Effects: counts the rows in phase.rowsIn
+    # Throws: Nothing
+
+    columns = seqmarker_columnar.fetch(results, seqcachelib.batchSize)
+    phase.rowsIn = phase.rowsIn + len(columns['_Marker_key'])
+    return seqmarker_columnar.markerChunks(columns, workerChunkSize)
+
+def selectRepresentatives(chunk):
+    # Purpose: Determines representative genomic, transcript, and protein
+    #          for each marker of 'chunk' (see seqmarker_repseq.py)
+    # Returns: [(marker, genomicKey, transcriptKey, polypeptideKey), ...];
+    #          a key is 0 if there is none
+    # Assumes: the lookups have been loaded (init); runs in this process
+    #          or in a worker process forked after init
+    # Effects: Nothing
+    # Throws: seqmarker_repseq.RepresentativeError
+
+    candidates = seqmarker_repseq.Candidates()
+    selected = []
+
+    for marker, rows in chunk:
+
+        if debug == 'true':
+            print('determineRep for marker: %s' % marker)
+
+        for row in rows:
+            candidates.addClassified(*row)
+
+        (genomicKey, transcriptKey, polypeptideKey, case) = \
+            seqmarker_repseq.determineRepresentative(candidates,
+                mkrsByGenomicSeqKeyLookup, transcriptLookupByGenomicKey,
+                proteinLookupByGenomicKey, transcriptLookupByProteinKey,
+                debug == 'true')
+        selected.append((marker, genomicKey, transcriptKey, polypeptideKey))
+        candidates.clear()
+
+    return selected
 
 def createBCP():
     # Purpose: Iterates through result set of sequence marker pairs
@@ -1573,8 +1653,7 @@ def createBCP():
     # Effects: queries a database, writes records to a file
     # Throws: Nothing
 
-    global allgenomic, alltranscript, allpolypeptide
-    global outBCP
+    global outBCP, partitionBounds, partitionIndex
 
     print('Processing ...%s' % (mgi_utils.date()))
 
@@ -1585,35 +1664,47 @@ def createBCP():
     #
     # with non-reserved marker status 
     #
-    db.sql('''
+    # incremental mode : only the markers in 'deltaMarkers'
+    # resume : only the markers after the checkpoint
+    #
+    if mode == 'incremental':
+        deltaWhere = 'and _Marker_key in (select _Marker_key from deltaMarkers)'
+    elif resumeCheckpoint is not None:
+        deltaWhere = 'and _Marker_key > %s' % (resumeCheckpoint['lastMarkerKey'])
+    else:
+        deltaWhere = ''
+
+    stats.sql('temp table creation', '''
         select _Marker_key, _Organism_key, _Marker_Type_key 
         INTO TEMPORARY TABLE markers 
         from MRK_Marker 
         where _Organism_key in (1, 2, 40, 10, 13, 11, 63, 84, 94, 95) 
         and _Marker_Status_key in (1,2)
-        ''', None)
-    db.sql('create index idx_key on markers (_Marker_key)', None)
+        %s
+        ''' % (deltaWhere))
+    stats.sql('index creation', 'create index idx_key on markers (_Marker_key)')
 
     # select all non-MGI accession ids for markers 
 
-    db.sql('''
+    stats.sql('temp table creation', '''
         select m._Marker_key, m._Organism_key, m._Marker_Type_key, 
                a._LogicalDB_key, a.accID, r._Refs_key, a._ModifiedBy_key, 
                to_char( a.modification_date, 'MM/dd/yyyy') as mdate 
         INTO TEMPORARY TABLE markerAccs 
-        from markers m, ACC_Accession a, ACC_AccessionReference r 
+        from markers m, %s a, %s r 
         where m._Marker_key = a._Object_key 
         and a._MGIType_key = 2 
         and a._LogicalDB_key != 1 
         and a._Accession_key = r._Accession_key
-        ''', None)
+        ''' % (seqcachelib.snapshotTable('ACC_Accession'),
+               seqcachelib.snapshotTable('ACC_AccessionReference')))
 
-    db.sql('create index idx5 on markerAccs (_LogicalDB_key, accID)', None)
-    db.sql('create index idx6 on markerAccs (lower(accID))', None)
+    stats.sql('index creation', 'create index idx5 on markerAccs (_LogicalDB_key, accID)')
+    stats.sql('index creation', 'create index idx6 on markerAccs (lower(accID))')
 
     # select all sequence annotations
     
-    db.sql('''
+    stats.sql('temp table creation', '''
         select s._Object_key as _Sequence_key, 
                 m._Marker_key, m._Organism_key, 
                 m._Marker_Type_key, 
@@ -1621,17 +1712,17 @@ def createBCP():
                 m._Refs_key, m._ModifiedBy_key as _User_key, 
                 m.mdate, m.accID 
         INTO TEMPORARY TABLE preallannot 
-        from markerAccs m, ACC_Accession s 
-        where lower(m.accID) = lower(s.accID) 
+        from markerAccs m, %s s 
+        where lower(m.accID) = %s 
         and m._LogicalDB_key = s._LogicalDB_key 
         and s._MGIType_key = 19 
-        ''', None)
+        ''' % (seqcachelib.accessionTable(), seqcachelib.lowerAccID('s')))
 
-    db.sql('create index idx7 on preallannot (_Sequence_key)', None)
+    stats.sql('index creation', 'create index idx7 on preallannot (_Sequence_key)')
 
     # get the sequence provider and sequence type
 
-    db.sql('''
+    stats.sql('temp table creation', '''
         select m._Sequence_key, m._Marker_key, m._Organism_key, 
                 m._Marker_Type_key, ss._SequenceProvider_key, 
                 ss._SequenceType_key, 
@@ -1639,19 +1730,19 @@ def createBCP():
         INTO TEMPORARY TABLE allannot 
         from preallannot m, SEQ_Sequence ss 
         where m._Sequence_key = ss._Sequence_key
-        ''', None)
+        ''')
 
-    db.sql('create index idx8 on allannot (_Sequence_key)', None)
+    stats.sql('index creation', 'create index idx8 on allannot (_Sequence_key)')
 
     # grab sequence's primary accID
 
-    db.sql('''
+    stats.sql('temp table creation', '''
         select a._Sequence_key, a._Marker_key, a._Organism_key, 
                 a._Marker_Type_key, a._SequenceProvider_key, 
                 a._SequenceType_key, a._LogicalDB_key, 
                 a._Refs_key, a._User_key, a.mdate, upper(ac.accID) accID 
         INTO TEMPORARY TABLE allseqannot 
-        from allannot a, ACC_Accession ac 
+        from allannot a, %s ac 
         where a._Sequence_key = ac._Object_key 
         and ac._MGIType_key = 19 
         and ac._Logicaldb_key not in (223)
@@ -1661,17 +1752,17 @@ def createBCP():
                 a._Marker_Type_key, a._SequenceProvider_key, 
                 a._SequenceType_key, a._LogicalDB_key, 
                 a._Refs_key, a._User_key, a.mdate, ac.accID accID 
-        from allannot a, ACC_Accession ac 
+        from allannot a, %s ac 
         where a._Sequence_key = ac._Object_key 
         and ac._MGIType_key = 19 
         and ac._Logicaldb_key in (223)
         and ac.preferred = 1
-        ''', None)
+        ''' % (seqcachelib.snapshotTable('ACC_Accession'), seqcachelib.snapshotTable('ACC_Accession')))
 
-    db.sql('create index idx9 on allseqannot (_Sequence_key, _Marker_key, _Refs_key)', None)
+    stats.sql('index creation', 'create index idx9 on allseqannot (_Sequence_key, _Marker_key, _Refs_key)')
 
     # select records, grouping by sequence, marker and reference
-    db.sql('''
+    stats.sql('temp table creation', '''
         select _Sequence_key, _Marker_key, _Organism_key, 
                 _Marker_Type_key, _SequenceProvider_key, _SequenceType_key, 
                 _LogicalDB_key, _Refs_key, _User_key, max(mdate) as mdate, accID 
@@ -1679,168 +1770,162 @@ def createBCP():
         from allseqannot 
         group by _Sequence_key, _Marker_key, _Refs_key, _organism_Key, _marker_type_key, _sequenceprovider_key,
                 _sequencetype_key, _logicaldb_key, _user_key, accID
-        ''', None)
-    db.sql('create index idx10 on finalannot (_Sequence_key, _Marker_key, _Refs_key, _User_key, mdate)', None)
-    db.sql('create index idx11 on finalannot (_Sequence_key, _Marker_key, _Marker_Type_key, accID)', None)
-    db.sql('create index idx12 on finalannot (_Marker_key)', None)
+        ''')
+    stats.sql('index creation', 'create index idx10 on finalannot (_Sequence_key, _Marker_key, _Refs_key, _User_key, mdate)')
+    stats.sql('index creation', 'create index idx11 on finalannot (_Sequence_key, _Marker_key, _Marker_Type_key, accID)')
+    stats.sql('index creation', 'create index idx12 on finalannot (_Marker_key)')
 
-    db.sql('''
+    stats.sql('temp table creation', '''
         select distinct _Sequence_key, _Marker_key, _Marker_Type_key, accID
         INTO TEMPORARY TABLE deriveQuality
         from finalannot order by _Marker_key
-        ''', None)
-    db.sql('create index idx13 on deriveQuality (_Sequence_key)', None)
-    db.sql('create index idx14 on deriveQuality (_Marker_key)', None)
+        ''')
+    stats.sql('index creation', 'create index idx13 on deriveQuality (_Sequence_key)')
+    stats.sql('index creation', 'create index idx14 on deriveQuality (_Marker_key)')
 
     # do not include deleted sequences
-    results = db.sql('''
-        select q._Sequence_key, q._Marker_key, 
-                q._Marker_Type_key, q.accID, s._SequenceProvider_key, 
-                s._SequenceType_key, s.length 
-        from deriveQuality q, SEQ_Sequence s 
-        where q._Sequence_key = s._Sequence_key 
-        and s._SequenceStatus_key != 316343 
-        order by q._Marker_key, s._SequenceProvider_key
-        ''', 'auto')
+    phase = stats.phase('representative selection')
+    phase.begin()
 
-    # process derived representative values
-    prevMarker = ''
+    # sqltiers : classified and reduced to the candidates by the query
+    # columnar : the RefSeq accID prefixes are classified by the query
+    if sqlTiers != 'true' and columnar == 'true' and seqmarker_columnar.numpy is None:
+        print('SEQMARKER_COLUMNAR : numpy is not available; classifying row by row')
 
-    for r in results:
-        m = r['_Marker_key']
-        s = r['_Sequence_key']
-        a = r['accID']
-        if r['length'] is None:
-            seqlength = 0
+    if sqlTiers == 'true':
+        query = tieredQuery()
+        chunks = tieredChunks
+    else:
+        if columnar == 'true' and seqmarker_columnar.numpy is not None:
+            accColumns = seqmarker_columnar.classColumns('q.accID')
+            lengthColumn = 'coalesce(s.length, -1)'
+            chunks = columnarChunks
         else:
-            seqlength = int(r['length'])
-
-        providerKey = r['_SequenceProvider_key']
-        seqTypeKey = r['_SequenceType_key']
-        # lengths for transcript and polypeptide, we do genomic differently
-        if prevMarker != m:
-            tlengths = [-1,-1,-1,-1,-1,-1,-1]
-            plengths = [-1,-1,-1,-1]
-
-            if prevMarker != '':
-                determineRepresentative(prevMarker)
-
-        # Ensembl
-        if providerKey in [615429]:
-            if m in allgenomic[ENSEMBL]:
-                allgenomic[ENSEMBL][m].append(r)
-            else:
-                allgenomic[ENSEMBL][m] = [r]
-
-        # NCBI
-        elif providerKey in [706915]:
-            if m in allgenomic[NCBI]:
-                allgenomic[NCBI][m].append(r)
-            else:
-                allgenomic[NCBI][m] = [r]
-
-        # any GenBank; DNA
-        # these are all GenBank provider terms by division
-        # e.g. "GenBank/EMBL/DDBJ:Rodent" or "GenBank/EMBL/DDBJ:GSS"
-        elif providerKey in [316380,316376,316379,316375,316377,316374,316373,316378,492451,29320966] and seqTypeKey == 316347:
-            if m in allgenomic[gGENBANK]:
-                allgenomic[gGENBANK][m].append(r)
-            else:
-                allgenomic[gGENBANK][m] = [r]
-
-        # Ensembl_R
-        elif providerKey in [102032586]:
-            if m in allgenomic[ENSEMBLR]:
-                allgenomic[ENSEMBLR][m].append(r)
-            else:
-                allgenomic[ENSEMBLR][m] = [r]
+            accColumns = 'q.accID'
+            lengthColumn = 's.length'
+            chunks = markerChunks
+
+        query = '''
+            select q._Sequence_key, q._Marker_key, 
+                    q._Marker_Type_key, %s, s._SequenceProvider_key, 
+                    s._SequenceType_key, %s as length 
+            from deriveQuality q, SEQ_Sequence s 
+            where q._Sequence_key = s._Sequence_key 
+            and s._SequenceStatus_key != 316343 
+            order by q._Marker_key, s._SequenceProvider_key, s._Sequence_key
+            ''' % (accColumns, lengthColumn)
+
+    results = seqcachelib.streamRows(query, 'deriveQualityCursor')
 
-        # VISTA
-        elif providerKey in [102032585]:
-            if m in allgenomic[VISTA]:
-                allgenomic[VISTA][m].append(r)
-            else:
-                allgenomic[VISTA][m] = [r]
-
-        #
-        # representative transcript
-        #
-        # longest NM_ or NR_ RefSeq
-        # longest non-EST GenBank
-        # longest XM_ or XR_ RefSeq
-        # longest EST GenBank
-        #
-
-        # RefSeq
-        if providerKey in [316372] and (str.find(a, 'NM_') > -1 or str.find(a, 'NR_') > -1):
-            if seqlength > tlengths[0]:
-                alltranscript[0][m] = s
-                tlengths[0] = seqlength
-
-        # GenBank but not EST; RNA
-        elif providerKey in [316380,316379,316375,316377,316374,316373,316378,492451] and seqTypeKey == 316346:
-            if seqlength > tlengths[1]:
-                alltranscript[1][m] = s
-                tlengths[1] = seqlength
-
-        # RefSeq
-        elif providerKey in [316372] and (str.find(a, 'XM_') > -1 or str.find(a, 'XR_') > -1):
-            if seqlength > tlengths[2]:
-                alltranscript[2][m] = s
-                tlengths[2] = seqlength
-
-        # GenBank EST; RNA
-        elif providerKey in [316376] and seqTypeKey == 316346:
-            if seqlength > tlengths[6]:
-                alltranscript[3][m] = s
-                tlengths[6] = seqlength
-
-        #
-        # representative polypeptide
-        #
-        # longest SWISS-PROT
-        # longest NP_ RefSeq
-        # longest TrEMBL
-        # longest XP_ RefSeq
-        #
-
-        # SwissProt
-        if providerKey == 316384 and seqlength > plengths[0]:
-            allpolypeptide[0][m] = s
-            plengths[0] = seqlength
-
-        # RefSeq
-        elif providerKey == 316372 and str.find(a, 'NP_') > -1 and seqlength > plengths[1]:
-            allpolypeptide[1][m] = s
-            plengths[1] = seqlength
-
-        # TrEMBL
-        elif providerKey == 316385 and seqlength > plengths[2]:
-            allpolypeptide[2][m] = s
-            plengths[2] = seqlength
-
-        # RefSeq
-        elif providerKey == 316372 and str.find(a, 'XP_') > -1 and seqlength > plengths[3]:
-            allpolypeptide[3][m] = s
-            plengths[3] = seqlength
-
-        prevMarker = m
-
-    # last record
-    determineRepresentative(prevMarker)
-
-    print('Writing bcp file ...%s' % (mgi_utils.date()))
-    results = db.sql('''
-        select distinct _Sequence_key, _Marker_key,
-                _Organism_key, _Marker_Type_key, _SequenceProvider_key,
-                _SequenceType_key, _LogicalDB_key, _Refs_key,
-                _User_key, mdate, accID 
-        from finalannot
-        ''', 'auto')
+    # process derived representative values
+    # a chunk of markers at a time, in this process or in 'workers'
+    # forked processes that share the lookups; the chunks are merged in
+    # stream order, so the result does not depend on the number of workers
+    pool = None
+    if workers > 1 and debug != 'true':
+        print('Selecting representative sequences with %s worker processes' % (workers))
+        pool = multiprocessing.get_context('fork').Pool(workers)
+        selections = pool.imap(selectRepresentatives, chunks(results, phase))
+    else:
+        selections = map(selectRepresentatives, chunks(results, phase))
+
+    try:
+        for selected in selections:
+            for marker, genomicKey, transcriptKey, polypeptideKey in selected:
+                if genomicKey != 0:
+                    genomic[marker] = genomicKey
+                if transcriptKey != 0:
+                    transcript[marker] = transcriptKey
+                if polypeptideKey != 0:
+                    polypeptide[marker] = polypeptideKey
+
+    except seqmarker_repseq.RepresentativeError as message:
+        if pool is not None:
+            pool.terminate()
+        print(message)
+        sys.exit(str(message))
+
+    if pool is not None:
+        pool.close()
+        pool.join()
+
+    phase.rowsOut = len(genomic) + len(transcript) + len(polypeptide)
+    phase.end()
+
+    # the representative sequences are chosen as before;
+    # only the bogus PAR rows themselves are not written
+    if parFilter == 'true':
+        print('Removing bogus PAR marker/sequence pairs ...%s' % (mgi_utils.date()))
+        seqcachelib.createParBogus()
+        db.sql('''
+            delete from finalannot
+            using parBogus b
+            where finalannot._Marker_key = b._marker_key
+            and finalannot._Sequence_key = b._sequence_key
+            ''', None)
+
+    createQualifierTables()
+
+    # partitions : the bounds of the run being resumed, as the rows of
+    # the markers before its checkpoint are not in 'finalannot'
+    if partitioned():
+        if resumeCheckpoint is not None:
+            partitionBounds = resumeCheckpoint['bounds']
+            partitionIndex = resumeCheckpoint['partition']
+            openPartition(resumeCheckpoint['offset'])
+        else:
+            createPartitions()
+            partitionIndex = 1
+            openPartition()
+
+    # checkpoints, partitions : one marker at a time, in _Marker_key order
+    markerOrder = checkpointing() or partitioned()
+    if markerOrder:
+        orderBy = 'order by f._Marker_key'
+    else:
+        orderBy = ''
+
+    # the qualifier and biotype columns are joined in;
+    # the defaults if there is no repSeqsTable/biotypesTable row
+    phase = stats.phase('bcp write')
+    phase.begin()
+    results = seqcachelib.streamRows('''
+        select distinct f._Sequence_key, f._Marker_key,
+                f._Organism_key, f._Marker_Type_key, f._SequenceProvider_key,
+                f._SequenceType_key, f._LogicalDB_key, f._Refs_key,
+                f._User_key, f.mdate, f.accID,
+                coalesce(q._Qualifier_key, %s) as _Qualifier_key,
+                coalesce(b._BiotypeConflict_key, %s) as _BiotypeConflict_key,
+                b.rawbiotype
+        from finalannot f
+            left outer join %s q on (f._Marker_key = q._Marker_key
+                and f._Sequence_key = q._Sequence_key)
+            left outer join %s b on (f._Marker_key = b._Marker_key
+                and f._Sequence_key = b._Sequence_key)
+        %s
+        ''' % (qualByTermLookup['Not Specified'], biotypeDefaultConflict,
+               repSeqsTable, biotypesTable, orderBy), 'finalannotCursor')
     
+    rowCount = 0
+    checkpointCount = 0
+    prevMarker = None
+
     # results are ordered by  _Sequence_key, _Marker_key, _Refs_key
     for r in results:
+        if markerOrder and r['_Marker_key'] != prevMarker:
+            # a checkpoint once all rows of the previous marker are written
+            if checkpointing() and rowCount - checkpointCount >= checkpointRows:
+                writeCheckpoint(prevMarker)
+                checkpointCount = rowCount
+            if partitioned():
+                nextPartition(r['_Marker_key'])
+            prevMarker = r['_Marker_key']
         writeRecord(r)
+        rowCount = rowCount + 1
+
+    phase.rowsIn = rowCount
+    phase.rowsOut = rowCount
+    phase.end()
 
     return
 
@@ -1853,23 +1938,70 @@ def finalize():
 
     global outBCP
 
-    db.useOneConnection(0)
-    outBCP.close()
+    # partitions : the files after the last marker are empty
+    if partitioned():
+        nextPartition()
+
+    bcpWriter.flush()
+    stats.close(outBCP)
+
+    if mode == 'incremental':
+        applyDelta()
+
+    # the bcp file is complete
+    if os.path.exists(checkpointFileName):
+        os.remove(checkpointFileName)
+
+    for workTable in (repSeqsTable, biotypesTable):
+        db.sql('drop table if exists %s' % (workTable), None)
+    db.commit()
+
+    seqcachelib.closeConnection()
+
+    # record the date of this run for the next incremental run; it
+    # becomes lastRunFileName when seqmarker.csh has loaded the table
+    fp = open(newLastRunFileName, 'w')
+    fp.write('%s\n' % (runDate))
+    fp.close()
+
+    stats.write()
+
     return
 
+def main():
+    # Purpose: create the SEQ_Marker_Cache bcp file (or its delta)
+    # Returns: Nothing
+    # Assumes: Nothing
+    # Effects: see init(), createDeltaMarkers(), createBCP(), finalize()
+    # Throws: Nothing
+
+    try:
+        init()
+        if mode == 'incremental':
+            createDeltaMarkers()
+        createBCP()
+        finalize()
+    except db.connection_exc as message:
+        error = '%s%s' % (DB_CONNECT_ERROR, message)
+        sys.stderr.write(message)
+        sys.exit(message)
+    except db.error as message:
+        error = '%s%s' % (DB_ERROR, message)
+        sys.stderr.write(message)
+        sys.exit(message)
+
 #
 # Main Routine
 #
-try:
-    init()
-    createBCP()
-    finalize()
-except db.connection_exc as message:
-    error = '%s%s' % (DB_CONNECT_ERROR, message)
-    sys.stderr.write(message)
-    sys.exit(message)
-except db.error as message:
-    error = '%s%s' % (DB_ERROR, message)
-    sys.stderr.write(message)
-    sys.exit(message)
 
+if __name__ == '__main__':
+    try:
+        optlist, args = getopt.getopt(sys.argv[1:], '', ['resume'])
+    except getopt.GetoptError:
+        sys.exit(USAGE)
+
+    if len(args) != 0:
+        sys.exit(USAGE)
+
+    resume = ('--resume', '') in optlist
+    main()
@@ -0,0 +1,188 @@
+#
+# seqmarker_columnar.py
+#####################################################################
+#
+#  Purpose: columnar (numpy) classification of the seqmarker.py
+#	    deriveQuality rows into representative sequence candidates
+#
+#	    The rows are fetched into integer arrays and classified all at
+#	    once (seqmarker_repseq.classify); the longest transcript and
+#	    polypeptide per marker per tier are picked with one sort, so
+#	    that only the genomic candidates and the tier winners are
+#	    handed to the representative sequence algorithm
+#
+#	    The RefSeq accID prefixes are classified by the query
+#	    (see COLUMNS), so no strings are kept
+#
+#  Usage:
+#	import seqmarker_columnar
+#
+#	if seqmarker_columnar.numpy is not None:
+#	    columns = seqmarker_columnar.fetch(results)
+#	    for chunk in seqmarker_columnar.markerChunks(columns, chunkSize): ...
+#
+#  History
+#
+# 10/18/2026
+#	- new
+#
+
+import seqmarker_repseq as repseq
+
+# optional; seqmarker.py falls back to its row by row classification
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# the columns of the rows passed to fetch(), in this order
+#  length : -1 if null
+#  tclass : 1 if accID has NM_ or NR_, 2 if XM_ or XR_, else 0
+#  pclass : 1 if accID has NP_, 2 if XP_, else 0
+COLUMNS = ('_Marker_key', '_Sequence_key', '_SequenceProvider_key',
+        '_SequenceType_key', 'length', 'tclass', 'pclass')
+
+def classColumns(accID):
+    # Purpose: the tclass, pclass select list expressions
+    # Returns: string
+    # Assumes: Nothing
+    # Effects: Nothing
+    # Throws: Nothing
+
+    return '''case when strpos(%s, 'NM_') > 0 or strpos(%s, 'NR_') > 0 then 1
+                     when strpos(%s, 'XM_') > 0 or strpos(%s, 'XR_') > 0 then 2
+                     else 0 end as tclass,
+                case when strpos(%s, 'NP_') > 0 then 1
+                     when strpos(%s, 'XP_') > 0 then 2
+                     else 0 end as pclass''' % ((accID,) * 6)
+
+def fetch(results, batchSize = 50000):
+    # Purpose: read the rows of 'results' into one integer array per column
+    # Returns: dictionary {column:numpy array, ...} (see COLUMNS)
+    # Assumes: numpy is available; 'results' is ordered by _Marker_key
+    # Effects: Nothing
+    # Throws: Nothing
+
+    batches = dict([(c, []) for c in COLUMNS])
+    rows = []
+
+    def flush():
+        for c in COLUMNS:
+            batches[c].append(numpy.fromiter((r[c] for r in rows), numpy.int64, len(rows)))
+        del rows[:]
+
+    for r in results:
+        rows.append(r)
+        if len(rows) == batchSize:
+            flush()
+    flush()
+
+    return dict([(c, numpy.concatenate(batches[c])) for c in COLUMNS])
+
+def classify(columns):
+    # Purpose: vectorised seqmarker_repseq.classify()
+    # Returns: tuple of arrays (genomicIndex, transcriptTier, polypeptideTier)
+    # Assumes: Nothing
+    # Effects: Nothing
+    # Throws: Nothing
+
+    provider = columns['_SequenceProvider_key']
+    seqType = columns['_SequenceType_key']
+    tclass = columns['tclass']
+    pclass = columns['pclass']
+    refseq = provider == repseq.REFSEQ_PROVIDER
+
+    # numpy.select picks the first condition that is true, as the
+    # if/elif chains of seqmarker_repseq.classify() do
+
+    genomicIndex = numpy.select([
+        provider == 615429,
+        provider == 706915,
+        numpy.isin(provider, repseq.GENBANK_DNA_PROVIDERS) & (seqType == 316347),
+        provider == 102032586,
+        provider == 102032585],
+        [repseq.ENSEMBL, repseq.NCBI, repseq.gGENBANK, repseq.ENSEMBLR, repseq.VISTA], 0)
+
+    transcriptTier = numpy.select([
+        refseq & (tclass == 1),
+        numpy.isin(provider, repseq.GENBANK_RNA_PROVIDERS) & (seqType == 316346),
+        refseq & (tclass == 2),
+        (provider == 316376) & (seqType == 316346)],
+        [0, 1, 2, 3], -1)
+
+    polypeptideTier = numpy.select([
+        provider == 316384,
+        refseq & (pclass == 1),
+        provider == 316385,
+        refseq & (pclass == 2)],
+        [0, 1, 2, 3], -1)
+
+    return (genomicIndex, transcriptTier, polypeptideTier)
+
+def tierWinners(marker, tier, seqlength):
+    # Purpose: the longest row per marker per tier; the first one in
+    #          stream order if there is a tie
+    # Returns: boolean array, True for the winning rows
+    # Assumes: 'marker' is in stream order; tier -1 is no tier
+    # Effects: Nothing
+    # Throws: Nothing
+
+    winners = numpy.zeros(len(marker), bool)
+    rows = numpy.flatnonzero(tier >= 0)
+    if len(rows) == 0:
+        return winners
+
+    # by marker, tier, longest first, stream order
+    order = rows[numpy.lexsort((rows, -seqlength[rows], tier[rows], marker[rows]))]
+    first = numpy.ones(len(order), bool)
+    first[1:] = (marker[order][1:] != marker[order][:-1]) | (tier[order][1:] != tier[order][:-1])
+    winners[order[first]] = True
+
+    return winners
+
+def markerChunks(columns, chunkSize):
+    # Purpose: the candidates of each marker, 'chunkSize' markers at a time
+    # Returns: generator of lists of (marker, [(seqKey, length, genomicIndex,
+    #          transcriptTier, polypeptideTier), ...]) as in
+    #          seqmarker_repseq.Candidates.addClassified(); only the
+    #          genomic candidates and the transcript/polypeptide tier
+    #          winners, in stream order; markers without any are left out
+    # Assumes: 'columns' from fetch()
+    # Effects: Nothing
+    # Throws: Nothing
+
+    marker = columns['_Marker_key']
+    length = columns['length']
+    seqlength = numpy.maximum(length, 0)
+
+    (genomicIndex, transcriptTier, polypeptideTier) = classify(columns)
+
+    # non-winning transcripts/polypeptides are not candidates
+    transcriptTier = numpy.where(tierWinners(marker, transcriptTier, seqlength), transcriptTier, -1)
+    polypeptideTier = numpy.where(tierWinners(marker, polypeptideTier, seqlength), polypeptideTier, -1)
+
+    keep = numpy.flatnonzero((genomicIndex != 0) | (transcriptTier >= 0) | (polypeptideTier >= 0))
+
+    marker = marker[keep].tolist()
+    rows = list(zip(columns['_Sequence_key'][keep].tolist(),
+        # the genomic algorithm compares the lengths as stored (null = None)
+        [l if l >= 0 else None for l in length[keep].tolist()],
+        genomicIndex[keep].tolist(),
+        transcriptTier[keep].tolist(),
+        polypeptideTier[keep].tolist()))
+
+    chunk = []
+    prevMarker = None
+
+    for m, row in zip(marker, rows):
+        if m != prevMarker:
+            if len(chunk) == chunkSize:
+                yield chunk
+                chunk = []
+            markerRows = []
+            chunk.append((m, markerRows))
+            prevMarker = m
+        markerRows.append(row)
+
+    if chunk:
+        yield chunk
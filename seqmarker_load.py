@@ -0,0 +1,99 @@
+#
+# seqmarker_load.py
+#####################################################################
+#
+#  Purpose: loads the SEQ_Marker_Cache bcp files written by seqmarker.py
+#	    with SEQMARKER_PARTITIONS=n (SEQ_Marker_Cache.1.bcp ..
+#	    SEQ_Marker_Cache.n.bcp) with COPY FROM STDIN on n connections
+#	    at the same time
+#
+#	    seqmarker.csh truncates the table and drops its indexes
+#	    (${TABLE}_truncate.object, ${TABLE}_drop.object) before, and
+#	    creates them (${TABLE}_create.object) after, this script,
+#	    also if it fails
+#
+#  Usage:
+#	seqmarker_load.py
+#
+#	run by seqmarker.csh in place of bcpin.csh
+#
+#  Env Vars: TABLE, CACHEDATADIR, SEQMARKER_PARTITIONS, STATS, PG_DB_SCHEMA
+#
+#  Inputs: 1) ${CACHEDATADIR}/${TABLE}.<n>.bcp
+#          2) Configuration
+#
+#  Outputs: 1) log file (stdout)
+#           2) table ${TABLE}
+#
+#  Exit Codes: 0 if the files were loaded, else 1
+#
+#  History
+#
+# 10/18/2026
+#	- new
+#	- load the files only; the indexes are dropped and created by
+#	  seqmarker.csh with the ${TABLE}_drop.object/_create.object scripts
+#
+
+import sys
+import os
+import concurrent.futures
+import mgi_utils
+import seqcachelib
+import seqcachestats
+
+table = os.environ['TABLE']
+datadir = os.environ['CACHEDATADIR']
+
+# the number of bcp files; also the number of connections used
+partitions = int(os.environ.get('SEQMARKER_PARTITIONS', '1'))
+
+bcpFileName = '%s/%s.bcp' % (datadir, table)
+
+# per-phase timing and row counts; added to those of seqmarker.py
+stats = seqcachestats.read(os.environ.get('STATS', 'seqmarker'))
+
+def loadFile(fileName):
+    # Purpose: load the bcp file 'fileName' into 'table'
+    # Returns: number of rows
+    # Assumes: runs in a worker thread
+    # Effects: connects to a database, inserts into a table
+    # Throws: psycopg2.Error
+
+    connection = seqcachelib.connect()
+    try:
+        fp = open(fileName, 'r')
+        rowCount = seqcachelib.copyIn(connection.cursor(), table, fp)
+        fp.close()
+        connection.commit()
+    finally:
+        connection.close()
+
+    print('%s : %s rows ...%s' % (fileName, rowCount, mgi_utils.date()))
+    sys.stdout.flush()
+    return rowCount
+
+#
+# Main Routine
+#
+
+print('%s' % mgi_utils.date())
+
+fileNames = []
+for i in range(1, partitions + 1):
+    fileName = seqcachelib.partitionFileName(bcpFileName, i)
+    if os.path.exists(fileName) and os.path.getsize(fileName) > 0:
+        fileNames.append(fileName)
+
+with stats.phase('bulk load %s' % (table)) as loadPhase:
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers = partitions)
+    try:
+        for rowCount in executor.map(loadFile, fileNames):
+            loadPhase.rowsIn = loadPhase.rowsIn + rowCount
+            loadPhase.rowsOut = loadPhase.rowsOut + rowCount
+    finally:
+        executor.shutdown()
+
+stats.write([loadPhase])
+
+print('%s' % mgi_utils.date())
@@ -9,7 +9,9 @@
 #  See for details: 
 #
 #  Usage:
-#	seqmarker_parupdate.py
+#	seqmarker_parupdate.py [--dryrun]
+#
+#	--dryrun : report the rows that would be deleted, delete nothing
 #
 #  Env Vars: Uses environment variables to determine Server and Database
 #
@@ -22,15 +24,21 @@
 #
 #  History
 #
+# 10/18/2026
+#	- one set-based delete (seqcachelib.createParBogus) in one transaction
+#	  instead of a delete + commit per marker/sequence pair; --dryrun
+#
 # 03/24/2023    sc
 #       FL2b project PAR Epic
 #
 
 import sys
 import os
+import getopt
 import mgi_utils
 import loadlib
 import db
+import seqcachelib
 
 db.setTrace()
 
@@ -51,14 +59,15 @@ NL = '\n'
 DB_ERROR = 'A database error occured: '
 DB_CONNECT_ERROR = 'Connection to the database failed: '
 
+USAGE = 'Usage: seqmarker_parupdate.py [--dryrun]'
 
-# Purpose: Initialize db.sql settings, lookups, and file descriptor
+# Purpose: Delete the bogus PAR marker/sequence rows from seq_marker_cache
 # Returns: Nothing
 # Assumes: Nothing
-# Effects: connects to and queries a database
+# Effects: connects to and queries a database, deletes rows
 # Throws: Nothing
 
-def doDeletes():
+def doDeletes(dryRun):
     
     db.useOneConnection(1)
 
@@ -68,45 +77,59 @@ def doDeletes():
     #
     print('Initializing ...%s' % (mgi_utils.date()))
 
-    # join back to the accession table via ID to get marker information for NCBI markers on 'XY', i
-    # get the last char on the symbol as symbolChromosome
-    db.sql(''' select a._object_key as _marker_key, m.symbol as markerSymbol, 
-            UPPER(RIGHT(m.symbol, 1)) as symbolChromosome, m.chromosome as geneticChromosome, gm.*
-        into temporary table ncbi
-        from map_gm_coord_feature_view gm, acc_accession a, mrk_marker m
-        where gm.seqID = a.accID
-        and a._mgitype_key = 2
-        and a._logicaldb_key in (55)
-        and m.chromosome = 'XY' -- genetic
-        and gm.genomicChromosome in ('X', 'Y')
-        and a._object_key = m._marker_key''', None)
-
     # These need to be removed from seq_marker_cache by _marker_key/_sequence_key 
-    results = db.sql('''select _marker_key, _sequence_key 
-        from ncbi
-        where (genomicChromosome = 'Y' and symbolChromosome = 'X')
-        or (genomicChromosome = 'X' and symbolChromosome = 'Y')''', 'auto')
-
-    # Now update seq_marker_cache
-    print('Updating seq_marker_cache')
-    print('len(results): %s' % len(results))
-    for r in results:
-        markerKey = r['_marker_key']
-        sequenceKey = r['_sequence_key']
-        cmd = '''delete from seq_marker_cache
-            where _marker_key = %s
-            and _sequence_key = %s''' % (markerKey, sequenceKey)
-        print(cmd)
-        db.sql(cmd, None)
+    seqcachelib.createParBogus()
+
+    if dryRun:
+        print('Dry run : rows that would be deleted from seq_marker_cache')
+        results = db.sql('''select c._marker_key, c._sequence_key, count(*) as rowCount
+            from seq_marker_cache c, parBogus b
+            where c._marker_key = b._marker_key
+            and c._sequence_key = b._sequence_key
+            group by c._marker_key, c._sequence_key
+            order by c._marker_key, c._sequence_key''', 'auto')
+    else:
+        # one delete, one transaction
+        print('Updating seq_marker_cache')
+        results = db.sql('''with deleted as (
+                delete from seq_marker_cache c
+                using parBogus b
+                where c._marker_key = b._marker_key
+                and c._sequence_key = b._sequence_key
+                returning c._marker_key, c._sequence_key
+            )
+            select _marker_key, _sequence_key, count(*) as rowCount
+            from deleted
+            group by _marker_key, _sequence_key
+            order by _marker_key, _sequence_key''', 'auto')
         db.commit()
 
+    rowCount = 0
+    for r in results:
+        print('_marker_key = %s, _sequence_key = %s : %s rows' \
+                % (r['_marker_key'], r['_sequence_key'], r['rowCount']))
+        rowCount = rowCount + r['rowCount']
+
+    print('marker/sequence pairs: %s' % len(results))
+    if dryRun:
+        print('rows to delete: %s' % (rowCount))
+    else:
+        print('rows deleted: %s' % (rowCount))
+
     return
 
 #
 # Main Routine
 #
 try:
-    doDeletes()
+    optlist, args = getopt.getopt(sys.argv[1:], '', ['dryrun'])
+except getopt.GetoptError:
+    sys.exit(USAGE)
+
+dryRun = ('--dryrun', '') in optlist
+
+try:
+    doDeletes(dryRun)
     db.useOneConnection(0)
 except db.connection_exc as message:
     error = '%s%s' % (DB_CONNECT_ERROR, message)
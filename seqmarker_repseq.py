@@ -0,0 +1,653 @@
+#
+# seqmarker_repseq.py
+#####################################################################
+#
+#  Purpose: the representative sequence algorithm of seqmarker.py:
+#	    picks the representative genomic, transcript and polypeptide
+#	    sequence of one marker from its candidate sequences
+#
+#	    No database access and no global state: the caller collects
+#	    the candidates of a marker (Candidates.add, one row at a time)
+#	    and passes the SEQ_Sequence_Assoc lookups in
+#
+#  See for details:
+#  http://mgiwiki/mediawiki/index.php/sw:Representative_sequence_algorithm
+#
+#  Usage:
+#	import seqmarker_repseq
+#
+#	candidates = seqmarker_repseq.Candidates()
+#	candidates.add(seqKey, providerKey, seqTypeKey, accID, length)
+#	or
+#	candidates.addClassified(seqKey, length, *classify(providerKey, seqTypeKey, accID))
+#	...
+#	(genomicKey, transcriptKey, polypeptideKey, case) = \
+#		seqmarker_repseq.determineRepresentative(candidates,
+#			mkrsByGenomicSeqKeyLookup, transcriptLookupByGenomicKey,
+#			proteinLookupByGenomicKey, transcriptLookupByProteinKey)
+#	candidates.clear()
+#
+#	a key is 0 if the marker has no representative of that kind;
+#	case is the CASE number (1-35) of the genomic decision
+#
+#	the lookups are seqlookup.GroupedLookup (or anything with
+#	'in', count() and items())
+#
+#  History
+#
+# 10/18/2026
+#	- new; moved from seqmarker.py (determineRepresentative,
+#	  determineVegaEnsProtTransRep, determineNonVegaEnsProtRep,
+#	  determineNonVegaEnsTransRep, determineSeq, determineLongest,
+#	  determineShortest)
+#
+
+# indexes of Candidates.genomic
+ENSEMBL = 1
+NCBI = 2
+gGENBANK = 3
+ENSEMBLR = 4
+VISTA = 5
+
+# genomic sequence provider terms, these are used when the
+# provider is Ensembl, to determine the rep transcript and
+# protein associated with the gene model.
+genbank_prov = 'GENBANK'
+ncbi_prov = 'NCBI'
+ensembl_prov = 'ENSEMBL'
+ensemblr_prov = 'ENSEMBLR'
+vista_prov = 'VISTA'
+
+# indexes of the genomic candidate tuples
+SEQKEY = 0
+LENGTH = 1
+
+# GenBank provider terms by division
+# e.g. "GenBank/EMBL/DDBJ:Rodent" or "GenBank/EMBL/DDBJ:GSS"
+GENBANK_DNA_PROVIDERS = (316380,316376,316379,316375,316377,316374,316373,316378,492451,29320966)
+GENBANK_RNA_PROVIDERS = (316380,316379,316375,316377,316374,316373,316378,492451)
+
+# RefSeq provider; the tier depends on the accID prefix
+REFSEQ_PROVIDER = 316372
+
+class RepresentativeError(Exception):
+    # Raised where the sequence associations contradict the algorithm
+    # (e.g. an Ensembl protein without a transcript)
+    pass
+
+class Candidates:
+    # The candidate sequences of one marker
+    # genomic     : by provider (see indexes); each a list of
+    #               (_Sequence_key, length) tuples, length as stored
+    #               in SEQ_Sequence (may be None)
+    # transcript  : the longest transcript of each tier, 0 if none
+    #               0=RefSeq NR, 1=GenBank RNA, not EST, 2=Refseq XM,
+    #               3=GenBank RNA, EST
+    # polypeptide : the longest polypeptide of each tier, 0 if none
+    #               0=SwissProt, 1=RefSeq NP, 2=TrEMBL, 3=RefSeq XP
+    __slots__ = ('genomic', 'transcript', 'tlengths', 'polypeptide', 'plengths')
+
+    def __init__(self):
+        self.genomic = [[], [], [], [], [], []]
+        self.transcript = [0, 0, 0, 0]
+        self.tlengths = [-1, -1, -1, -1]
+        self.polypeptide = [0, 0, 0, 0]
+        self.plengths = [-1, -1, -1, -1]
+
+    def clear(self):
+        # Purpose: forget the candidates of the previous marker
+        # Returns: Nothing
+        # Assumes: Nothing
+        # Effects: Nothing
+        # Throws: Nothing
+
+        for seqs in self.genomic:
+            del seqs[:]
+        for i in range(4):
+            self.transcript[i] = 0
+            self.tlengths[i] = -1
+            self.polypeptide[i] = 0
+            self.plengths[i] = -1
+
+    def add(self, seqKey, providerKey, seqTypeKey, accID, length):
+        # Purpose: classify one sequence of the marker as genomic,
+        #          transcript and/or polypeptide candidate
+        # Returns: Nothing
+        # Assumes: Nothing
+        # Effects: Nothing
+        # Throws: Nothing
+
+        (genomicIndex, transcriptTier, polypeptideTier) = \
+            classify(providerKey, seqTypeKey, accID)
+        self.addClassified(seqKey, length, genomicIndex, transcriptTier, polypeptideTier)
+
+    def addClassified(self, seqKey, length, genomicIndex, transcriptTier, polypeptideTier):
+        # Purpose: add one sequence of the marker, classified by classify()
+        # Returns: Nothing
+        # Assumes: Nothing
+        # Effects: Nothing
+        # Throws: Nothing
+
+        if genomicIndex != 0:
+            self.genomic[genomicIndex].append((seqKey, length))
+
+        if transcriptTier < 0 and polypeptideTier < 0:
+            return
+
+        if length is None:
+            seqlength = 0
+        else:
+            seqlength = int(length)
+
+        # the longest per tier; the first one if there is a tie
+        if transcriptTier >= 0 and seqlength > self.tlengths[transcriptTier]:
+            self.transcript[transcriptTier] = seqKey
+            self.tlengths[transcriptTier] = seqlength
+
+        if polypeptideTier >= 0 and seqlength > self.plengths[polypeptideTier]:
+            self.polypeptide[polypeptideTier] = seqKey
+            self.plengths[polypeptideTier] = seqlength
+
+def classify(providerKey, seqTypeKey, accID):
+    # Purpose: classify a sequence by provider, sequence type and accID
+    # Returns: tuple (genomicIndex, transcriptTier, polypeptideTier);
+    #          genomicIndex is one of the Candidates.genomic indexes or 0,
+    #          a tier is one of the Candidates.transcript/polypeptide
+    #          indexes or -1
+    # Assumes: Nothing
+    # Effects: Nothing
+    # Throws: Nothing
+
+    genomicIndex = 0
+    transcriptTier = -1
+    polypeptideTier = -1
+
+    # Ensembl
+    if providerKey == 615429:
+        genomicIndex = ENSEMBL
+
+    # NCBI
+    elif providerKey == 706915:
+        genomicIndex = NCBI
+
+    # any GenBank; DNA
+    elif providerKey in GENBANK_DNA_PROVIDERS and seqTypeKey == 316347:
+        genomicIndex = gGENBANK
+
+    # Ensembl_R
+    elif providerKey == 102032586:
+        genomicIndex = ENSEMBLR
+
+    # VISTA
+    elif providerKey == 102032585:
+        genomicIndex = VISTA
+
+    #
+    # representative transcript
+    #
+    # longest NM_ or NR_ RefSeq
+    # longest non-EST GenBank
+    # longest XM_ or XR_ RefSeq
+    # longest EST GenBank
+    #
+
+    # RefSeq
+    if providerKey == REFSEQ_PROVIDER and (accID.find('NM_') > -1 or accID.find('NR_') > -1):
+        transcriptTier = 0
+
+    # GenBank but not EST; RNA
+    elif providerKey in GENBANK_RNA_PROVIDERS and seqTypeKey == 316346:
+        transcriptTier = 1
+
+    # RefSeq
+    elif providerKey == REFSEQ_PROVIDER and (accID.find('XM_') > -1 or accID.find('XR_') > -1):
+        transcriptTier = 2
+
+    # GenBank EST; RNA
+    elif providerKey == 316376 and seqTypeKey == 316346:
+        transcriptTier = 3
+
+    #
+    # representative polypeptide
+    #
+    # longest SWISS-PROT
+    # longest NP_ RefSeq
+    # longest TrEMBL
+    # longest XP_ RefSeq
+    #
+
+    # SwissProt
+    if providerKey == 316384:
+        polypeptideTier = 0
+
+    # RefSeq
+    elif providerKey == REFSEQ_PROVIDER and accID.find('NP_') > -1:
+        polypeptideTier = 1
+
+    # TrEMBL
+    elif providerKey == 316385:
+        polypeptideTier = 2
+
+    # RefSeq
+    elif providerKey == REFSEQ_PROVIDER and accID.find('XP_') > -1:
+        polypeptideTier = 3
+
+    return (genomicIndex, transcriptTier, polypeptideTier)
+
+def determineRepresentative(candidates,
+        mkrsByGenomicSeqKeyLookup,	# seqKey -> markers of the genomic seq
+        transcriptLookupByGenomicKey,	# gKey -> [(tKey, length), ...]
+        proteinLookupByGenomicKey,	# gKey -> [(pKey, length), ...]
+        transcriptLookupByProteinKey,	# pKey -> [(tKey, length), ...]
+        debug = False):			# print the decision
+    # Purpose: Determines representative genomic, transcript, and protein
+    #          for the marker whose candidates are 'candidates'
+    # Returns: tuple (genomicKey, transcriptKey, polypeptideKey, case);
+    #          a key is 0 if there is no representative of that kind
+    # Assumes: Nothing
+    # Effects: prints the decision if 'debug'
+    # Throws: RepresentativeError
+
+    #
+    # Determine Representative Genomic Sequence
+    #
+
+    ##-----------------------------------------------------------------------------
+    # Determine attributes for each provider and provider sequence for this marker
+    ##-----------------------------------------------------------------------------
+
+    # a sequence is uniq if it is associated with only this marker
+    def isUniq(seq):
+        return mkrsByGenomicSeqKeyLookup.count(seq[SEQKEY]) == 1
+
+    ensemblSeqs = candidates.genomic[ENSEMBL]
+    ncbiSeqs = candidates.genomic[NCBI]
+    genbankSeqs = candidates.genomic[gGENBANK]
+    ensemblrSeqs = candidates.genomic[ENSEMBLR]
+    vistaSeqs = candidates.genomic[VISTA]
+
+    # * = Ensembl|NCBI|GenBank|EnsemblR|VISTA
+    # True if this marker has a * sequence
+    hasEnsembl = len(ensemblSeqs) > 0
+    hasNCBI = len(ncbiSeqs) > 0
+    hasEnsemblr = len(ensemblrSeqs) > 0
+    hasVISTA = len(vistaSeqs) > 0
+
+    # True if this marker has only one * id
+    ensemblIsSgl = len(ensemblSeqs) == 1
+    ncbiIsSgl = len(ncbiSeqs) == 1
+    ensemblrIsSgl = len(ensemblrSeqs) == 1
+    vistaIsSgl = len(vistaSeqs) == 1
+
+    # True if this marker has a unique * sequence
+    ensemblHasUniq = any(isUniq(seq) for seq in ensemblSeqs)
+    ncbiHasUniq = any(isUniq(seq) for seq in ncbiSeqs)
+    ensemblrHasUniq = any(isUniq(seq) for seq in ensemblrSeqs)
+    vistaHasUniq = any(isUniq(seq) for seq in vistaSeqs)
+
+    if debug:
+        for name, seqs in (('ensemblseqs', ensemblSeqs), ('ncbiseqs', ncbiSeqs),
+                ('genbankseqs', genbankSeqs), ('ensemblrseqs', ensemblrSeqs),
+                ('vistaseqs', vistaSeqs)):
+            if seqs:
+                print('%s: %s' % (name, [(seq[SEQKEY], seq[LENGTH], isUniq(seq)) for seq in seqs]))
+
+    def pick(seqs, getLongest, useUniq):
+        return determineSeq(seqs, getLongest, useUniq, isUniq, debug)
+
+    #-------------------------------------------------------------------------------------------
+    # Determine representative genomic for marker using provider and provider sequence attributes
+    ##-------------------------------------------------------------------------------------------
+
+    genomicRepKey = 0
+    genomicRepProvider = ''
+    case = 0
+
+    # marker has no GMs
+    if not hasEnsembl and not hasNCBI and not hasEnsemblr and not hasVISTA:
+
+        # is there a longest uniq
+        (s,l) = pick(genbankSeqs, True, True)
+
+        # no sequence found that match parameters if s == 0
+        if s != 0:
+            genomicRepKey, genomicRepProvider, case = s, genbank_prov, 1
+
+        # if no longest uniq get longest
+        else:
+            (s,l) = pick(genbankSeqs, True, False)
+            if s != 0:
+                genomicRepKey, genomicRepProvider, case = s, genbank_prov, 2
+
+        # else NO REPRESENTATIVE SEQUENCE value of genomicRepKey is still 0
+
+    # marker has at least one GM, therefore WILL HAVE REP SEQUENCE
+    else:
+
+        # check single uniq Ensembl, NCBI, EnsemblR, VISTA
+        hasSglUniqEnsembl = ensemblIsSgl and ensemblHasUniq
+        hasSglUniqNCBI = ncbiIsSgl and ncbiHasUniq
+        hasSglUniqEnsemblr = ensemblrIsSgl and ensemblrHasUniq
+        hasSglUniqVISTA = vistaIsSgl and vistaHasUniq
+
+        if hasSglUniqEnsembl and hasSglUniqNCBI:
+            value = determineShortest(ensemblSeqs[0][LENGTH], ncbiSeqs[0][LENGTH])
+            # if ensembl and ncbi length equal or ncbi shorter pick ncbi
+            if value == -1 or value == 1:
+                genomicRepKey, genomicRepProvider, case = ncbiSeqs[0][SEQKEY], ncbi_prov, 3
+            else:
+                genomicRepKey, genomicRepProvider, case = ensemblSeqs[0][SEQKEY], ensembl_prov, 4
+
+        elif hasSglUniqEnsembl:
+            genomicRepKey, genomicRepProvider, case = ensemblSeqs[0][SEQKEY], ensembl_prov, 5
+
+        elif hasSglUniqNCBI:
+            genomicRepKey, genomicRepProvider, case = ncbiSeqs[0][SEQKEY], ncbi_prov, 6
+
+        elif hasSglUniqEnsemblr and hasSglUniqVISTA:
+            value = determineShortest(ensemblrSeqs[0][LENGTH], vistaSeqs[0][LENGTH])
+            # if ensemblr and vista length equal or vista shorter pick vista
+            if value == -1 or value == 1:
+                genomicRepKey, genomicRepProvider, case = vistaSeqs[0][SEQKEY], vista_prov, 7
+            else:
+                genomicRepKey, genomicRepProvider, case = ensemblrSeqs[0][SEQKEY], ensemblr_prov, 8
+
+        elif hasSglUniqEnsemblr:
+            genomicRepKey, genomicRepProvider, case = ensemblrSeqs[0][SEQKEY], ensemblr_prov, 9
+
+        elif hasSglUniqVISTA:
+            genomicRepKey, genomicRepProvider, case = vistaSeqs[0][SEQKEY], vista_prov, 10
+
+        # only multiples (uniq or not) or single not-uniq left
+        elif ensemblHasUniq and ncbiHasUniq:
+            # pick shortest uniq, if tie pick one
+            (s_e, l_e) = pick(ensemblSeqs, False, True)
+            (s_n, l_n) = pick(ncbiSeqs, False, True)
+            value = determineShortest(l_e, l_n)
+            if value == -1 or value == 1:
+                genomicRepKey, genomicRepProvider, case = s_n, ncbi_prov, 11
+            else:
+                genomicRepKey, genomicRepProvider, case = s_e, ensembl_prov, 12
+
+        elif ensemblHasUniq:
+            (s_e, l_e) = pick(ensemblSeqs, False, True)
+            genomicRepKey, genomicRepProvider, case = s_e, ensembl_prov, 13
+
+        elif ncbiHasUniq:
+            (s_n, l_n) = pick(ncbiSeqs, False, True)
+            genomicRepKey, genomicRepProvider, case = s_n, ncbi_prov, 14
+
+        elif ensemblrHasUniq and vistaHasUniq:
+            # pick shortest uniq, if tie pick one
+            (s_er, l_er) = pick(ensemblrSeqs, False, True)
+            (s_v, l_v) = pick(vistaSeqs, False, True)
+            value = determineShortest(l_er, l_v)
+            if value == -1 or value == 1:
+                genomicRepKey, genomicRepProvider, case = s_v, vista_prov, 15
+            else:
+                genomicRepKey, genomicRepProvider, case = s_er, ensemblr_prov, 16
+
+        elif ensemblrHasUniq:
+            (s_er, l_er) = pick(ensemblrSeqs, False, True)
+            genomicRepKey, genomicRepProvider, case = s_er, ensemblr_prov, 17
+
+        elif vistaHasUniq:
+            (s_v, l_v) = pick(vistaSeqs, False, True)
+            genomicRepKey, genomicRepProvider, case = s_v, vista_prov, 18
+
+        # no uniques, only single or multiple non-uniq left
+        # check for ensembl and ncbi sgl
+        elif ensemblIsSgl and ncbiIsSgl:
+            value = determineShortest(ensemblSeqs[0][LENGTH], ncbiSeqs[0][LENGTH])
+            if value == -1 or value == 1:
+                genomicRepKey, genomicRepProvider, case = ncbiSeqs[0][SEQKEY], ncbi_prov, 19
+            else:
+                genomicRepKey, genomicRepProvider, case = ensemblSeqs[0][SEQKEY], ensembl_prov, 20
+
+        elif ensemblIsSgl:
+            genomicRepKey, genomicRepProvider, case = ensemblSeqs[0][SEQKEY], ensembl_prov, 21
+
+        elif ncbiIsSgl:
+            genomicRepKey, genomicRepProvider, case = ncbiSeqs[0][SEQKEY], ncbi_prov, 22
+
+        # check for ensemblr and vista sgl
+        elif ensemblrIsSgl and vistaIsSgl:
+            # NOTE: compares the EnsemblR length with the first NCBI length,
+            # not the VISTA length (cases 7/8 compare with VISTA); kept as
+            # the loaded cache was built this way.  NCBI is multiple
+            # non-uniq or absent here; absent raises IndexError as before
+            value = determineShortest(ensemblrSeqs[0][LENGTH], ncbiSeqs[0][LENGTH])
+            if value == -1 or value == 1:
+                genomicRepKey, genomicRepProvider, case = vistaSeqs[0][SEQKEY], vista_prov, 23
+            else:
+                genomicRepKey, genomicRepProvider, case = ensemblrSeqs[0][SEQKEY], ensemblr_prov, 24
+
+        elif ensemblrIsSgl:
+            genomicRepKey, genomicRepProvider, case = ensemblrSeqs[0][SEQKEY], ensemblr_prov, 25
+
+        elif vistaIsSgl:
+            genomicRepKey, genomicRepProvider, case = vistaSeqs[0][SEQKEY], vista_prov, 26
+
+        # no singles, must be multiple non-uniq
+        elif hasEnsembl and hasNCBI:
+            # pick shortest, NCBI if tie
+            (s_e, l_e) = pick(ensemblSeqs, False, False)
+            (s_n, l_n) = pick(ncbiSeqs, False, False)
+            value = determineShortest(l_e, l_n)
+            if value == -1 or value == 1:
+                genomicRepKey, genomicRepProvider, case = s_n, ncbi_prov, 27
+            else:
+                genomicRepKey, genomicRepProvider, case = s_e, ensembl_prov, 28
+
+        elif hasEnsembl:
+            # pick shortest
+            (s_e, l_e) = pick(ensemblSeqs, False, False)
+            genomicRepKey, genomicRepProvider, case = s_e, ensembl_prov, 29
+
+        elif hasNCBI:
+            # pick shortest
+            (s_n, l_n) = pick(ncbiSeqs, False, False)
+            genomicRepKey, genomicRepProvider, case = s_n, ncbi_prov, 30
+
+        elif hasEnsemblr and hasVISTA:
+            # pick shortest, VISTA if tie
+            (s_er, l_er) = pick(ensemblrSeqs, False, False)
+            (s_v, l_v) = pick(vistaSeqs, False, False)
+            value = determineShortest(l_er, l_v)
+            if value == -1 or value == 1:
+                genomicRepKey, genomicRepProvider, case = s_v, vista_prov, 31
+            else:
+                genomicRepKey, genomicRepProvider, case = s_er, ensemblr_prov, 32
+
+        elif hasEnsemblr:
+            # pick shortest
+            (s_er, l_er) = pick(ensemblrSeqs, False, False)
+            genomicRepKey, genomicRepProvider, case = s_er, ensemblr_prov, 33
+
+        elif hasVISTA:
+            # pick shortest
+            (s_v, l_v) = pick(vistaSeqs, False, False)
+            genomicRepKey, genomicRepProvider, case = s_v, vista_prov, 34
+
+    if genomicRepKey == 0:
+        case = 35
+
+    if debug:
+        print('CASE %s' % case)
+        print('genomicRepKey: %s' % genomicRepKey)
+        print('genomicRepProvider: %s' % genomicRepProvider)
+
+    #
+    # Determine Representative Protein and Transcript Sequences
+    #
+    if genomicRepProvider == ensembl_prov:
+        (transRepKey, protRepKey) = determineVegaEnsProtTransRep(candidates, genomicRepKey,
+                transcriptLookupByGenomicKey, proteinLookupByGenomicKey,
+                transcriptLookupByProteinKey)
+    else: # not Ensembl
+        protRepKey = determineNonVegaEnsProtRep(candidates)
+        transRepKey = determineNonVegaEnsTransRep(candidates)
+
+    return (genomicRepKey, transRepKey, protRepKey, case)
+
+def determineVegaEnsProtTransRep(candidates, genomicRepKey,
+        transcriptLookupByGenomicKey, proteinLookupByGenomicKey,
+        transcriptLookupByProteinKey):
+    # Purpose: Determine the representative protein and transcript
+    #     for the marker. When the rep genomic is Ensembl
+    #     the protein and transcript must be from same provider
+    #     if they exist
+    # Returns: tuple (transcriptKey, polypeptideKey), 0 if none
+    # Assumes: nothing
+    # Effects: nothing
+    # Throws: RepresentativeError
+
+    protRepKey = 0 	# default
+    transRepKey = 0 	# default
+
+    #
+    # we determine the reprentative protein first per requirements -
+    # see TR9774
+    #
+    if genomicRepKey not in proteinLookupByGenomicKey:
+        # no prots for this genomic, get rep protein in the usual way
+        protRepKey = determineNonVegaEnsProtRep(candidates)
+
+        # now get Vega/Ensembl transcript(s) for the genomicRepKey
+        if genomicRepKey in transcriptLookupByGenomicKey:
+            # length of current longest transcript
+            currentLongestTransLen = 0
+            # Now determine the longest transcript
+            for tKey, tLength in transcriptLookupByGenomicKey.items(genomicRepKey):
+                if tLength > currentLongestTransLen:
+                    currentLongestTransLen = tLength
+                    transRepKey = tKey
+            if transRepKey == 0:
+                raise RepresentativeError("This shouldn't happen 1")
+        else: # no trans for the genomic, get rep trans in the usual way
+            transRepKey = determineNonVegaEnsTransRep(candidates)
+
+    else: # there are proteins for the genomicRepKey, determine longest
+        # length of current longest polypeptide
+        currentLongestProtLen = 0
+        # determine the longest polypeptide
+        for pKey, pLength in proteinLookupByGenomicKey.items(genomicRepKey):
+            if pLength > currentLongestProtLen:
+                currentLongestProtLen = pLength
+                protRepKey = pKey
+
+        if protRepKey == 0:
+            raise RepresentativeError("This shouldn't happen 2")
+
+        # now get Vega/Ensembl transcript(s) for the protRepKey
+        if protRepKey in transcriptLookupByProteinKey:
+            # length of current longest transcript
+            currentLongestTransLen = 0
+            # determine the longest transcript
+            for tKey, tLength in transcriptLookupByProteinKey.items(protRepKey):
+                if tLength > currentLongestTransLen:
+                    currentLongestTransLen = tLength
+                    transRepKey = tKey
+        else:   # no Ensembl protein i.e.
+                # we have a protein w/o a transcript
+            raise RepresentativeError("This shouldn't happen 3")
+
+    return (transRepKey, protRepKey)
+
+def determineNonVegaEnsProtRep(candidates):
+    # Purpose: determine non-Ensembl rep protein
+    # Returns: the longest polypeptide of the first tier that has one, else 0
+    # Assumes: nothing
+    # Effects: nothing
+    # Throws: nothing
+
+    for seqKey in candidates.polypeptide:
+        if seqKey != 0:
+            return seqKey
+    return 0
+
+def determineNonVegaEnsTransRep(candidates):
+    # Purpose: determine non-Ensembl rep transcript
+    # Returns: the longest transcript of the first tier that has one, else 0
+    # Assumes: nothing
+    # Effects: nothing
+    # Throws: nothing
+
+    for seqKey in candidates.transcript:
+        if seqKey != 0:
+            return seqKey
+    return 0
+
+def determineSeq(seqList, 	# list of (seqKey, length) tuples
+                getLongest,     # boolean, determine longest if True, else shortest
+                useUniq, 	# boolean, consider uniq only if True
+                isUniq,		# function, True if a sequence is uniq
+                debug = False):
+    # Purpose: Find the longest or shortest sequence of 'seqList'
+    # Returns: tuple (seqKey, length) where sequence key is the longest/shortest
+    #          uniq/notuniq depending on value of 'getLongest' and 'useUniq',
+    #          else (0, '')
+    # Assumes: Nothing
+    # Throws: Nothing
+    #
+
+    if getLongest:
+        compare = determineLongest
+    else:
+        compare = determineShortest
+
+    # a non-numeric default
+    currLen = ''
+    currSeqKey = 0
+
+    if debug:
+        print('getLongest: %s, useUniq: %s' % (getLongest, useUniq))
+
+    for seq in seqList:
+        if useUniq and not isUniq(seq):
+            continue
+        l = compare(currLen, seq[LENGTH])
+        # if seq[LENGTH] is longest/shortest or equal
+        if l == 1 or l == -1:
+            currLen = seq[LENGTH]
+            currSeqKey = seq[SEQKEY]
+
+    return (currSeqKey, currLen)
+
+def determineLongest (len1, len2): # integer sequence length
+    # Purpose: determine the longest length
+    # Returns: 0 if len1 longest, 1 if len2, -1 for tie
+    # Assumes: Nothing
+    # Throws: Nothing
+
+    # first comparison for a given seq set, one value will be the default of ''
+    if len1 == '':
+        return 1
+    elif len2 == '':
+        return 0
+    # 2nd - n comparisons both will be integers
+    if len1 == len2:
+        return -1
+    elif  len1 > len2:
+        return 0
+    else:
+        return 1
+
+def determineShortest (len1, len2): # integer sequence length
+    # Purpose: determine the shortest length
+    # Returns:  0 if len1 shortest, 1 if len2, -1 for tie
+    # Assumes: Nothing
+    # Throws: Nothing
+
+    # first comparison for a given seq set, one value will be the default of ''
+    if len1 == '':
+        return 1
+    elif len2 == '':
+        return 0
+    # 2nd - n comparisons both will be integers
+    if len1 == len2:
+        return -1
+    elif  len1 < len2:
+        return 0
+    else:
+        return 1
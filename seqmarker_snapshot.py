@@ -0,0 +1,194 @@
+#
+# seqmarker_snapshot.py
+#####################################################################
+#
+#  Purpose: the lookups of seqmarker.py init() saved to a file, so that
+#	    a rerun (e.g. after a failure in the bcp write) can read them
+#	    instead of building them again when nothing they are built
+#	    from has changed
+#
+#	    The file is keyed by a fingerprint of the source tables (row
+#	    counts, max(modification_date)) and by VERSION; read() returns
+#	    None if either does not match
+#
+#	    Format : one line of JSON (the header : the fingerprint, the
+#	    qualifier terms, the raw biotype strings and the position of
+#	    each integer array), padded to 8 bytes, then the integer arrays
+#	    (native 64 bit).  The arrays are read with mmap, so the
+#	    GroupedLookups read from a snapshot are memoryviews of the file
+#	    and are shared (not copied) by the forked worker processes
+#
+#  Usage:
+#	import seqmarker_snapshot
+#
+#	fingerprint = seqmarker_snapshot.fingerprint(rows)
+#	lookups = seqmarker_snapshot.read(fileName, fingerprint)
+#	if lookups is None:
+#	    ...
+#	    seqmarker_snapshot.write(fileName, fingerprint, lookups)
+#
+#	lookups : dictionary {
+#	    'qualifiers' : {term:_Term_key, ...},
+#	    'biotypes'   : {packKey(markerKey, sequenceKey):(conflictKey, rawBiotype), ...},
+#	    name         : seqlookup.GroupedLookup, ... (see LOOKUPS) }
+#
+#  History
+#
+# 10/18/2026
+#	- new
+#
+
+import sys
+import os
+import json
+import mmap
+import hashlib
+from array import array
+import seqlookup
+
+MAGIC = 'seqmarker snapshot'
+
+# change when the lookups or the format change
+# 2 : mkrsByGenomicSeqKeyLookup keeps repeated markers
+VERSION = 2
+
+# the GroupedLookups of a snapshot
+LOOKUPS = ('mkrsByGenomicSeqKeyLookup', 'transcriptLookupByGenomicKey',
+        'proteinLookupByGenomicKey', 'transcriptLookupByProteinKey')
+
+# the arrays of a GroupedLookup
+GROUPED = ('keys', 'offsets', 'values', 'lengths')
+
+# the header is padded to a multiple of the array item size
+ITEMSIZE = array(seqlookup.TYPECODE).itemsize
+
+def fingerprint(rows):
+    # Purpose: the fingerprint of the source tables
+    # Returns: string
+    # Assumes: rows : (table name, row count, max modification date) of
+    #          each source table, in the same order on every run
+    # Effects: Nothing
+    # Throws: Nothing
+
+    text = '\n'.join(['%s:%s:%s' % tuple(r) for r in rows])
+    return hashlib.sha1(text.encode()).hexdigest()
+
+def write(fileName, fingerprint, lookups):
+    # Purpose: write 'lookups' to 'fileName'
+    # Returns: Nothing
+    # Assumes: Nothing
+    # Effects: writes 'fileName' (through a temporary file, so that a
+    #          failed write leaves no partial snapshot)
+    # Throws: Nothing
+
+    arrays = []
+    for name in LOOKUPS:
+        lookup = lookups[name]
+        for part in GROUPED:
+            arrays.append(('%s.%s' % (name, part), getattr(lookup, part)))
+
+    # the biotypes : the raw biotypes are indexes into 'rawBiotypes'
+    rawBiotypes = {}
+    keys = array(seqlookup.TYPECODE)
+    conflicts = array(seqlookup.TYPECODE)
+    raws = array(seqlookup.TYPECODE)
+    for key in sorted(lookups['biotypes']):
+        (conflictKey, rawBiotype) = lookups['biotypes'][key]
+        keys.append(key)
+        conflicts.append(conflictKey)
+        raws.append(rawBiotypes.setdefault(rawBiotype, len(rawBiotypes)))
+    arrays.append(('biotypes.keys', keys))
+    arrays.append(('biotypes.conflicts', conflicts))
+    arrays.append(('biotypes.rawBiotypes', raws))
+
+    # array name : (offset after the header, length)
+    positions = {}
+    offset = 0
+    for name, a in arrays:
+        positions[name] = (offset, len(a))
+        offset = offset + len(a) * a.itemsize
+
+    header = json.dumps({
+        'magic' : MAGIC,
+        'version' : VERSION,
+        'fingerprint' : fingerprint,
+        'byteorder' : sys.byteorder,
+        'qualifiers' : lookups['qualifiers'],
+        'rawBiotypes' : sorted(rawBiotypes, key = rawBiotypes.get),
+        'arrays' : positions}) + '\n'
+    header = header.encode()
+    header = header + b' ' * (-len(header) % ITEMSIZE)
+
+    tmpName = fileName + '.tmp'
+    fp = open(tmpName, 'wb')
+    fp.write(header)
+    for name, a in arrays:
+        fp.write(a.tobytes())
+    fp.close()
+    os.replace(tmpName, fileName)
+
+def readHeader(fp):
+    # Purpose: the header of a snapshot
+    # Returns: (dictionary, its length in bytes); None if 'fp' is not a
+    #          snapshot of this VERSION on a machine of this byte order
+    # Assumes: Nothing
+    # Effects: reads 'fp'
+    # Throws: Nothing
+
+    line = fp.readline()
+    try:
+        header = json.loads(line.decode())
+    except ValueError:
+        return None
+
+    if not isinstance(header, dict) or header.get('magic') != MAGIC \
+            or header.get('version') != VERSION \
+            or header.get('byteorder') != sys.byteorder:
+        return None
+
+    return (header, len(line) + (-len(line) % ITEMSIZE))
+
+def read(fileName, fingerprint):
+    # Purpose: read the lookups of 'fileName'
+    # Returns: dictionary of lookups (see Usage); None if there is no
+    #          snapshot or it is not of 'fingerprint'
+    # Assumes: Nothing
+    # Effects: maps 'fileName' into memory
+    # Throws: Nothing
+
+    if not os.path.exists(fileName):
+        return None
+
+    fp = open(fileName, 'rb')
+    result = readHeader(fp)
+    if result is None or result[0]['fingerprint'] != fingerprint:
+        fp.close()
+        return None
+    (header, dataOffset) = result
+
+    # the memoryviews keep the mapping open
+    data = memoryview(mmap.mmap(fp.fileno(), 0, access = mmap.ACCESS_READ))
+    fp.close()
+
+    def arrayOf(name):
+        (offset, length) = header['arrays'][name]
+        start = dataOffset + offset
+        return data[start:start + length * ITEMSIZE].cast(seqlookup.TYPECODE)
+
+    lookups = {'qualifiers' : header['qualifiers']}
+
+    for name in LOOKUPS:
+        lookups[name] = seqlookup.GroupedLookup(
+            *[arrayOf('%s.%s' % (name, part)) for part in GROUPED])
+
+    # (conflictType, rawBiotype) values are shared between keys
+    rawBiotypes = header['rawBiotypes']
+    values = {}
+    biotypes = {}
+    for key, conflictKey, raw in zip(arrayOf('biotypes.keys'),
+            arrayOf('biotypes.conflicts'), arrayOf('biotypes.rawBiotypes')):
+        value = (conflictKey, rawBiotypes[raw])
+        biotypes[key] = values.setdefault(value, value)
+    lookups['biotypes'] = biotypes
+
+    return lookups
@@ -15,6 +15,18 @@
 #
 # History
 #
+# 10/18/2026
+#	- SEQCACHE_LOADMODE=copy : load the table with COPY while writing the rows
+#	- SEQCACHE_COPYTO=true : exportBCP()
+#	- per-phase timing and row counts (seqcachestats)
+#	- SEQCACHE_USEACCINDEX=true : match the accession ids in the
+#	  normalized accession index (seqaccindex.py)
+#	- main(); seqcachesession.py : read the accession snapshot
+#	- write the rows with seqcachebcp.Writer
+#	- EXCLUDED, sequencesCmd(), cacheCmd() : the selects shared by
+#	  createExcluded()/createBCP() and exportBCP(); the temp table
+#	  sequences2 is replaced by cacheCmd()
+#
 # 11/23/2004	lec
 #	- added createExcluded() for TR 6118 (GXD Gray data load)
 #
@@ -28,40 +40,63 @@ import os
 import mgi_utils
 import loadlib
 import db
+import seqcachelib
+import seqcachebcp
+import seqcachestats
 
-NL = '\n'
-DL = os.environ['COLDELIM']
 table = os.environ['TABLE']
 datadir = os.environ['CACHEDATADIR']
 loaddate = loadlib.loaddate
 
-def createExcluded():
+# per-phase timing and row counts
+stats = seqcachestats.Stats('seqprobe')
+
+# the probes whose cDNA source is not that of the GenBank sequence record
+EXCLUDED = '''select _Probe_key from PRB_Notes 
+        where note like 'The source of the material used to create this cDNA probe was different%'
+        '''
+
+def sequencesCmd():
+
+        # the select of the sequence/probe pairs that share an accession id
+
+        return '''select s._Object_key as sequenceKey, p._Object_key as probeKey, p._Accession_key 
+                from %s s, %s p 
+                where s._MGIType_key = 19 
+                and %s = %s 
+                and p._MGIType_key = 3 
+                and s._LogicalDB_key = p._LogicalDB_key
+                ''' % (seqcachelib.accessionTable(), seqcachelib.accessionTable(),
+                       seqcachelib.lowerAccID('s'), seqcachelib.lowerAccID('p'))
+
+def cacheCmd(sequences):
+
+        # the select of the SEQ_Probe_Cache rows of 'sequences', a table
+        # of sequencesCmd() rows
 
-    excludeNote = 'The source of the material used to create this cDNA probe was different than that used to create the GenBank sequence record.'
+        return '''select s.sequenceKey, s.probeKey, ar._Refs_key as refsKey, 
+                max(ar.modification_date) as mdate, max(ar._ModifiedBy_key) as userKey 
+                from %s s, %s ar 
+                where s._Accession_key = ar._Accession_key
+                group by s.sequenceKey, s.probeKey, ar._Refs_key
+                ''' % (sequences, seqcachelib.snapshotTable('ACC_AccessionReference'))
+
+def createExcluded():
 
     print('excluded begin...%s' % (mgi_utils.date()))
-    db.sql('''select _Probe_key INTO TEMPORARY TABLE excluded from PRB_Notes 
-        where note like 'The source of the material used to create this cDNA probe was different%'
-        ''', None)
-    db.sql('create index idx1 on excluded(_Probe_key)', None)
+    stats.sql('temp table creation', 'create temporary table excluded as %s' % (EXCLUDED))
+    stats.sql('index creation', 'create index idx1 on excluded(_Probe_key)')
     print('excluded end...%s' % (mgi_utils.date()))
 
 def createBCP():
 
-        outBCP = open('%s/%s.bcp' % (datadir, table), 'w')
+        outBCP = seqcachelib.openOutput(table, '%s/%s.bcp' % (datadir, table))
 
         print('sequences1 begin...%s' % (mgi_utils.date()))
-        db.sql('''select s._Object_key as sequenceKey, p._Object_key as probeKey, p._Accession_key 
-                INTO TEMPORARY TABLE sequences1 
-                from ACC_Accession s, ACC_Accession p 
-                where s._MGIType_key = 19 
-                and lower(s.accID) = lower(p.accID) 
-                and p._MGIType_key = 3 
-                and s._LogicalDB_key = p._LogicalDB_key
-                ''', None)
-        db.sql('create index idx2 on sequences1 (sequenceKey)', None)
-        db.sql('create index idx3 on sequences1 (probeKey)', None)
-        db.sql('create index idx4 on sequences1 (_Accession_key)', None)
+        stats.sql('temp table creation', 'create temporary table sequences1 as %s' % (sequencesCmd()))
+        stats.sql('index creation', 'create index idx2 on sequences1 (sequenceKey)')
+        stats.sql('index creation', 'create index idx3 on sequences1 (probeKey)')
+        stats.sql('index creation', 'create index idx4 on sequences1 (_Accession_key)')
         print('sequences1 end...%s' % (mgi_utils.date()))
 
         print('deletion begin...%s' % (mgi_utils.date()))
@@ -69,42 +104,70 @@ def createBCP():
         print('deletion end...%s' % (mgi_utils.date()))
         db.commit()
 
-        print('sequences2 begin...%s' % (mgi_utils.date()))
-        db.sql('''select s.sequenceKey, s.probeKey, ar._Refs_key as refskey, 
-                        ar._ModifiedBy_key as userKey, ar.modification_date as mdate 
-                INTO TEMPORARY TABLE sequences2 
-                from sequences1 s, ACC_AccessionReference ar 
-                where s._Accession_key = ar._Accession_key
-                ''', None)
-        db.sql('create index idx5 on sequences2 (sequenceKey, probeKey, refsKey, userKey, mdate)', None)
-        db.sql('create index idx6 on sequences2 (userKey)', None)
-        db.sql('create index idx7 on sequences2 (mdate)', None)
-        print('sequences2 end...%s' % (mgi_utils.date()))
-
         print('final begin...%s' % (mgi_utils.date()))
-        results = db.sql('''select distinct sequenceKey, probeKey, refsKey, 
-                max(userKey) as userKey, max(mdate) as mdate 
-                from sequences2 
-                group by sequenceKey, probeKey, refsKey
-                ''', 'auto')
+        with stats.phase('final query', verbose = False) as phase:
+                results = db.sql(cacheCmd('sequences1'), 'auto')
+                phase.rowsOut = len(results)
         print('final end...%s' % (mgi_utils.date()))
 
-        for r in results:
-                outBCP.write(mgi_utils.prvalue(r['sequenceKey']) + DL + \
-                        mgi_utils.prvalue(r['probeKey']) + DL + \
-                        mgi_utils.prvalue(r['refsKey']) + DL + \
-                        r['mdate'] + DL + \
-                        mgi_utils.prvalue(r['userKey']) + DL + mgi_utils.prvalue(r['userKey']) + DL + \
-                        loaddate + DL + loaddate + NL)
-        outBCP.close()
+        phase = stats.phase('bcp write')
+        phase.begin()
+        writer = seqcachebcp.Writer(outBCP, seqcachebcp.SEQ_Probe_Cache)
+        writer.writeRows([(r['sequenceKey'], r['probeKey'], r['refsKey'], r['mdate'],
+                        r['userKey'], r['userKey'], loaddate, loaddate) for r in results])
+        writer.flush()
+        phase.rowsIn = len(results)
+        phase.rowsOut = writer.rowCount
+        phase.end()
+
+        stats.close(outBCP)
+
+def exportBCP():
+
+        # same rows as createExcluded()/createBCP(), but as one select that
+        # runs inside COPY (...) TO STDOUT on its own connection; the rows
+        # are streamed straight to the bcp file or into the table
+
+        print('Exporting %s.bcp...%s' % (table, mgi_utils.date()))
+
+        outBCP = seqcachelib.openOutput(table, '%s/%s.bcp' % (datadir, table), binary = True)
+
+        cmd = '''
+            with excluded as (%s),
+            sequences1 as (%s)
+            select c.sequenceKey, c.probeKey, c.refsKey, c.mdate, 
+                c.userKey as _CreatedBy_key, c.userKey as _ModifiedBy_key, 
+                '%s' as creation_date, '%s' as modification_date
+            from (%s) c
+            where not exists (select 1 from excluded e where c.probeKey = e._Probe_key)
+            ''' % (EXCLUDED, sequencesCmd(), loaddate, loaddate, cacheCmd('sequences1'))
+
+        with stats.phase('bcp write') as phase:
+                rowCount = seqcachelib.copyOut(cmd, outBCP)
+                phase.rowsOut = rowCount
+
+        stats.close(outBCP)
+
+        print('%s rows exported...%s' % (rowCount, mgi_utils.date()))
+
+def main():
+
+        db.useOneConnection(1)
+        print('%s' % mgi_utils.date())
+        # exportBCP() runs on its own connection, which cannot see the
+        # accession snapshot of seqcachesession.py
+        if seqcachelib.copyTo == 'true' and seqcachelib.inSession != 'true':
+                exportBCP()
+        else:
+                createExcluded()
+                createBCP()
+        seqcachelib.closeConnection()
+        stats.write()
+        print('%s' % mgi_utils.date())
 
 #
 # Main Routine
 #
 
-db.useOneConnection(1)
-print('%s' % mgi_utils.date())
-createExcluded()
-createBCP()
-db.useOneConnection(0)
-print('%s' % mgi_utils.date())
+if __name__ == '__main__':
+        main()
@@ -0,0 +1,412 @@
+#
+# test_seqmarker_repseq.py
+#####################################################################
+#
+#  Purpose: tests of the representative sequence algorithm
+#	    (seqmarker_repseq.py) and of the seqmarker.py paths that
+#	    feed it
+#
+#	    RepresentativeTest : the expected winner of each CASE (1-35)
+#	    of the genomic decision, and of the transcript/polypeptide
+#	    tiers; no database, no seqmarker.py
+#
+#	    ChunkEquivalenceTest : markerChunks(), columnarChunks() and
+#	    tieredChunks() over the same rows give the same representatives
+#	    (selectRepresentatives); needs the seqmarker.py imports (db,
+#	    loadlib, mgi_utils) and, for columnarChunks(), numpy
+#
+#  Usage:
+#	python3 -m unittest discover -s test
+#
+#  History
+#
+# 10/18/2026
+#	- new
+#
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import seqlookup
+import seqmarker_repseq
+import seqmarker_columnar
+
+# seqmarker.py reads its configuration when it is imported
+for name, value in (('TABLE', 'SEQ_Marker_Cache'), ('CACHEDATADIR', '/tmp'),
+        ('SEQMARKER_DEBUG', 'false'), ('COLDELIM', '\t')):
+    os.environ.setdefault(name, value)
+
+try:
+    import seqmarker
+    import seqcachestats
+except ImportError:
+    seqmarker = None
+
+# sequence providers
+ENSEMBL = 615429
+NCBI = 706915
+GENBANK = 316380	# GenBank/EMBL/DDBJ:Rodent
+EST = 316376		# GenBank/EMBL/DDBJ:EST
+ENSEMBLR = 102032586
+VISTA = 102032585
+REFSEQ = seqmarker_repseq.REFSEQ_PROVIDER
+SWISSPROT = 316384
+TREMBL = 316385
+OTHER = 1
+
+# sequence types
+DNA = 316347
+RNA = 316346
+POLYPEPTIDE = 316348
+
+# the marker of the representative tests; a genomic sequence that is
+# not uniq is associated with OTHERMARKER too
+MARKER = 1
+OTHERMARKER = 2
+
+def groupedLookup(pairs):
+    # Purpose: a seqlookup.GroupedLookup of 'pairs'
+    # Returns: GroupedLookup
+    # Assumes: 'pairs' are (key, value, length)
+    # Throws: Nothing
+
+    builder = seqlookup.GroupedLookupBuilder()
+    for key, value, length in sorted(pairs):
+        builder.add(key, value, length)
+    return builder.build()
+
+def genomicLookup(seqs):
+    # Purpose: mkrsByGenomicSeqKeyLookup for 'seqs'
+    # Returns: GroupedLookup
+    # Assumes: 'seqs' are (seqKey, providerKey, length, uniq)
+    # Throws: Nothing
+
+    pairs = []
+    for seqKey, providerKey, length, uniq in seqs:
+        pairs.append((seqKey, MARKER, 0))
+        if not uniq:
+            pairs.append((seqKey, OTHERMARKER, 0))
+    return groupedLookup(pairs)
+
+# (CASE, genomic candidates (seqKey, providerKey, length, uniq) in stream
+# order, expected representative genomic _Sequence_key)
+GENOMIC_CASES = [
+    # no gene models; longest uniq GenBank, else longest
+    (1, [(11, GENBANK, 100, True), (12, GENBANK, 200, False)], 11),
+    (2, [(11, GENBANK, 100, False), (12, GENBANK, 200, False)], 12),
+    # single uniq Ensembl and NCBI; NCBI if shorter or a tie
+    (3, [(21, ENSEMBL, 100, True), (31, NCBI, 100, True)], 31),
+    (4, [(21, ENSEMBL, 100, True), (31, NCBI, 200, True)], 21),
+    (5, [(21, ENSEMBL, 100, True), (31, NCBI, 50, False), (32, NCBI, 60, False)], 21),
+    (6, [(31, NCBI, 100, True), (41, ENSEMBLR, 50, True)], 31),
+    # single uniq EnsemblR and VISTA; VISTA if shorter or a tie
+    (7, [(41, ENSEMBLR, 100, True), (51, VISTA, 100, True)], 51),
+    (8, [(41, ENSEMBLR, 100, True), (51, VISTA, 200, True)], 41),
+    (9, [(41, ENSEMBLR, 100, True)], 41),
+    (10, [(51, VISTA, 100, True)], 51),
+    # multiple; shortest uniq, NCBI/VISTA if a tie
+    (11, [(21, ENSEMBL, 300, True), (22, ENSEMBL, 100, False),
+          (31, NCBI, 200, True), (32, NCBI, 50, True)], 32),
+    (12, [(21, ENSEMBL, 100, True), (22, ENSEMBL, 50, False),
+          (31, NCBI, 200, True), (32, NCBI, 300, True)], 21),
+    (13, [(21, ENSEMBL, 300, True), (22, ENSEMBL, 200, True)], 22),
+    # a tie of uniq lengths goes to the last one in stream order
+    (14, [(31, NCBI, 200, True), (32, NCBI, 200, True)], 32),
+    (15, [(41, ENSEMBLR, 100, True), (42, ENSEMBLR, 50, False),
+          (51, VISTA, 100, True), (52, VISTA, 90, False)], 51),
+    (16, [(41, ENSEMBLR, 80, True), (42, ENSEMBLR, 50, False),
+          (51, VISTA, 100, True), (52, VISTA, 90, False)], 41),
+    (17, [(41, ENSEMBLR, 80, True), (42, ENSEMBLR, 70, True)], 42),
+    (18, [(51, VISTA, 80, True), (52, VISTA, 90, True)], 51),
+    # no uniq; single Ensembl and NCBI, NCBI if shorter or a tie
+    (19, [(21, ENSEMBL, 100, False), (31, NCBI, 100, False)], 31),
+    (20, [(21, ENSEMBL, 100, False), (31, NCBI, 200, False)], 21),
+    (21, [(21, ENSEMBL, 100, False)], 21),
+    (22, [(31, NCBI, 100, False)], 31),
+    # single EnsemblR and VISTA; the EnsemblR length is compared with
+    # the first NCBI length (see seqmarker_repseq.py)
+    (23, [(31, NCBI, 100, False), (32, NCBI, 50, False),
+          (41, ENSEMBLR, 100, False), (51, VISTA, 500, False)], 51),
+    (24, [(31, NCBI, 200, False), (32, NCBI, 50, False),
+          (41, ENSEMBLR, 100, False), (51, VISTA, 50, False)], 41),
+    (25, [(41, ENSEMBLR, 100, False)], 41),
+    (26, [(51, VISTA, 100, False)], 51),
+    # multiple not uniq; shortest, NCBI/VISTA if a tie
+    (27, [(21, ENSEMBL, 100, False), (22, ENSEMBL, 200, False),
+          (31, NCBI, 100, False), (32, NCBI, 300, False)], 31),
+    (28, [(21, ENSEMBL, 50, False), (22, ENSEMBL, 200, False),
+          (31, NCBI, 100, False), (32, NCBI, 300, False)], 21),
+    (29, [(21, ENSEMBL, 100, False), (22, ENSEMBL, 50, False)], 22),
+    (30, [(31, NCBI, 100, False), (32, NCBI, 50, False)], 32),
+    (31, [(41, ENSEMBLR, 100, False), (42, ENSEMBLR, 200, False),
+          (51, VISTA, 100, False), (52, VISTA, 300, False)], 51),
+    (32, [(41, ENSEMBLR, 50, False), (42, ENSEMBLR, 200, False),
+          (51, VISTA, 100, False), (52, VISTA, 300, False)], 41),
+    (33, [(41, ENSEMBLR, 100, False), (42, ENSEMBLR, 50, False)], 42),
+    (34, [(51, VISTA, 100, False), (52, VISTA, 50, False)], 52),
+    # no representative
+    (35, [], 0),
+    ]
+
+class RepresentativeTest(unittest.TestCase):
+
+    def determine(self, candidates, mkrsByGenomicSeqKeyLookup,
+            transcriptLookupByGenomicKey = None, proteinLookupByGenomicKey = None,
+            transcriptLookupByProteinKey = None):
+        empty = groupedLookup([])
+        return seqmarker_repseq.determineRepresentative(candidates,
+            mkrsByGenomicSeqKeyLookup,
+            transcriptLookupByGenomicKey or empty,
+            proteinLookupByGenomicKey or empty,
+            transcriptLookupByProteinKey or empty)
+
+    def testGenomicCases(self):
+        self.assertEqual(list(range(1, 36)), [c[0] for c in GENOMIC_CASES])
+
+        for case, seqs, expected in GENOMIC_CASES:
+            candidates = seqmarker_repseq.Candidates()
+            for seqKey, providerKey, length, uniq in seqs:
+                candidates.add(seqKey, providerKey, DNA, 'ID%s' % seqKey, length)
+
+            result = self.determine(candidates, genomicLookup(seqs))
+            self.assertEqual((expected, case), (result[0], result[3]), 'CASE %s' % case)
+
+    def testGenomicCase23WithoutNCBI(self):
+        # single EnsemblR and VISTA without NCBI fails as it always has
+        seqs = [(41, ENSEMBLR, 100, False), (51, VISTA, 100, False)]
+        candidates = seqmarker_repseq.Candidates()
+        for seqKey, providerKey, length, uniq in seqs:
+            candidates.add(seqKey, providerKey, DNA, 'ID%s' % seqKey, length)
+        self.assertRaises(IndexError, self.determine, candidates, genomicLookup(seqs))
+
+    def testTranscriptTiers(self):
+        # (candidates (seqKey, providerKey, seqTypeKey, accID, length), expected)
+        for seqs, expected in [
+            # RefSeq NM_ before a longer GenBank RNA
+            ([(61, GENBANK, RNA, 'AB000061', 900), (62, REFSEQ, RNA, 'NM_000062', 100)], 62),
+            # GenBank RNA before RefSeq XM_
+            ([(61, GENBANK, RNA, 'AB000061', 100), (62, REFSEQ, RNA, 'XM_000062', 900)], 61),
+            # RefSeq XR_ before a GenBank EST
+            ([(61, EST, RNA, 'BE000061', 900), (62, REFSEQ, RNA, 'XR_000062', 100)], 62),
+            # longest of the tier; the first one if a tie
+            ([(61, EST, RNA, 'BE000061', 100), (62, EST, RNA, 'BE000062', 200),
+              (63, EST, RNA, 'BE000063', 200)], 62),
+            # a null length is 0
+            ([(61, EST, RNA, 'BE000061', None)], 61),
+            ([], 0)]:
+            candidates = seqmarker_repseq.Candidates()
+            for seq in seqs:
+                candidates.add(*seq)
+            self.assertEqual(expected, self.determine(candidates, groupedLookup([]))[1], seqs)
+
+    def testPolypeptideTiers(self):
+        for seqs, expected in [
+            # SwissProt before RefSeq NP_ before TrEMBL before RefSeq XP_
+            ([(71, TREMBL, POLYPEPTIDE, 'Q00071', 900), (72, SWISSPROT, POLYPEPTIDE, 'P00072', 100),
+              (73, REFSEQ, POLYPEPTIDE, 'NP_000073', 500)], 72),
+            ([(71, TREMBL, POLYPEPTIDE, 'Q00071', 900), (73, REFSEQ, POLYPEPTIDE, 'NP_000073', 500)], 73),
+            ([(71, TREMBL, POLYPEPTIDE, 'Q00071', 100), (73, REFSEQ, POLYPEPTIDE, 'XP_000073', 500)], 71),
+            ([(73, REFSEQ, POLYPEPTIDE, 'XP_000073', 500), (74, REFSEQ, POLYPEPTIDE, 'XP_000074', 600)], 74),
+            ([], 0)]:
+            candidates = seqmarker_repseq.Candidates()
+            for seq in seqs:
+                candidates.add(*seq)
+            self.assertEqual(expected, self.determine(candidates, groupedLookup([]))[2], seqs)
+
+    def testEnsemblProteinAndTranscript(self):
+        # an Ensembl representative: the longest protein of the gene model
+        # and the longest transcript of that protein, not the tier winners
+        candidates = seqmarker_repseq.Candidates()
+        candidates.add(21, ENSEMBL, DNA, 'ENSMUSG21', 100)
+        candidates.add(62, REFSEQ, RNA, 'NM_000062', 100)
+        candidates.add(72, SWISSPROT, POLYPEPTIDE, 'P00072', 100)
+        mkrs = genomicLookup([(21, ENSEMBL, 100, True)])
+        proteins = groupedLookup([(21, 81, 300), (21, 82, 400)])
+        transcripts = groupedLookup([(81, 91, 900), (82, 92, 500), (82, 93, 600)])
+
+        self.assertEqual((21, 93, 82, 5),
+            self.determine(candidates, mkrs, None, proteins, transcripts))
+
+        # no proteins; the longest transcript of the gene model and the
+        # polypeptide tier winner
+        transcripts = groupedLookup([(21, 91, 500), (21, 92, 600)])
+        self.assertEqual((21, 92, 72, 5),
+            self.determine(candidates, mkrs, transcripts, None, None))
+
+        # neither; the tier winners
+        self.assertEqual((21, 62, 72, 5), self.determine(candidates, mkrs))
+
+        # a protein without a transcript
+        self.assertRaises(seqmarker_repseq.RepresentativeError,
+            self.determine, candidates, mkrs, None, proteins, None)
+
+def sequences(rand, count):
+    # Purpose: random sequences of all the kinds classify() tells apart;
+    #          few distinct lengths, so there are ties, and null lengths
+    #          but for the genomic sequences (determineShortest() cannot
+    #          compare them)
+    # Returns: dictionary {seqKey:(providerKey, seqTypeKey, accID, length)}
+    # Assumes: Nothing
+    # Throws: Nothing
+
+    kinds = [(ENSEMBL, DNA, 'ENSMUSG'), (NCBI, DNA, ''), (GENBANK, DNA, 'AC'),
+        (EST, DNA, 'BG'), (ENSEMBLR, DNA, 'ENSMUSR'), (VISTA, DNA, 'hs'),
+        (GENBANK, RNA, 'AK'), (EST, RNA, 'BE'), (REFSEQ, RNA, 'NM_'),
+        (REFSEQ, RNA, 'NR_'), (REFSEQ, RNA, 'XM_'), (REFSEQ, RNA, 'XR_'),
+        (SWISSPROT, POLYPEPTIDE, 'P'), (TREMBL, POLYPEPTIDE, 'Q'),
+        (REFSEQ, POLYPEPTIDE, 'NP_'), (REFSEQ, POLYPEPTIDE, 'XP_'),
+        (OTHER, RNA, 'X')]
+
+    seqs = {}
+    for seqKey in range(1000, 1000 + count):
+        providerKey, seqTypeKey, prefix = rand.choice(kinds)
+        if seqTypeKey == DNA:
+            length = rand.choice([100, 100, 200, 300])
+        else:
+            length = rand.choice([None, 0, 100, 100, 200, 300])
+        seqs[seqKey] = (providerKey, seqTypeKey, '%s%06d' % (prefix, seqKey), length)
+    return seqs
+
+def tieredRows(rows):
+    # Purpose: the rows of seqmarker.tieredQuery() for the deriveQuality
+    #          'rows': classified, only the first row per marker per tier
+    #          by coalesce(length, 0) desc, _SequenceProvider_key,
+    #          _Sequence_key, and ordered by _Marker_key,
+    #          _SequenceProvider_key, _Sequence_key
+    # Returns: list of dictionaries
+    # Assumes: Nothing
+    # Throws: Nothing
+
+    classified = []
+    for r in rows:
+        (genomicIndex, transcriptTier, polypeptideTier) = seqmarker_repseq.classify(
+            r['_SequenceProvider_key'], r['_SequenceType_key'], r['accID'])
+        classified.append(dict(r, genomicIndex = genomicIndex,
+            transcriptTier = transcriptTier, polypeptideTier = polypeptideTier))
+
+    for column in ('transcriptTier', 'polypeptideTier'):
+        ranked = sorted([r for r in classified if r[column] >= 0],
+            key = lambda r: (r['_Marker_key'], r[column], -(r['length'] or 0),
+                r['_SequenceProvider_key'], r['_Sequence_key']))
+        first = set()
+        for r in ranked:
+            if (r['_Marker_key'], r[column]) in first:
+                r[column] = -1
+            else:
+                first.add((r['_Marker_key'], r[column]))
+
+    tiered = [r for r in classified
+        if r['genomicIndex'] != 0 or r['transcriptTier'] >= 0 or r['polypeptideTier'] >= 0]
+    tiered.sort(key = lambda r: (r['_Marker_key'], r['_SequenceProvider_key'], r['_Sequence_key']))
+    return tiered
+
+@unittest.skipIf(seqmarker is None, 'seqmarker.py cannot be imported')
+class ChunkEquivalenceTest(unittest.TestCase):
+
+    LOOKUPS = ('mkrsByGenomicSeqKeyLookup', 'transcriptLookupByGenomicKey',
+        'proteinLookupByGenomicKey', 'transcriptLookupByProteinKey', 'workerChunkSize')
+
+    def setUp(self):
+        rand = random.Random(10182026)
+        seqs = sequences(rand, 600)
+
+        # the deriveQuality rows in stream order; genomic sequences are
+        # drawn from a small pool so that some are shared by markers
+        genomicKeys = [k for k in seqs if seqs[k][1] == DNA][:40]
+        otherKeys = [k for k in seqs if k not in genomicKeys]
+        ncbiKey = [k for k in genomicKeys if seqs[k][0] == NCBI][0]
+        self.rows = []
+        for markerKey in range(1, 301):
+            keys = set(rand.sample(genomicKeys, rand.randint(0, 4)) +
+                rand.sample(otherKeys, rand.randint(0, 12)))
+            # EnsemblR and VISTA without NCBI may fail (CASE 23)
+            providers = [seqs[k][0] for k in keys]
+            if ENSEMBLR in providers and VISTA in providers and NCBI not in providers:
+                keys.add(ncbiKey)
+            for seqKey in keys:
+                providerKey, seqTypeKey, accID, length = seqs[seqKey]
+                self.rows.append({'_Marker_key':markerKey, '_Sequence_key':seqKey,
+                    '_SequenceProvider_key':providerKey, '_SequenceType_key':seqTypeKey,
+                    'accID':accID, 'length':length})
+        self.rows.sort(key = lambda r: (r['_Marker_key'], r['_SequenceProvider_key'], r['_Sequence_key']))
+
+        # Ensembl gene models with proteins and transcripts, and without
+        proteins = []
+        transcripts = []
+        genomicTranscripts = []
+        for seqKey in genomicKeys:
+            if seqs[seqKey][0] != ENSEMBL:
+                continue
+            if seqKey % 3 == 0:
+                proteins.append((seqKey, seqKey + 5000, 300))
+                proteins.append((seqKey, seqKey + 6000, 300))
+                transcripts.append((seqKey + 5000, seqKey + 7000, 200))
+                transcripts.append((seqKey + 6000, seqKey + 8000, 400))
+            elif seqKey % 3 == 1:
+                genomicTranscripts.append((seqKey, seqKey + 9000, 100))
+
+        self.saved = dict([(name, getattr(seqmarker, name)) for name in self.LOOKUPS])
+        seqmarker.mkrsByGenomicSeqKeyLookup = groupedLookup(
+            [(r['_Sequence_key'], r['_Marker_key'], 0) for r in self.rows])
+        seqmarker.transcriptLookupByGenomicKey = groupedLookup(genomicTranscripts)
+        seqmarker.proteinLookupByGenomicKey = groupedLookup(proteins)
+        seqmarker.transcriptLookupByProteinKey = groupedLookup(transcripts)
+        # markers per chunk; so that the chunks end within the rows
+        seqmarker.workerChunkSize = 7
+
+    def tearDown(self):
+        for name, value in self.saved.items():
+            setattr(seqmarker, name, value)
+
+    def select(self, chunks):
+        selected = []
+        for chunk in chunks:
+            self.assertTrue(len(chunk) <= seqmarker.workerChunkSize)
+            selected.extend(seqmarker.selectRepresentatives(chunk))
+        return selected
+
+    def withCandidates(self, selected):
+        # markers with a representative; markerChunks() keeps the markers
+        # without candidates, the other paths leave them out
+        return [s for s in selected if s[1:] != (0, 0, 0)]
+
+    def markerSelected(self):
+        phase = seqcachestats.Phase('markerChunks')
+        selected = self.select(seqmarker.markerChunks(iter(self.rows), phase))
+        self.assertEqual(len(self.rows), phase.rowsIn)
+        return self.withCandidates(selected)
+
+    def testTieredChunks(self):
+        rows = tieredRows(self.rows)
+        phase = seqcachestats.Phase('tieredChunks')
+        selected = self.select(seqmarker.tieredChunks(iter(rows), phase))
+        self.assertEqual(len(rows), phase.rowsIn)
+        self.assertEqual(self.markerSelected(), self.withCandidates(selected))
+
+    @unittest.skipIf(seqmarker_columnar.numpy is None, 'numpy is not available')
+    def testColumnarChunks(self):
+        rows = []
+        for r in self.rows:
+            tclass = 0
+            pclass = 0
+            for prefixes, t, p in ((('NM_', 'NR_'), 1, 0), (('XM_', 'XR_'), 2, 0),
+                    (('NP_',), 0, 1), (('XP_',), 0, 2)):
+                if [x for x in prefixes if r['accID'].find(x) > -1]:
+                    tclass = tclass or t
+                    pclass = pclass or p
+            length = r['length']
+            if length is None:
+                length = -1
+            rows.append(dict(r, length = length, tclass = tclass, pclass = pclass))
+
+        phase = seqcachestats.Phase('columnarChunks')
+        selected = self.select(seqmarker.columnarChunks(iter(rows), phase))
+        self.assertEqual(len(rows), phase.rowsIn)
+        self.assertEqual(self.markerSelected(), self.withCandidates(selected))
+
+if __name__ == '__main__':
+    unittest.main()